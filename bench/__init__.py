@@ -0,0 +1,5 @@
+"""Offline benchmarks for the multi-agents backend.
+
+Run the websocket load test with:
+    python -m bench.loadtest --sessions 50 --workers 2
+"""
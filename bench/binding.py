@@ -0,0 +1,89 @@
+"""Tool binding check for `ResilientChatModel`.
+
+The agents bind their tools with ``parallel_tool_calls=False`` before
+handing the model to ``create_react_agent``. If the prebuilt agent does not
+recognise the model as already bound, it binds the tools again and the
+caller's kwargs are lost. This check runs a `ResilientChatModel` over a
+recording model through ``create_react_agent`` with the tools of every agent
+and fails unless the kwargs reach the model call.
+
+Example:
+    python -m bench.binding
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import Any, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.prebuilt import create_react_agent
+
+from src.core.resilient_model import ResilientChatModel
+
+
+class _RecordingModel(BaseChatModel):
+    """Answers "ok" and records the kwargs of every call."""
+
+    calls: List[dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def bind_tools(self, tools, **kwargs: Any):  # type: ignore[override]
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.calls.append(kwargs)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        self.calls.append(kwargs)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="ok"))
+
+
+def _agent_tools() -> dict[str, list]:
+    from src.agents.appointment.agent import all_tools as appointment_tools
+    from src.agents.prescription.agent import all_tools as prescription_tools
+    from src.agents.supervisor.tools import handoff_to_appointment_agent, handoff_to_prescription_agent
+
+    return {
+        "supervisor_agent": [handoff_to_appointment_agent, handoff_to_prescription_agent],
+        "appointment_agent": appointment_tools,
+        "prescription_agent": prescription_tools,
+    }
+
+
+async def check(name: str, tools: list) -> List[str]:
+    recording = _RecordingModel(calls=[])
+    model = ResilientChatModel(candidates=[recording], labels=["recording"])
+    agent = create_react_agent(model=model.bind_tools(tools, parallel_tool_calls=False), tools=tools)
+    await agent.ainvoke({"messages": [HumanMessage(content="hi")]})
+
+    kwargs = recording.calls[-1]
+    problems = []
+    if kwargs.get("parallel_tool_calls") is not False:
+        problems.append(f"{name}: parallel_tool_calls={kwargs.get('parallel_tool_calls')!r}")
+    bound = {tool["function"]["name"] for tool in kwargs.get("tools", ())}
+    if bound != {tool.name for tool in tools}:
+        problems.append(f"{name}: tools {sorted(bound)}")
+    return problems
+
+
+async def main() -> int:
+    problems = []
+    for name, tools in _agent_tools().items():
+        problems.extend(await check(name, tools))
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    print("ok" if not problems else f"{len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,202 @@
+"""Slot booking contention benchmark.
+
+Creates ``--slots`` hot slots and fires ``--attempts`` concurrent booking
+attempts at them, each for a random hot slot, the way many sessions would
+race for the same morning appointment. Every attempt reads the slot first
+(like ``get_available_slots``), yields to the other sessions, then books.
+
+Booking uses `BookingRepository.book`, the atomic compare-and-set. With
+``--naive`` it uses the old check-then-write sequence instead (read the slot,
+mark it booked, add the appointment), to show the double bookings the
+compare-and-set prevents.
+
+Reported: successful bookings, conflicts, double bookings (appointments read
+back per slot beyond the first; must be 0), throughput and attempt latency.
+
+The memory backend spreads attempts over ``--threads`` threads, each running
+its own event loop, so the in-process compare-and-set is exercised by real
+thread contention. The redis backend uses the Redis configured by the
+``REDIS_*`` variables and its own ``--key-prefix``.
+
+Example:
+    python -m bench.booking --attempts 5000 --slots 10
+    REDIS_HOST=localhost python -m bench.booking --backend redis --attempts 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from src.mock.appointment import Appointment
+from src.mock.slot import Slot
+from src.repository import BookingConflict, Repositories, memory_repositories
+
+
+async def _attempt(
+    repositories: Repositories,
+    slot_id: UUID,
+    naive: bool,
+    results: List[tuple[str, float, Optional[Appointment]]],
+) -> None:
+    started = time.perf_counter()
+    slot = await repositories.slots.get(slot_id)
+    # Another session gets to run between the read and the write
+    await asyncio.sleep(0)
+
+    appointment = Appointment(patient_id=uuid4(), slot_id=slot_id, provider_id=slot.provider_id, start=slot.start)
+    outcome = "booked"
+    if naive:
+        if slot.is_available:
+            await repositories.slots.update(slot.model_copy(update={"is_available": False}))
+            await repositories.appointments.add(appointment)
+        else:
+            outcome = "slot_taken"
+    else:
+        try:
+            await repositories.bookings.book(appointment, slot)
+        except BookingConflict as conflict:
+            outcome = conflict.reason
+
+    results.append((outcome, time.perf_counter() - started, appointment if outcome == "booked" else None))
+
+
+async def _run_batch(
+    repositories: Repositories,
+    slot_ids: List[UUID],
+    attempts: int,
+    concurrency: int,
+    naive: bool,
+    rng: random.Random,
+) -> List[tuple[str, float, Optional[Appointment]]]:
+    results: List[tuple[str, float, Optional[Appointment]]] = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(slot_id: UUID) -> None:
+        async with limit:
+            await _attempt(repositories, slot_id, naive, results)
+
+    await asyncio.gather(*(one(rng.choice(slot_ids)) for _ in range(attempts)))
+    return results
+
+
+async def _create_slots(repositories: Repositories, count: int) -> List[UUID]:
+    provider_id = uuid4()
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    slot_ids = []
+    for i in range(count):
+        slot = Slot(provider_id=provider_id, start=start + timedelta(hours=i), end=start + timedelta(hours=i + 1))
+        await repositories.slots.add(slot)
+        slot_ids.append(slot.id)
+    return slot_ids
+
+
+async def _double_bookings(repositories: Repositories, booked: List[Appointment]) -> int:
+    """Appointments stored per slot beyond the first, read back from the store."""
+    per_slot: Counter[UUID] = Counter()
+    for appointment in booked:
+        for stored in await repositories.appointments.get_by_patient_id(appointment.patient_id):
+            per_slot[stored.slot_id] += 1
+    return sum(count - 1 for count in per_slot.values() if count > 1)
+
+
+def _summary(results: List[tuple[str, float, Optional[Appointment]]], elapsed: float) -> Dict[str, Any]:
+    outcomes = Counter(outcome for outcome, _, _ in results)
+    latencies = sorted(latency for _, latency, _ in results)
+    return {
+        "attempts": len(results),
+        "outcomes": dict(outcomes),
+        "attempts_per_second": len(results) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": statistics.median(latencies) * 1000,
+            "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        },
+    }
+
+
+def run_memory(args: argparse.Namespace) -> Dict[str, Any]:
+    repositories = memory_repositories()
+    slot_ids = asyncio.run(_create_slots(repositories, args.slots))
+
+    results: List[tuple[str, float, Optional[Appointment]]] = []
+    lock = threading.Lock()
+    per_thread = args.attempts // args.threads
+
+    def worker(index: int) -> None:
+        batch = asyncio.run(_run_batch(
+            repositories, slot_ids, per_thread, args.concurrency, args.naive, random.Random(args.seed + index)
+        ))
+        with lock:
+            results.extend(batch)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    report = _summary(results, elapsed)
+    booked = [appointment for _, _, appointment in results if appointment is not None]
+    report["double_bookings"] = asyncio.run(_double_bookings(repositories, booked))
+    return report
+
+
+async def run_redis(args: argparse.Namespace) -> Dict[str, Any]:
+    from src.libs.redis import get_redis_client
+    from src.repository.redis import redis_repositories
+
+    client = get_redis_client()
+    repositories = redis_repositories(client, args.key_prefix)
+    slot_ids = await _create_slots(repositories, args.slots)
+
+    started = time.perf_counter()
+    results = await _run_batch(
+        repositories, slot_ids, args.attempts, args.concurrency, args.naive, random.Random(args.seed)
+    )
+    elapsed = time.perf_counter() - started
+
+    report = _summary(results, elapsed)
+    booked = [appointment for _, _, appointment in results if appointment is not None]
+    report["double_bookings"] = await _double_bookings(repositories, booked)
+
+    await repositories.slots.clear()
+    await repositories.appointments.clear()
+    await client.close()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("memory", "redis"), default="memory")
+    parser.add_argument("--attempts", type=int, default=5000, help="Booking attempts in total")
+    parser.add_argument("--slots", type=int, default=10, help="Hot slots the attempts race for")
+    parser.add_argument("--concurrency", type=int, default=200, help="Attempts in flight per event loop")
+    parser.add_argument("--threads", type=int, default=4, help="Threads (memory backend)")
+    parser.add_argument("--naive", action="store_true", help="Check-then-write instead of compare-and-set")
+    parser.add_argument("--key-prefix", default="bench:booking", help="Redis key prefix (redis backend)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = run_memory(args) if args.backend == "memory" else asyncio.run(run_redis(args))
+    report.update(backend=args.backend, mode="naive" if args.naive else "compare-and-set", slots=args.slots)
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
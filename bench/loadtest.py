@@ -0,0 +1,335 @@
+"""Offline end-to-end websocket load test.
+
+Starts ``--workers`` benchmark servers (`bench.server`: the real app with a
+scripted chat model and a local Redis stand-in), then opens ``--sessions``
+concurrent websocket sessions spread over the chat and voice endpoints and
+the workers. Every session plays one of the multi-turn scripts below.
+
+Reported per channel and overall:
+- time to first chunk (user message sent → first ``ai_message_chunk``)
+- full-turn latency (user message sent → ``ai_message_end``)
+- p50 / p95 / p99 of both, frames per second
+- CPU seconds used by each worker during the load window
+
+Example:
+    python -m bench.loadtest --sessions 100 --workers 2 --json report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import cycle
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from websockets.asyncio.client import connect
+
+from src.core.local_llm import LATENCY_DISTRIBUTIONS
+from src.libs.streaming.codec import available_codecs
+
+SCRIPTS: Dict[str, List[str]] = {
+    "book": [
+        "Hi, I want to book an appointment",
+        "Do you have a slot tomorrow morning?",
+        "Yes, please book it",
+    ],
+    "reschedule": [
+        "I need to reschedule my appointment",
+        "Can you move it to the first one?",
+        "Yes, go ahead",
+    ],
+    "refill": [
+        "Can I get a refill of my prescription?",
+        "Yes, refill it please",
+    ],
+}
+
+CHANNELS = ("chat", "voice")
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class TurnResult:
+    channel: str
+    script: str
+    ttfc: Optional[float]
+    latency: Optional[float]
+    frames: int
+    error: Optional[str] = None
+
+
+@dataclass
+class RunReport:
+    turns: List[TurnResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    worker_cpu: List[Dict[str, Any]] = field(default_factory=list)
+
+
+# ----------------------------------------------------------------------
+# Statistics
+# ----------------------------------------------------------------------
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of *values* (``None`` if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(turns: List[TurnResult], wall_seconds: float) -> Dict[str, Any]:
+    ok = [t for t in turns if t.error is None]
+    ttfc = [t.ttfc for t in ok if t.ttfc is not None]
+    latency = [t.latency for t in ok if t.latency is not None]
+    frames = sum(t.frames for t in turns)
+
+    def pcts(values: List[float]) -> Dict[str, Optional[float]]:
+        return {f"p{p}_ms": _ms(percentile(values, p)) for p in (50, 95, 99)}
+
+    return {
+        "turns": len(turns),
+        "errors": len(turns) - len(ok),
+        "ttfc": pcts(ttfc),
+        "turn_latency": pcts(latency),
+        "frames": frames,
+        "frames_per_second": round(frames / wall_seconds, 1) if wall_seconds else None,
+        "turns_per_second": round(len(ok) / wall_seconds, 2) if wall_seconds else None,
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+# ----------------------------------------------------------------------
+# Client
+# ----------------------------------------------------------------------
+async def run_session(
+    url: str,
+    channel: str,
+    script: str,
+    encoding: str,
+    think_time: float,
+    turn_timeout: float,
+    results: List[TurnResult],
+) -> None:
+    codec = available_codecs()[encoding]
+    async with connect(f"{url}?sessionId={uuid4()}&encoding={encoding}", max_size=None) as ws:
+        codec.decode(await ws.recv())  # session.init
+
+        for text in SCRIPTS[script]:
+            frame = {
+                "type": "user_message_event",
+                "message": {"id": str(uuid4()), "role": "user", "content": text},
+            }
+            started = time.perf_counter()
+            await ws.send(codec.encode(frame))
+
+            ttfc: Optional[float] = None
+            frames = 0
+            try:
+                async with asyncio.timeout(turn_timeout):
+                    while True:
+                        incoming = codec.decode(await ws.recv())
+                        frames += 1
+                        event = incoming.get("type")
+                        if event == "ai_message_chunk" and ttfc is None:
+                            ttfc = time.perf_counter() - started
+                        elif event in ("ai_message_end", "ai_message_interrupted"):
+                            break
+            except Exception as exc:
+                results.append(TurnResult(channel, script, ttfc, None, frames, repr(exc)))
+                return
+
+            results.append(
+                TurnResult(channel, script, ttfc, time.perf_counter() - started, frames)
+            )
+            if think_time:
+                await asyncio.sleep(think_time)
+
+
+async def run_load(args: argparse.Namespace, ports: List[int]) -> RunReport:
+    results: List[TurnResult] = []
+    scripts = cycle(args.scripts)
+    channels = cycle(args.channels)
+    targets = cycle(ports)
+    limit = asyncio.Semaphore(args.concurrency or args.sessions)
+
+    async def one(index: int) -> None:
+        channel, script, port = next(channels), next(scripts), next(targets)
+        # Stagger connects so the first turns do not all start on one tick
+        await asyncio.sleep(index * args.ramp / max(args.sessions, 1))
+        async with limit:
+            url = f"ws://{args.host}:{port}/api/v1/{channel}/websocket"
+            try:
+                await run_session(
+                    url, channel, script, args.encoding, args.think_time, args.turn_timeout, results
+                )
+            except Exception as exc:
+                results.append(TurnResult(channel, script, None, None, 0, repr(exc)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.sessions)))
+    return RunReport(turns=results, wall_seconds=time.perf_counter() - started)
+
+
+# ----------------------------------------------------------------------
+# Workers
+# ----------------------------------------------------------------------
+def _cpu_seconds(pid: int) -> Optional[float]:
+    """User + system CPU of a running process (Linux ``/proc`` only)."""
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            fields = fh.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def start_workers(args: argparse.Namespace) -> List[subprocess.Popen]:
+    workers = []
+    for i in range(args.workers):
+        command = [
+            sys.executable, "-m", "bench.server",
+            "--host", args.host,
+            "--port", str(args.base_port + i),
+            "--first-token-ms", str(args.first_token_ms),
+            "--first-token-jitter-ms", str(args.first_token_jitter_ms),
+            "--token-ms", str(args.token_ms),
+            "--token-jitter-ms", str(args.token_jitter_ms),
+            "--distribution", args.distribution,
+        ]
+        if args.seed is not None:
+            command += ["--seed", str(args.seed + i)]
+        env = {**os.environ, "CHAT_STREAM_POLICY": args.chat_policy, "VOICE_STREAM_POLICY": args.voice_policy}
+        workers.append(subprocess.Popen(command, env=env, cwd=_REPO_ROOT))
+    return workers
+
+
+def wait_healthy(host: str, ports: List[int], timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    for port in ports:
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://{host}:{port}/api/v1/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Worker on port {port} did not become healthy")
+            time.sleep(0.2)
+
+
+def stop_workers(workers: List[subprocess.Popen]) -> List[Optional[float]]:
+    """Stop the workers; return each one's total CPU seconds."""
+    totals: List[Optional[float]] = []
+    for worker in workers:
+        if worker.poll() is None:
+            worker.send_signal(signal.SIGINT)
+    for worker in workers:
+        try:
+            _, _, usage = os.wait4(worker.pid, 0)
+            totals.append(usage.ru_utime + usage.ru_stime)
+        except ChildProcessError:
+            totals.append(None)
+    return totals
+
+
+# ----------------------------------------------------------------------
+# Entry point
+# ----------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline websocket load test.")
+    parser.add_argument("--sessions", type=int, default=20, help="total websocket sessions")
+    parser.add_argument("--concurrency", type=int, default=0, help="max open sessions (0 = all)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=8100)
+    parser.add_argument("--no-spawn", action="store_true", help="use already running workers")
+    parser.add_argument("--channels", nargs="+", choices=CHANNELS, default=list(CHANNELS))
+    parser.add_argument("--scripts", nargs="+", choices=sorted(SCRIPTS), default=sorted(SCRIPTS))
+    parser.add_argument("--encoding", choices=sorted(available_codecs()), default="json")
+    parser.add_argument("--chat-policy", default="token")
+    parser.add_argument("--voice-policy", default="speakable")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between turns")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds to open all sessions")
+    parser.add_argument("--turn-timeout", type=float, default=60.0)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--first-token-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    parser.add_argument("--token-jitter-ms", type=float, default=5.0)
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="normal")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    ports = [args.base_port + i for i in range(args.workers)]
+    workers = [] if args.no_spawn else start_workers(args)
+
+    try:
+        wait_healthy(args.host, ports)
+        cpu_before = [_cpu_seconds(w.pid) for w in workers]
+        report = asyncio.run(run_load(args, ports))
+        cpu_after = [_cpu_seconds(w.pid) for w in workers]
+    finally:
+        cpu_total = stop_workers(workers)
+
+    for i, worker in enumerate(workers):
+        before, after = cpu_before[i], cpu_after[i]
+        window = None if before is None or after is None else after - before
+        report.worker_cpu.append(
+            {
+                "port": ports[i],
+                "pid": worker.pid,
+                "cpu_seconds_load": None if window is None else round(window, 2),
+                "cpu_utilisation": None if window is None else round(window / report.wall_seconds, 3),
+                "cpu_seconds_total": None if cpu_total[i] is None else round(cpu_total[i], 2),
+            }
+        )
+
+    by_channel: Dict[str, List[TurnResult]] = defaultdict(list)
+    for turn in report.turns:
+        by_channel[turn.channel].append(turn)
+
+    summary = {
+        "config": {
+            "sessions": args.sessions,
+            "workers": args.workers,
+            "channels": args.channels,
+            "scripts": args.scripts,
+            "encoding": args.encoding,
+            "first_token_ms": args.first_token_ms,
+            "token_ms": args.token_ms,
+            "distribution": args.distribution,
+        },
+        "wall_seconds": round(report.wall_seconds, 2),
+        "overall": summarize(report.turns, report.wall_seconds),
+        "channels": {
+            channel: summarize(turns, report.wall_seconds)
+            for channel, turns in sorted(by_channel.items())
+        },
+        "workers": report.worker_cpu,
+        "errors": sorted({t.error for t in report.turns if t.error})[:10],
+    }
+
+    print(json.dumps(summary, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(summary, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
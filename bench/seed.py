@@ -0,0 +1,101 @@
+"""Synthetic dataset seeding benchmark.
+
+Seeds the in-memory stores with `src.mock.seed` and reports the row counts,
+the load time and the process's peak memory. Use it to pick a size for the
+``STORE_SEED_*`` settings, or before running the other benchmarks against
+production-like volumes.
+
+With ``--redis``, the seeded rows are then bulk-loaded into the Redis of
+``REDIS_*`` under ``--key-prefix`` (cleared first), the way
+`init_repositories` fills the redis backend, and the copy time is reported
+too.
+
+Example:
+    python -m bench.seed --patients 250000 --providers 5000
+    python -m bench.seed --patients 250000 --providers 5000 --redis
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import time
+from dataclasses import asdict
+
+from src.mock import SeedConfig, seed
+
+
+async def copy_to_redis(key_prefix: str) -> float:
+    """Seconds taken to bulk-load the seeded stores into redis under *key_prefix*."""
+    from src.libs.redis import get_redis_client
+    from src.repository import memory_repositories
+    from src.repository.redis import redis_repositories
+
+    target = redis_repositories(get_redis_client(), key_prefix)
+    await asyncio.gather(*(
+        repository.clear()
+        for repository in (
+            target.patients, target.providers, target.schedules,
+            target.slots, target.appointments, target.prescriptions,
+        )
+    ))
+    started = time.perf_counter()
+    await target.copy_from(memory_repositories())
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=250_000)
+    parser.add_argument("--providers", type=int, default=5_000)
+    parser.add_argument("--days", type=int, default=SeedConfig.days, help="Days of slots per provider")
+    parser.add_argument("--appointment-density", type=float, default=SeedConfig.appointment_density,
+                        help="Share of every provider's slots that is booked")
+    parser.add_argument("--prescriptions-per-patient", type=float, default=SeedConfig.prescriptions_per_patient)
+    parser.add_argument("--rng-seed", type=int, default=SeedConfig.rng_seed)
+    parser.add_argument("--no-demo", dest="demo", action="store_false", help="Skip the hand-written demo rows")
+    parser.add_argument("--redis", action="store_true", help="Also time the bulk load into redis")
+    parser.add_argument("--key-prefix", default="bench:seed", help="Redis key prefix for --redis")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    config = SeedConfig(
+        patients=args.patients,
+        providers=args.providers,
+        days=args.days,
+        appointment_density=args.appointment_density,
+        prescriptions_per_patient=args.prescriptions_per_patient,
+        rng_seed=args.rng_seed,
+        demo=args.demo,
+    )
+    started = time.perf_counter()
+    counts = seed(config)
+    elapsed = time.perf_counter() - started
+
+    total = sum(counts.values())
+    report = {
+        "config": asdict(config),
+        "rows": counts,
+        "total_rows": total,
+        "seconds": elapsed,
+        "rows_per_second": total / elapsed if elapsed else 0.0,
+        # ru_maxrss is in KiB on Linux
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    if args.redis:
+        copy_seconds = asyncio.run(copy_to_redis(args.key_prefix))
+        report["redis"] = {
+            "key_prefix": args.key_prefix,
+            "seconds": copy_seconds,
+            "rows_per_second": total / copy_seconds if copy_seconds else 0.0,
+        }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark worker: the real `src.main:app` with the network taken out.
+
+- The agents run on the local provider (``LLM_PROVIDER=local``), so the
+  supervisor and sub-agents run their real graphs without calling a model API.
+- Redis is replaced by a local stand-in: a client answering `ping`/`close`
+  and an in-memory LangGraph checkpointer registered under the default TTL.
+
+Run a single worker with:
+    python -m bench.server --port 8100
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from src.core.local_llm import LATENCY_DISTRIBUTIONS
+
+
+def _configure_local_model(args: argparse.Namespace) -> None:
+    os.environ["LLM_PROVIDER"] = "local"
+    os.environ["LOCAL_LLM_FIRST_TOKEN_MS"] = str(args.first_token_ms)
+    os.environ["LOCAL_LLM_FIRST_TOKEN_JITTER_MS"] = str(args.first_token_jitter_ms)
+    os.environ["LOCAL_LLM_TOKEN_MS"] = str(args.token_ms)
+    os.environ["LOCAL_LLM_TOKEN_JITTER_MS"] = str(args.token_jitter_ms)
+    os.environ["LOCAL_LLM_DISTRIBUTION"] = args.distribution
+    if args.seed is not None:
+        os.environ["LOCAL_LLM_SEED"] = str(args.seed)
+
+
+class _LocalRedis:
+    """Stand-in for `redis.asyncio.Redis` covering what the app touches."""
+
+    async def ping(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+
+def _install_local_redis() -> None:
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    import src.libs.redis.redis as redis_lib
+
+    redis_lib._redis_client = _LocalRedis()  # type: ignore[assignment]
+    redis_lib._checkpoint_savers[15] = InMemorySaver()  # type: ignore[assignment]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run one offline benchmark worker.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--first-token-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    parser.add_argument("--token-jitter-ms", type=float, default=5.0)
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="normal")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    os.environ.setdefault("ENABLE_FILE_LOGGING", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    _configure_local_model(args)
+    _install_local_redis()
+
+    import uvicorn
+
+    from src.main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
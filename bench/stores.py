@@ -0,0 +1,180 @@
+"""In-memory store lookup benchmark.
+
+Fills each store with ``N`` rows for every size in ``--sizes`` and times the
+indexed lookups the tools use:
+
+- ``AppointmentStore.get_by_patient_id`` (5 appointments per patient)
+- ``PrescriptionStore.get_by_patient_id`` (5 prescriptions per patient)
+- ``SlotStore.for_provider`` (90 stored slots per provider)
+- ``SlotStore.between`` (the next 20 slots of a provider from mid-horizon)
+
+Slot rows are stored without a provider schedule, i.e. they stand for the
+booked slots; no slots are generated.
+
+Each lookup returns the same number of rows at every size, so its cost should
+stay flat as the table grows. With ``--scan`` the previous full-table scan is
+timed alongside for comparison (only up to ``--scan-max`` rows, it is slow).
+
+Rows are built with ``model_construct``; ten million rows of one store need
+a few GB of memory.
+
+Example:
+    python -m bench.stores --sizes 10 1000 100000 1000000 10000000 --scan
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+from uuid import UUID, uuid4
+
+from src.mock.appointment import Appointment, AppointmentStore
+from src.mock.prescription import Prescription, PrescriptionStore
+from src.mock.slot import Slot, SlotStore
+
+PER_PATIENT = 5
+PER_PROVIDER = 90
+
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Median seconds of one call of *fn* over *repeat* calls."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def _owners(rows: int, per_owner: int) -> List[UUID]:
+    return [uuid4() for _ in range(max(1, rows // per_owner))]
+
+
+def bench_appointments(rows: int, repeat: int, scan: bool) -> Dict[str, float]:
+    store = AppointmentStore()
+    store.clear()
+    patients = _owners(rows, PER_PATIENT)
+    for i in range(rows):
+        store.add(Appointment.model_construct(
+            id=uuid4(), patient_id=patients[i % len(patients)], slot_id=uuid4(), provider_id=uuid4(), start=_EPOCH,
+            created_at=_EPOCH,
+        ))
+
+    probe = patients[len(patients) // 2]
+    result = {"indexed": _time(lambda: store.get_by_patient_id(probe), repeat)}
+    if scan:
+        result["scan"] = _time(
+            lambda: [a for a in store._appointments.values() if a.patient_id == probe], max(1, repeat // 10)
+        )
+    store.clear()
+    return result
+
+
+def bench_prescriptions(rows: int, repeat: int, scan: bool) -> Dict[str, float]:
+    store = PrescriptionStore()
+    store.clear()
+    patients = _owners(rows, PER_PATIENT)
+    for i in range(rows):
+        store.add(Prescription.model_construct(
+            id=uuid4(), patient_id=patients[i % len(patients)], name="Atorvastatin", description="", last_refill_date=_EPOCH,
+        ))
+
+    probe = patients[len(patients) // 2]
+    result = {"indexed": _time(lambda: store.get_by_patient_id(probe), repeat)}
+    if scan:
+        result["scan"] = _time(
+            lambda: [p for p in store._prescriptions.values() if p.patient_id == probe], max(1, repeat // 10)
+        )
+    store.clear()
+    return result
+
+
+def bench_slots(rows: int, repeat: int, scan: bool) -> Dict[str, Dict[str, float]]:
+    store = SlotStore()
+    store.clear()
+    providers = _owners(rows, PER_PROVIDER)
+    for i in range(rows):
+        start = _EPOCH + timedelta(minutes=30 * i)
+        store.add(Slot.model_construct(
+            id=uuid4(), provider_id=providers[i % len(providers)], start=start, end=start + timedelta(minutes=30),
+            is_available=False,
+        ))
+
+    probe = providers[len(providers) // 2]
+    middle = _EPOCH + timedelta(minutes=30 * (rows // 2))
+    result = {
+        "for_provider": {"indexed": _time(lambda: store.for_provider(probe), repeat)},
+        "between": {"indexed": _time(lambda: store.between(probe, middle, limit=20), repeat)},
+    }
+    if scan:
+        scan_repeat = max(1, repeat // 10)
+        result["for_provider"]["scan"] = _time(
+            lambda: [s for s in store._slots.values() if s.provider_id == probe], scan_repeat
+        )
+        result["between"]["scan"] = _time(
+            lambda: sorted(
+                (s for s in store._slots.values() if s.provider_id == probe and s.start >= middle),
+                key=lambda s: s.start,
+            )[:20],
+            scan_repeat,
+        )
+    store.clear()
+    return result
+
+
+def run(sizes: List[int], repeat: int, scan: bool, scan_max: int) -> Dict[str, Dict[int, Dict[str, float]]]:
+    report: Dict[str, Dict[int, Dict[str, float]]] = {
+        "appointments.get_by_patient_id": {},
+        "prescriptions.get_by_patient_id": {},
+        "slots.for_provider": {},
+        "slots.between": {},
+    }
+    for rows in sizes:
+        with_scan = scan and rows <= scan_max
+        report["appointments.get_by_patient_id"][rows] = bench_appointments(rows, repeat, with_scan)
+        gc.collect()
+        report["prescriptions.get_by_patient_id"][rows] = bench_prescriptions(rows, repeat, with_scan)
+        gc.collect()
+        slots = bench_slots(rows, repeat, with_scan)
+        report["slots.for_provider"][rows] = slots["for_provider"]
+        report["slots.between"][rows] = slots["between"]
+        gc.collect()
+        print(f"  {rows:>10,} rows done", file=sys.stderr)
+    return report
+
+
+def print_report(report: Dict[str, Dict[int, Dict[str, float]]]) -> None:
+    for lookup, by_size in report.items():
+        print(f"\n{lookup}")
+        print(f"  {'rows':>12}  {'indexed µs':>12}  {'scan µs':>12}")
+        for rows, result in by_size.items():
+            scan = f"{result['scan'] * 1e6:12.1f}" if "scan" in result else f"{'-':>12}"
+            print(f"  {rows:>12,}  {result['indexed'] * 1e6:12.1f}  {scan}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per lookup and size")
+    parser.add_argument("--scan", action="store_true", help="Also time a full-table scan")
+    parser.add_argument("--scan-max", type=int, default=1_000_000, help="Largest size to time the scan at")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.scan, args.scan_max)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
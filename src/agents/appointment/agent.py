@@ -1,12 +1,12 @@
-from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import create_react_agent
-from langchain.chat_models import init_chat_model
 
 from src.agents.state import Configuration
 from src.agents.appointment.state import AppointmentAgentState
-from src.core.llm_provider import LLMProvider, LLMModel
+from src.core.chat_model import get_chat_model
 from src.libs.logger.manager import get_logger
-from src.agents.appointment.prompt import agent_prompt
+from src.agents.appointment.prompt import SYSTEM_MESSAGE
+from src.agents.context import assemble_prompt
+from src.agents.memory import ContextWindow
 from src.agents.appointment.tools import (
     list_appointments,
     book_appointment,   
@@ -20,11 +20,9 @@ from src.agents.appointment.tools import (
 
 logger = get_logger("appointment_agent")
 
-model = init_chat_model(
-    model=LLMModel.GPT_4O_MINI.value,
-    model_provider=LLMProvider.OPENAI.value,
-    temperature=0.0,
-)
+context_window = ContextWindow("appointment_agent")
+
+model = get_chat_model()
 
 all_tools = [
     list_appointments,
@@ -39,9 +37,7 @@ all_tools = [
 
 
 def message_history_prompt(state: AppointmentAgentState):
-    system_prompt = agent_prompt(state)
-
-    return [SystemMessage(content=system_prompt)] + state.messages
+    return assemble_prompt(SYSTEM_MESSAGE, context_window.apply(state.messages), state.patient)
 
 
 appointment_agent = create_react_agent(
@@ -1,26 +1,95 @@
-from datetime import datetime, timezone
-from typing import Annotated
+from datetime import datetime, time, timezone
+from typing import Annotated, Optional
 from uuid import UUID
-from zoneinfo import ZoneInfo
 from langchain_core.messages import ToolMessage
 from langchain_core.tools import InjectedToolCallId, tool
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
 
 from src.agents.appointment.state import AppointmentAgentState
+from src.agents.render import local_clock, local_time, resolve, short_id, table
+from src.agents.tool_cache import APPOINTMENTS, PROVIDERS, cached, invalidate
 from src.libs.logger.manager import get_logger
-from src.mock.appointment import Appointment, AppointmentStatus, appointment_store
-from src.mock.provider import provider_store
-from src.mock.slot import Slot, slot_store
+from src.mock.appointment import Appointment, AppointmentStatus
+from src.mock.provider import Provider
+from src.mock.slot import Slot
+from src.repository import BookingConflict, get_repositories
 
 logger = get_logger("appointment_agent")
 
+# Slots offered per search; the earliest ones matching are shown first
+SLOT_SEARCH_LIMIT = 20
+
+CONFLICT_MESSAGES = {
+    "slot_missing": "Slot not found",
+    "slot_taken": "Selected slot was just booked by someone else, please pick another slot",
+    "appointment_changed": "Appointment was changed in the meantime, please list the appointments again",
+}
+
+
+def conflict_message(conflict: BookingConflict, tool_call_id: str) -> Command:
+    return Command(
+        update={
+            "messages": [
+                ToolMessage(content=CONFLICT_MESSAGES[conflict.reason], tool_call_id=tool_call_id)
+            ]
+        },
+    )
+
+
+async def render_appointments(appointments: list[Appointment]) -> str:
+    providers = {
+        p.id: p
+        for p in await get_repositories().providers.get_many({a.provider_id for a in appointments})
+        if p is not None
+    }
+
+    rows = []
+    for appointment in appointments:
+        provider = providers.get(appointment.provider_id)
+        rows.append(
+            (
+                short_id(appointment.id),
+                local_time(appointment.start),
+                provider.name if provider else "-",
+                appointment.status.value,
+            )
+        )
+    return table("Appointments:", ("id", "start", "provider", "status"), rows)
+
+
+def render_slots(slots: list[Slot]) -> str:
+    return table(
+        "Available slots:",
+        ("id", "start", "end"),
+        ((short_id(slot.id), local_time(slot.start), local_clock(slot.end)) for slot in slots),
+    )
+
+
+async def load_appointments(patient_id: UUID) -> Optional[str]:
+    appointments = await get_repositories().appointments.get_by_patient_id(patient_id)
+    return await render_appointments(appointments) if appointments else None
+
+
+async def load_providers() -> tuple[list[Provider], str]:
+    providers = await get_repositories().providers.all()
+    return providers, table(
+        "Available providers:",
+        ("id", "name", "specialization"),
+        ((short_id(p.id), p.name, p.specialization) for p in providers),
+    )
+
+
+async def patient_appointment(state: AppointmentAgentState, appointment_id: str) -> Optional[Appointment]:
+    """The patient's appointment with *appointment_id* (short or full id)."""
+    return resolve(appointment_id, await get_repositories().appointments.get_by_patient_id(state.patient.id))
+
 
 @tool(
     "list_appointments",
     description="list the all appoinments of a particular patient",
 )
-def list_appointments(
+async def list_appointments(
     state: Annotated[AppointmentAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
@@ -36,9 +105,9 @@ def list_appointments(
                 },
             )
 
-        appointments = appointment_store.get_by_patient_id(state.patient.id)
+        appointments = await cached(APPOINTMENTS, state.patient.id, lambda: load_appointments(state.patient.id))
 
-        if len(appointments) == 0:
+        if appointments is None:
             return Command(
                 update={
                     "messages": [
@@ -53,7 +122,7 @@ def list_appointments(
             update={
                 "messages": [
                     ToolMessage(
-                        content=f"Appointments: {[appointment.model_dump() for appointment in appointments]}",
+                        content=appointments,
                         tool_call_id=tool_call_id,
                     )
                 ]
@@ -77,18 +146,18 @@ def list_appointments(
     "get_providers",
     description="get the all providers",
 )
-def get_providers(
+async def get_providers(
     state: Annotated[AppointmentAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
     try:
-        available_providers = provider_store.all()
+        available_providers, content = await cached(PROVIDERS, None, load_providers)
         return Command(
             update={
                 "providers": available_providers,
                 "messages": [
                     ToolMessage(
-                        content=f"Available providers: {[provider.model_dump() for provider in available_providers]}",
+                        content=content,
                         tool_call_id=tool_call_id,
                     )
                 ],
@@ -109,7 +178,7 @@ def get_providers(
 
 @tool(
     "get_available_slots",
-    description=f"""
+    description="""
   'get the available slots for a particular date and time for a particular provider.
  
   input Rules:
@@ -118,14 +187,14 @@ def get_providers(
      
   date_time:
     - it should be a valid date and time in the format of YYYY-MM-DD HH:MM:SS
-    - it should always be in future (atleast current date time + 15 minutes), current date and time is in ist {datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")}
+    - it should always be in future (atleast current date time + 15 minutes), the current date and time in ist is given in the conversation context
     - reject if date time is in the past
 
   output:
-  - return the list of available slots
+  - return the earliest available slots from that date on (at most 20)
   """,
 )
-def get_available_slots(
+async def get_available_slots(
     provider_id: str,
     date_time: str,
     state: Annotated[AppointmentAgentState, InjectedState],
@@ -143,14 +212,7 @@ def get_available_slots(
                 },
             )
 
-        provider = next(
-            (
-                provider
-                for provider in state.providers
-                if provider.id == UUID(provider_id)
-            ),
-            None,
-        )
+        provider = resolve(provider_id, state.providers)
 
         if provider is None:
             return Command(
@@ -169,24 +231,15 @@ def get_available_slots(
 
         logger.info(f"Converted date time in UTC: {converted_date_time_in_utc}")
 
-        slots = slot_store.for_provider(UUID(provider_id))
+        day_start = datetime.combine(converted_date_time_in_utc.date(), time.min, tzinfo=timezone.utc)
+        slots = await get_repositories().slots.between(provider.id, day_start, only_available=True, limit=SLOT_SEARCH_LIMIT)
 
-        converted_slots_in_ist = []
-        for slot in slots:
-            logger.info(f"slot start date: {slot.start.date()}")
-            if slot.start.date() >= converted_date_time_in_utc.date():
-                slot.start = slot.start.astimezone(ZoneInfo("Asia/Kolkata"))
-                slot.end = slot.end.astimezone(ZoneInfo("Asia/Kolkata"))
-                converted_slots_in_ist.append(slot.model_dump())
-
-        logger.info(f"Converted slots in IST: {converted_slots_in_ist}")
-            
         return Command(
             update={
-                "available_slots": converted_slots_in_ist,
+                "available_slots": [slot.model_dump() for slot in slots],
                 "messages": [
                     ToolMessage(
-                        content=f"Available slots: {converted_slots_in_ist}",
+                        content=render_slots(slots),
                         tool_call_id=tool_call_id,
                     )
                 ],
@@ -209,15 +262,13 @@ def get_available_slots(
     "book_appointment",
     description="book a new appointment for a particular patient",
 )
-def book_appointment(
+async def book_appointment(
     slot_id: str,
     state: Annotated[AppointmentAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
     try:
-        selected_slot = next(
-            (slot for slot in state.available_slots if slot.id == UUID(slot_id)), None
-        )
+        selected_slot = resolve(slot_id, state.available_slots)
 
         if selected_slot is None:
             return Command(
@@ -242,9 +293,15 @@ def book_appointment(
         appointment = Appointment(
             patient_id=state.patient.id,
             slot_id=selected_slot.id,
+            provider_id=selected_slot.provider_id,
+            start=selected_slot.start,
         )
 
-        appointment_store.add(appointment)
+        try:
+            await get_repositories().bookings.book(appointment, selected_slot)
+        except BookingConflict as conflict:
+            return conflict_message(conflict, tool_call_id)
+        invalidate(APPOINTMENTS, state.patient.id)
         return Command(
             update={
                 "messages": [
@@ -272,13 +329,13 @@ def book_appointment(
     "cancel_appointment",
     description="cancel a particular appointment for a particular patient",
 )
-def cancel_appointment(
-    appointment_id: UUID,
+async def cancel_appointment(
+    appointment_id: str,
     state: Annotated[AppointmentAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
     try:
-        appointment = appointment_store.get(appointment_id)
+        appointment = await patient_appointment(state, appointment_id)
 
         if appointment is None:
             return Command(
@@ -315,8 +372,18 @@ def cancel_appointment(
                 },
             )
 
-        appointment.status = AppointmentStatus.CANCELLED
-        appointment_store.update(appointment)
+        repositories = get_repositories()
+        slot = await repositories.slots.get(appointment.slot_id)
+        try:
+            if slot is None:
+                await repositories.appointments.update(
+                    appointment.model_copy(update={"status": AppointmentStatus.CANCELLED})
+                )
+            else:
+                await repositories.bookings.cancel(appointment, slot)
+        except BookingConflict as conflict:
+            return conflict_message(conflict, tool_call_id)
+        invalidate(APPOINTMENTS, state.patient.id)
         return Command(
             update={
                 "messages": [
@@ -344,13 +411,13 @@ def cancel_appointment(
     "confirm_appointment",
     description="confirm a particular appointment for a particular patient",
 )
-def confirm_appointment(
-    appointment_id: UUID,
+async def confirm_appointment(
+    appointment_id: str,
     state: Annotated[AppointmentAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
     try:
-        appointment = appointment_store.get(appointment_id)
+        appointment = await patient_appointment(state, appointment_id)
 
         if appointment is None:
             return Command(
@@ -399,8 +466,9 @@ def confirm_appointment(
                 },
             )
 
-        appointment.status = AppointmentStatus.CONFIRMED
-        appointment_store.update(appointment)
+        confirmed = appointment.model_copy(update={"status": AppointmentStatus.CONFIRMED})
+        await get_repositories().appointments.update(confirmed)
+        invalidate(APPOINTMENTS, state.patient.id)
 
         return Command(
             update={
@@ -429,13 +497,13 @@ def confirm_appointment(
     "get_slot_for_reschedule",
     description="get the slot for reschedule a particular appointment for a particular patient",
 )
-def get_slot_for_reschedule(
-    appointment_id: UUID,
+async def get_slot_for_reschedule(
+    appointment_id: str,
     state: Annotated[AppointmentAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
     try:
-        appointment = appointment_store.get(appointment_id)
+        appointment = await patient_appointment(state, appointment_id)
 
         if appointment is None:
             return Command(
@@ -460,7 +528,7 @@ def get_slot_for_reschedule(
                 },
             )
 
-        current_slot = slot_store.get(appointment.slot_id)
+        current_slot = await get_repositories().slots.get(appointment.slot_id)
 
         if current_slot is None:
             return Command(
@@ -471,13 +539,9 @@ def get_slot_for_reschedule(
                 },
             )
 
-        slots = slot_store.for_provider(current_slot.provider_id)
-
-        available_slots: list[Slot] = []
-
-        for slot in slots:
-            if slot.start > current_slot.end and slot.id != current_slot.id:
-                available_slots.append(slot)
+        available_slots = await get_repositories().slots.between(
+            current_slot.provider_id, current_slot.end, only_available=True, limit=SLOT_SEARCH_LIMIT
+        )
 
         if len(available_slots) == 0:
             return Command(
@@ -496,7 +560,7 @@ def get_slot_for_reschedule(
                 "available_slots": [slot.model_dump() for slot in available_slots],
                 "messages": [
                     ToolMessage(
-                        content=f"Available slots: {[slot.model_dump() for slot in available_slots]}",
+                        content=render_slots(available_slots),
                         tool_call_id=tool_call_id,
                     )
                 ],
@@ -520,14 +584,14 @@ def get_slot_for_reschedule(
     "reschedule_appointment",
     description="reschedule a particular appointment for a particular patient",
 )
-def reschedule_appointment(
-    appointment_id: UUID,
-    new_slot_id: UUID,
+async def reschedule_appointment(
+    appointment_id: str,
+    new_slot_id: str,
     state: Annotated[AppointmentAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
     try:
-        appointment = appointment_store.get(appointment_id)
+        appointment = await patient_appointment(state, appointment_id)
 
         if appointment is None:
             return Command(
@@ -552,44 +616,53 @@ def reschedule_appointment(
                 },
             )
 
-        selected_slot = next(
-            (slot for slot in state.available_slots if slot.id == new_slot_id), None
-        )
+        selected_slot = resolve(new_slot_id, state.available_slots)
 
         if selected_slot is None:
-            return {
+            return Command(update={
                 "messages": [
                     ToolMessage(content="Slot not found", tool_call_id=tool_call_id)
                 ]
-            }
+            })
 
         if not selected_slot.is_available:
-            return {
+            return Command(update={
                 "messages": [
                     ToolMessage(
                         content="Slot is not available", tool_call_id=tool_call_id
                     )
                 ]
-            }
+            })
+
+        repositories = get_repositories()
+        current_slot = await repositories.slots.get(appointment.slot_id)
+        if current_slot is None:
+            return Command(update={
+                "messages": [
+                    ToolMessage(content="Slot not found", tool_call_id=tool_call_id)
+                ]
+            })
 
-        appointment.slot_id = new_slot_id
-        appointment.status = AppointmentStatus.CONFIRMED
-        appointment_store.update(appointment)
+        try:
+            await repositories.bookings.move(appointment, current_slot, selected_slot)
+        except BookingConflict as conflict:
+            return conflict_message(conflict, tool_call_id)
+        invalidate(APPOINTMENTS, state.patient.id)
 
-        return {
+        return Command(update={
             "messages": [
                 ToolMessage(
                     content="Appointment rescheduled successfully",
                     tool_call_id=tool_call_id,
                 )
             ]
-        }
+        })
     except Exception as e:
-        return {
+        return Command(update={
             "messages": [
                 ToolMessage(
                     content=f"Error rescheduling appointment: {e}",
                     tool_call_id=tool_call_id,
                 )
             ]
-        }
+        })
@@ -0,0 +1,58 @@
+"""Prompt assembly that keeps the cacheable prefix stable.
+
+Providers cache prompts by exact prefix. To get the most out of that, every
+sub-agent call is laid out as
+
+  [static system prompt] [conversation so far] [small volatile context]
+
+- the system prompt is a module-level constant, byte-identical for every
+  call, session and process (tool schemas are static as well);
+- volatile data – current IST time, patient details – goes into a short
+  trailing message, so it never invalidates the shared prefix or the cached
+  conversation between ReAct steps. It is a `HumanMessage` tagged as context
+  rather than a `SystemMessage`: Anthropic only takes a system prompt at the
+  start, so a trailing one breaks the fallback to it, while a trailing user
+  message works with every provider (Anthropic merges it into the user turn
+  holding the tool results);
+- the conversation itself is bounded by `src.agents.memory.ContextWindow`,
+  so its size stays flat however long the session runs.
+"""
+
+from datetime import datetime
+from typing import Optional, Sequence
+from zoneinfo import ZoneInfo
+
+from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage
+
+from src.mock.patient import Patient
+
+IST = ZoneInfo("Asia/Kolkata")
+
+# Name of the trailing context message, so it is not mistaken for the patient
+CONTEXT_NAME = "context"
+
+
+def context_message(patient: Optional[Patient], now: Optional[datetime] = None) -> HumanMessage:
+  """Small trailing message with the per-call facts the model needs."""
+  now = (now or datetime.now(IST)).astimezone(IST)
+  lines = [f"Current date and time (IST): {now.strftime('%Y-%m-%d %H:%M')} ({now.strftime('%A')})"]
+  if patient is not None:
+    lines.append(f"Patient: {patient.name}, {patient.age} years")
+  body = "\n".join(lines)
+  return HumanMessage(content=f"<context>\n{body}\n</context>", name=CONTEXT_NAME)
+
+
+def assemble_prompt(
+  system_message: SystemMessage,
+  messages: Sequence[AnyMessage],
+  patient: Optional[Patient],
+) -> list[AnyMessage]:
+  # Anthropic takes a single system prompt: fold a leading summary of the
+  # trimmed history into it (after the static text, so the prefix still matches)
+  messages = list(messages)
+  leading = []
+  while messages and isinstance(messages[0], SystemMessage):
+    leading.append(messages.pop(0).text())
+  if leading:
+    system_message = SystemMessage(content="\n\n".join([system_message.text(), *leading]))
+  return [system_message, *messages, context_message(patient)]
@@ -5,6 +5,7 @@ from src.agents.state import Configuration, MainState
 from src.agents.supervisor.agent import supervisor_agent
 from src.agents.appointment.agent import appointment_agent
 from src.agents.prescription.agent import prescription_agent
+from src.agents.router import router_node
 
 # def supervisor_node(state: MainState):
 
@@ -51,8 +52,10 @@ state_graph = StateGraph(state_schema=MainState, context_schema=Configuration)
 state_graph.add_node("supervisor", supervisor_agent, destinations=tuple(["appointment_agent", "prescription_agent", END]))
 state_graph.add_node("appointment_agent", appointment_agent)
 state_graph.add_node("prescription_agent", prescription_agent)
+state_graph.add_node("router", router_node)
 
-state_graph.add_edge(START, "supervisor")
+# Sticky affinity and the local classifier skip the supervisor when they can
+state_graph.add_edge(START, "router")
 state_graph.add_edge("appointment_agent", END)
 state_graph.add_edge("prescription_agent", END)
 
@@ -0,0 +1,24 @@
+from src.agents.memory.memory_setting import MemorySettings
+from src.agents.memory.summary import RollingSummarizer, extractive_summary
+from src.agents.memory.window import (
+  ContextWindow,
+  cancelled_tool_result,
+  close_tool_calls,
+  default_summarizer,
+  split_turns,
+  trim_tool_results,
+  unanswered_tool_calls,
+)
+
+__all__ = [
+  "MemorySettings",
+  "ContextWindow",
+  "RollingSummarizer",
+  "cancelled_tool_result",
+  "close_tool_calls",
+  "default_summarizer",
+  "extractive_summary",
+  "split_turns",
+  "trim_tool_results",
+  "unanswered_tool_calls",
+]
@@ -0,0 +1,44 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class MemorySettings(BaseSettings):
+  """How much conversation history each agent sends to the model.
+
+  Values are populated from environment variables and can be overridden
+  by explicitly instantiating the class with keyword arguments.
+  """
+
+  token_budget: int = Field(
+    default=4000,
+    alias="CONTEXT_TOKEN_BUDGET",
+    description="Approximate token budget for the conversation part of an agent prompt (0 disables windowing)",
+  )
+  keep_turns: int = Field(
+    default=2,
+    alias="CONTEXT_KEEP_TURNS",
+    description="Most recent user turns that are always sent verbatim",
+  )
+  tool_result_chars: int = Field(
+    default=300,
+    alias="CONTEXT_TOOL_RESULT_CHARS",
+    description="Older tool results are cut to this many characters",
+  )
+
+  summary: str = Field(
+    default="llm",
+    alias="CONTEXT_SUMMARY",
+    description="How dropped turns are summarised (llm | extractive | none)",
+  )
+  summary_workers: int = Field(
+    default=2,
+    alias="CONTEXT_SUMMARY_WORKERS",
+    description="Background threads computing rolling summaries",
+  )
+  summary_cache_size: int = Field(
+    default=1024,
+    alias="CONTEXT_SUMMARY_CACHE_SIZE",
+    description="Rolling summaries kept in memory",
+  )
+
+  model_config = SettingsConfigDict(env_prefix="CONTEXT_", extra="ignore")
@@ -0,0 +1,200 @@
+"""Rolling summaries of conversation turns that left the context window.
+
+Summaries are keyed by the id of the last message they cover. When the
+window moves forward, the new summary is built from the newest cached one
+plus the turns dropped since, so every message is summarised only once.
+
+Summarising with the model happens on a background thread and never on the
+request path: until the model's summary is ready, the agent gets the
+previous summary followed by a cheap extractive digest (user requests and
+the agent's final replies) of the newly dropped turns.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage
+
+from src.agents.memory.memory_setting import MemorySettings
+from src.libs.logger.manager import get_logger
+from src.libs.metrics import registry
+
+logger = get_logger("context_summary")
+
+SUMMARY_MODES = ("llm", "extractive", "none")
+
+SUMMARIES_TOTAL = registry.counter(
+  "context_summaries_total",
+  "Rolling summary lookups and background summarisations",
+  ("mode", "outcome"),
+)
+SUMMARY_SECONDS = registry.histogram(
+  "context_summary_seconds",
+  "Time spent producing a rolling summary in the background",
+  ("mode",),
+)
+
+SUMMARY_PROMPT = (
+  "You maintain the running summary of a conversation between a patient and a clinic assistant. "
+  "Update the existing summary with the new messages. Keep facts the assistant may still need: "
+  "the patient's requests and decisions, appointments and prescriptions mentioned (with their ids), "
+  "what was booked, rescheduled, cancelled or refilled, and anything left open. "
+  "Write at most 120 words of plain text and nothing else."
+)
+
+_LINE_CHARS = 160
+_EXTRACTIVE_CHARS = 1200
+
+
+def _clip(text: str, limit: int) -> str:
+  text = " ".join(text.split())
+  return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def extractive_summary(base: Optional[str], messages: Sequence[AnyMessage]) -> str:
+  """User requests and final replies of *messages*, appended to *base*."""
+  lines = [base] if base else []
+  for message in messages:
+    if isinstance(message, HumanMessage):
+      lines.append(f"User: {_clip(message.text(), _LINE_CHARS)}")
+    elif isinstance(message, AIMessage) and not message.tool_calls and message.text():
+      lines.append(f"Assistant: {_clip(message.text(), _LINE_CHARS)}")
+
+  summary = "\n".join(lines)
+  # Keep the most recent part when the digest grows too long
+  return summary if len(summary) <= _EXTRACTIVE_CHARS else "…" + summary[-_EXTRACTIVE_CHARS:]
+
+
+def _transcript(messages: Sequence[AnyMessage]) -> str:
+  lines = []
+  for message in messages:
+    if isinstance(message, HumanMessage):
+      lines.append(f"User: {message.text()}")
+    elif isinstance(message, AIMessage):
+      if message.text():
+        lines.append(f"Assistant: {message.text()}")
+      for call in message.tool_calls:
+        lines.append(f"Assistant called {call['name']}({call['args']})")
+    else:
+      lines.append(f"Tool result: {_clip(message.text(), 400)}")
+  return "\n".join(lines)
+
+
+class RollingSummarizer:
+  """Caches rolling summaries and refreshes them off the request path."""
+
+  def __init__(self, settings: Optional[MemorySettings] = None, model=None) -> None:
+    settings = settings or MemorySettings()
+    if settings.summary not in SUMMARY_MODES:
+      raise ValueError(f"Unknown CONTEXT_SUMMARY {settings.summary!r}, expected one of {SUMMARY_MODES}")
+
+    self.mode = settings.summary
+    self._model = model
+    self._workers = settings.summary_workers
+    self._cache_size = settings.summary_cache_size
+    self._summaries: OrderedDict[str, str] = OrderedDict()
+    self._pending: set[str] = set()
+    self._lock = threading.Lock()
+    self._executor: Optional[ThreadPoolExecutor] = None
+
+  # ------------------------------------------------------------------
+  # Lookup
+  # ------------------------------------------------------------------
+  def summary_for(self, dropped: Sequence[AnyMessage]) -> Optional[str]:
+    """Summary of *dropped*, the oldest messages of a conversation."""
+    if self.mode == "none" or not dropped:
+      return None
+
+    key = dropped[-1].id
+    base, rest = self._closest(dropped)
+    if not rest:
+      SUMMARIES_TOTAL.inc(mode=self.mode, outcome="hit")
+      return base
+
+    if self.mode == "extractive" or key is None:
+      summary = extractive_summary(base, rest)
+      self._store(key, summary)
+      SUMMARIES_TOTAL.inc(mode=self.mode, outcome="extractive")
+      return summary
+
+    self._schedule(key, base, list(rest))
+    SUMMARIES_TOTAL.inc(mode=self.mode, outcome="pending")
+    return extractive_summary(base, rest)
+
+  def _closest(self, dropped: Sequence[AnyMessage]) -> tuple[Optional[str], Sequence[AnyMessage]]:
+    """Newest cached summary covering a prefix of *dropped*, and what follows it."""
+    with self._lock:
+      for i in range(len(dropped) - 1, -1, -1):
+        summary = self._summaries.get(dropped[i].id) if dropped[i].id else None
+        if summary is not None:
+          self._summaries.move_to_end(dropped[i].id)
+          return summary, dropped[i + 1:]
+    return None, dropped
+
+  def _store(self, key: Optional[str], summary: str) -> None:
+    if key is None:
+      return
+    with self._lock:
+      self._summaries[key] = summary
+      self._summaries.move_to_end(key)
+      while len(self._summaries) > self._cache_size:
+        self._summaries.popitem(last=False)
+
+  # ------------------------------------------------------------------
+  # Background summarisation
+  # ------------------------------------------------------------------
+  def _schedule(self, key: str, base: Optional[str], messages: list[AnyMessage]) -> None:
+    with self._lock:
+      if key in self._pending:
+        return
+      self._pending.add(key)
+      if self._executor is None:
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="context-summary")
+      executor = self._executor
+
+    try:
+      executor.submit(self._summarise, key, base, messages)
+    except RuntimeError:
+      # Executor shut down while the application stops
+      with self._lock:
+        self._pending.discard(key)
+
+  def _summarise(self, key: str, base: Optional[str], messages: list[AnyMessage]) -> None:
+    started = time.perf_counter()
+    try:
+      prompt = f"Existing summary:\n{base or '(none)'}\n\nNew messages:\n{_transcript(messages)}"
+      reply = self._get_model().invoke(
+        [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content=prompt)],
+        config={"tags": ["nostream"], "run_name": "context_summary"},
+      )
+      summary = reply.text().strip()
+      if not summary:
+        raise ValueError("model returned an empty summary")
+
+      self._store(key, summary)
+      SUMMARIES_TOTAL.inc(mode=self.mode, outcome="computed")
+    except Exception as exc:
+      SUMMARIES_TOTAL.inc(mode=self.mode, outcome="failed")
+      logger.warning(f"Rolling summary failed, keeping the extractive digest: {exc}")
+      self._store(key, extractive_summary(base, messages))
+    finally:
+      SUMMARY_SECONDS.observe(time.perf_counter() - started, mode=self.mode)
+      with self._lock:
+        self._pending.discard(key)
+
+  def _get_model(self):
+    if self._model is None:
+      from src.core.chat_model import get_chat_model
+
+      self._model = get_chat_model()
+    return self._model
+
+  def shutdown(self) -> None:
+    """Stop the background workers (call on application shutdown)."""
+    with self._lock:
+      executor, self._executor = self._executor, None
+    if executor is not None:
+      executor.shutdown(wait=False, cancel_futures=True)
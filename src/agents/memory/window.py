@@ -0,0 +1,174 @@
+"""Token-bounded view of the conversation sent to an agent's model.
+
+The history is cut into turns, each starting at a user message, so a tool
+call and its result always travel together. Applied in order until the
+conversation fits ``CONTEXT_TOKEN_BUDGET``:
+
+1. turns older than the last ``CONTEXT_KEEP_TURNS`` get their tool results
+   cut to ``CONTEXT_TOOL_RESULT_CHARS``;
+2. the tool results of the other recent turns are cut as well;
+3. the oldest turns are dropped and replaced by a rolling summary
+   (`RollingSummarizer`) placed right after the static system prompt.
+
+The current turn is never trimmed or dropped.
+
+Before that, `close_tool_calls` repairs histories left by a cancelled run:
+a tool call whose result never arrived gets a "cancelled" result, so the
+provider does not reject every later call on the thread.
+"""
+
+from typing import Optional, Sequence
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from src.agents.memory.memory_setting import MemorySettings
+from src.agents.memory.summary import RollingSummarizer
+from src.libs.metrics import registry
+
+WINDOW_TOKENS = registry.histogram(
+  "context_window_tokens",
+  "Approximate tokens of conversation history sent to an agent's model",
+  ("agent",),
+  buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000),
+)
+WINDOW_TRIMS = registry.counter(
+  "context_window_trims_total",
+  "Model calls whose history was shortened (tool_results = old results cut, turns = turns summarised)",
+  ("agent", "action"),
+)
+
+
+CANCELLED_TOOL_RESULT = "Cancelled: the run was interrupted before this tool finished"
+
+
+def cancelled_tool_result(tool_call: dict) -> ToolMessage:
+  return ToolMessage(content=CANCELLED_TOOL_RESULT, tool_call_id=tool_call["id"], name=tool_call.get("name"))
+
+
+def unanswered_tool_calls(messages: Sequence[AnyMessage]) -> list[dict]:
+  """Tool calls of the last tool-calling message in *messages* without a result."""
+  for index in range(len(messages) - 1, -1, -1):
+    message = messages[index]
+    if isinstance(message, AIMessage) and message.tool_calls:
+      answered = {m.tool_call_id for m in messages[index + 1:] if isinstance(m, ToolMessage)}
+      return [call for call in message.tool_calls if call["id"] not in answered]
+  return []
+
+
+def close_tool_calls(messages: Sequence[AnyMessage]) -> list[AnyMessage]:
+  """*messages* with every tool call answered right after the message making it.
+
+  Calls without a result get `cancelled_tool_result`; results that do not
+  answer a call of the preceding tool-calling message are dropped.
+  """
+  closed: list[AnyMessage] = []
+  pending: dict[str, dict] = {}
+  for message in messages:
+    if isinstance(message, ToolMessage):
+      if pending.pop(message.tool_call_id, None) is not None:
+        closed.append(message)
+      continue
+    closed.extend(cancelled_tool_result(call) for call in pending.values())
+    pending = {}
+    closed.append(message)
+    if isinstance(message, AIMessage):
+      pending = {call["id"]: call for call in message.tool_calls}
+  closed.extend(cancelled_tool_result(call) for call in pending.values())
+  return closed
+
+
+def split_turns(messages: Sequence[AnyMessage]) -> list[list[AnyMessage]]:
+  """Group *messages* into turns, each starting at a user message."""
+  turns: list[list[AnyMessage]] = []
+  for message in messages:
+    if isinstance(message, HumanMessage) or not turns:
+      turns.append([])
+    turns[-1].append(message)
+  return turns
+
+
+def trim_tool_results(turn: list[AnyMessage], max_chars: int) -> list[AnyMessage]:
+  """Copy of *turn* with tool results longer than *max_chars* cut short."""
+  trimmed: list[AnyMessage] = []
+  for message in turn:
+    if isinstance(message, ToolMessage):
+      content = message.text()
+      if len(content) > max_chars:
+        message = message.model_copy(
+          update={"content": f"{content[:max_chars]}… [{len(content) - max_chars} characters trimmed]"}
+        )
+    trimmed.append(message)
+  return trimmed
+
+
+def summary_message(summary: str) -> SystemMessage:
+  return SystemMessage(content=f"Summary of the earlier conversation:\n{summary}")
+
+
+class ContextWindow:
+  """Keeps one agent's prompt history within a token budget."""
+
+  def __init__(
+    self,
+    agent: str,
+    settings: Optional[MemorySettings] = None,
+    summarizer: Optional[RollingSummarizer] = None,
+  ) -> None:
+    settings = settings or MemorySettings()
+    self.agent = agent
+    self.budget = settings.token_budget
+    self.keep_turns = max(1, settings.keep_turns)
+    self.tool_result_chars = settings.tool_result_chars
+    self.summarizer = summarizer or default_summarizer()
+
+  def apply(self, messages: Sequence[AnyMessage]) -> list[AnyMessage]:
+    """History to send: an optional summary followed by the most recent turns."""
+    messages = close_tool_calls(messages)
+    if self.budget <= 0:
+      return messages
+
+    tokens = count_tokens_approximately(messages)
+    if tokens <= self.budget:
+      WINDOW_TOKENS.observe(tokens, agent=self.agent)
+      return messages
+
+    turns = split_turns(messages)
+    recent = len(turns) - self.keep_turns
+    window = [trim_tool_results(t, self.tool_result_chars) if i < recent else t for i, t in enumerate(turns)]
+    if recent > 0:
+      WINDOW_TRIMS.inc(agent=self.agent, action="tool_results")
+
+    sizes = [count_tokens_approximately(t) for t in window]
+
+    # Still over budget: trim the recent turns' tool results, then summarise
+    for i in range(max(recent, 0), len(window) - 1):
+      if sum(sizes) <= self.budget:
+        break
+      window[i] = trim_tool_results(window[i], self.tool_result_chars)
+      sizes[i] = count_tokens_approximately(window[i])
+
+    dropped = 0
+    while dropped < len(window) - 1 and sum(sizes[dropped:]) > self.budget:
+      dropped += 1
+
+    kept = [m for turn in window[dropped:] for m in turn]
+    if dropped:
+      WINDOW_TRIMS.inc(agent=self.agent, action="turns")
+      summary = self.summarizer.summary_for([m for turn in turns[:dropped] for m in turn])
+      if summary:
+        kept.insert(0, summary_message(summary))
+
+    WINDOW_TOKENS.observe(count_tokens_approximately(kept), agent=self.agent)
+    return kept
+
+
+_summarizer: Optional[RollingSummarizer] = None
+
+
+def default_summarizer() -> RollingSummarizer:
+  """Summarizer shared by every agent's window."""
+  global _summarizer
+  if _summarizer is None:
+    _summarizer = RollingSummarizer()
+  return _summarizer
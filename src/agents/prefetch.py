@@ -0,0 +1,66 @@
+"""Speculative prefetch of the data a turn is likely to need.
+
+When ``SPECULATIVE_PREFETCH`` is on, the router starts loading the patient's
+appointments, the providers and the patient's prescriptions as soon as a
+turn begins, so the loads overlap with the supervisor / sub-agent LLM calls
+instead of following them. Results are staged in the tool cache
+(`src.agents.tool_cache`), where the read-only tools pick them up; see the
+``prefetch_*`` metrics for the hit rate and the work wasted on data no tool
+read. Without the tool cache (``TOOL_CACHE_ENABLED=false`` or
+``STORE_BACKEND=redis``) there is nowhere to stage them, and nothing is
+prefetched.
+"""
+
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from src.agents import tool_cache
+from src.agents.appointment.tools import load_appointments, load_providers
+from src.agents.prefetch_setting import PrefetchSettings
+from src.agents.prescription.tools import load_prescriptions
+from src.agents.tool_cache import APPOINTMENTS, PRESCRIPTIONS, PROVIDERS
+
+# What each agent's tools read first
+ENTITIES_BY_AGENT: dict[str, tuple[str, ...]] = {
+  "appointment_agent": (APPOINTMENTS, PROVIDERS),
+  "prescription_agent": (PRESCRIPTIONS,),
+}
+ALL_ENTITIES = (APPOINTMENTS, PROVIDERS, PRESCRIPTIONS)
+
+
+class Prefetcher:
+  """Starts background loads of the tool data for a turn."""
+
+  def __init__(self, settings: Optional[PrefetchSettings] = None) -> None:
+    self.settings = settings or PrefetchSettings()
+    self._limit: Optional[asyncio.Semaphore] = None
+
+  @property
+  def enabled(self) -> bool:
+    return self.settings.enabled
+
+  def start(self, patient_id: UUID, agent: Optional[str] = None) -> int:
+    """Prefetch for a turn routed to *agent* (None: not known yet); returns loads started.
+
+    Must be called from the event loop the tools run on.
+    """
+    if not self.settings.enabled:
+      return 0
+
+    entities = ENTITIES_BY_AGENT.get(agent, ALL_ENTITIES) if self.settings.by_route else ALL_ENTITIES
+    if self._limit is None:
+      self._limit = asyncio.Semaphore(self.settings.workers)
+
+    started = 0
+    for entity in entities:
+      if entity == APPOINTMENTS:
+        started += tool_cache.prefetch(entity, patient_id, lambda: load_appointments(patient_id), self._limit)
+      elif entity == PROVIDERS:
+        started += tool_cache.prefetch(entity, None, load_providers, self._limit)
+      elif entity == PRESCRIPTIONS:
+        started += tool_cache.prefetch(entity, patient_id, lambda: load_prescriptions(patient_id), self._limit)
+    return started
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,28 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class PrefetchSettings(BaseSettings):
+  """Speculative prefetch of tool data at the start of a turn.
+
+  Values are populated from environment variables and can be overridden
+  by explicitly instantiating the class with keyword arguments.
+  """
+
+  enabled: bool = Field(
+    default=False,
+    alias="SPECULATIVE_PREFETCH",
+    description="Start loading the patient's data as soon as a turn begins",
+  )
+  by_route: bool = Field(
+    default=True,
+    alias="PREFETCH_BY_ROUTE",
+    description="Only prefetch the data of the agent the turn was routed to (all of it when the supervisor decides)",
+  )
+  workers: int = Field(
+    default=4,
+    alias="PREFETCH_WORKERS",
+    description="Prefetch loads running at once",
+  )
+
+  model_config = SettingsConfigDict(env_prefix="PREFETCH_", extra="ignore")
@@ -1,139 +1,166 @@
 
 
 from datetime import datetime, timedelta, timezone
+from typing import Annotated, Optional
 from uuid import UUID
-from typing import Annotated
-from zoneinfo import ZoneInfo
 from langgraph.prebuilt import InjectedState
+from langgraph.types import Command
 from langchain_core.messages import ToolMessage
 from langchain_core.tools import InjectedToolCallId, tool
 
 from src.agents.prescription.state import PrescriptionAgentState
-from src.mock.prescription import DeliveryStatus, prescription_store
+from src.agents.render import local_time, resolve, short_id, table
+from src.agents.tool_cache import PRESCRIPTIONS, cached, invalidate
+from src.mock.prescription import DeliveryStatus, Prescription
+from src.repository import get_repositories
+
+
+async def load_prescriptions(patient_id: UUID) -> tuple[list[Prescription], Optional[str]]:
+  prescriptions = await get_repositories().prescriptions.get_by_patient_id(patient_id)
+  if not prescriptions:
+    return prescriptions, None
+
+  return prescriptions, table(
+    "Available prescriptions:",
+    ("id", "name", "description", "last_refill", "next_refill", "delivery"),
+    (
+      (
+        short_id(p.id),
+        p.name,
+        p.description,
+        local_time(p.last_refill_date),
+        local_time(p.next_refill_date),
+        p.delivery_status.value,
+      )
+      for p in prescriptions
+    ),
+  )
 
 
 @tool(
   'list_prescriptions',
   description='list the all prescriptions of a particular patient',
 )
-def list_prescriptions(
+async def list_prescriptions(
   state: Annotated[PrescriptionAgentState, InjectedState],
   tool_call_id: Annotated[str, InjectedToolCallId]
 ):
 
   try:
-    prescriptions = prescription_store.get_by_patient_id(state.patient.id)
+    prescriptions, content = await cached(PRESCRIPTIONS, state.patient.id, lambda: load_prescriptions(state.patient.id))
 
-
-    if len(prescriptions) == 0:
-      return {
+    if content is None:
+      return Command(update={
         "messages": [
           ToolMessage(
             content="No prescriptions found",
             tool_call_id=tool_call_id
           )
         ]
-      }
+      })
     
-    return {
+    return Command(update={
       "available_prescriptions": prescriptions,
       "messages": [
         ToolMessage(
-          content=f"Available prescriptions: {[prescription.model_dump() for prescription in prescriptions]}",
+          content=content,
           tool_call_id=tool_call_id
         )
       ]
-    }
+    })
   
   except Exception as e:
-    return {
+    return Command(update={
       "messages": [
         ToolMessage(
           content=f"Error listing prescriptions: {e}",
           tool_call_id=tool_call_id
         )
       ]
-    }
+    })
 
 @tool(
   'refill_prescription',
-  description=f"""
+  description="""
   refill a particular prescription for a particular patient
 
   input Rules:
   prescription_id:
-    - it should be a valid prescription id (UUID)
+    - it should be a valid prescription id, as listed by list_prescriptions
   date_time:
     - it should be a valid date and time in the format of YYYY-MM-DD HH:MM:SS
-    - it should always be in future (atleast 15 minutes from current date and time), current date and time is in ist {datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")}
+    - it should always be in future (atleast 15 minutes from current date and time), the current date and time in ist is given in the conversation context
     - reject if date time is in the past
 
   output:
   - return the prescription id
   """,
 )
-def refill_prescription(
-  prescription_id: UUID,
+async def refill_prescription(
+  prescription_id: str,
   date_time: str,
   state: Annotated[PrescriptionAgentState, InjectedState],
   tool_call_id: Annotated[str, InjectedToolCallId]
 ):
 
   try:
-    prescription = prescription_store.get(prescription_id)
+    prescription = resolve(prescription_id, await get_repositories().prescriptions.get_by_patient_id(state.patient.id))
 
     if prescription is None:
-      return {
+      return Command(update={
         "messages": [
           ToolMessage(
             content="Prescription not found",
             tool_call_id=tool_call_id
           )
         ]
-      }
+      })
 
     converted_date_time_in_utc = datetime.strptime(date_time, "%Y-%m-%d %H:%M:%S").astimezone(timezone.utc)
 
     if converted_date_time_in_utc < datetime.now(timezone.utc) + timedelta(minutes=15):
-      return {
+      return Command(update={
         "messages": [
           ToolMessage(
             content="You can refill the prescription only after 15 minutes of current date and time",
             tool_call_id=tool_call_id
           )
         ]
-      }
+      })
 
     if prescription.last_refill_date + timedelta(days=4) > converted_date_time_in_utc:
-      return {
+      return Command(update={
         "messages": [
           ToolMessage(
             content="You can refill the prescription only after 4 days of last refill",
             tool_call_id=tool_call_id
           )
         ]
-      }
+      })
 
-    prescription.delivery_status = DeliveryStatus.PENDING
-    prescription.next_refill_date = converted_date_time_in_utc + timedelta(days=4)
-    prescription.last_refill_date = converted_date_time_in_utc
+    refilled = prescription.model_copy(update={
+      "delivery_status": DeliveryStatus.PENDING,
+      "next_refill_date": converted_date_time_in_utc + timedelta(days=4),
+      "last_refill_date": converted_date_time_in_utc,
+    })
 
-    prescription_store.update(prescription)
+    await get_repositories().prescriptions.update(refilled)
+    invalidate(PRESCRIPTIONS, state.patient.id)
 
-    return {
+    return Command(update={
       "messages": [
         ToolMessage(
           content="Prescription refilled successfully",
           tool_call_id=tool_call_id
         )
       ]
-    }
+    })
   except Exception as e:  
-    return {
+    return Command(update={
       "messages": [
         ToolMessage(
           content=f"Error refilling prescription: {e}",
           tool_call_id=tool_call_id
         )
       ]
-    }
\ No newline at end of file
+    })
\ No newline at end of file
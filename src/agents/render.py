@@ -0,0 +1,87 @@
+"""Compact rendering of tool results for the model.
+
+Tool results are read by the model on every following step, so they are
+rendered as small CSV-like tables instead of ``repr`` of pydantic dumps:
+
+- ids are shortened to their first `ID_CHARS` hex characters; tools accept
+  the short form (or a full UUID) and resolve it with `resolve`;
+- times are shown in IST as ``YYYY-MM-DD HH:MM (Day)``;
+- only the columns the model needs to answer or to call the next tool.
+
+Store rows are frozen and shared by every session, so their local-time
+presentation is computed once per instant and zone (`local_view`) and reused
+by every later render instead of being converted per request.
+"""
+
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from src.agents.context import IST
+
+ID_CHARS = 8
+
+T = TypeVar("T")
+
+
+def short_id(value: UUID) -> str:
+  return value.hex[:ID_CHARS]
+
+
+class LocalView(NamedTuple):
+  """An instant as shown in one clinic timezone."""
+
+  when: str
+  """``YYYY-MM-DD HH:MM (Day)``"""
+  clock: str
+  """``HH:MM``"""
+
+
+# Slot starts repeat across providers and requests; refill dates are per row
+@lru_cache(maxsize=65_536)
+def local_view(value: datetime, zone: tzinfo = IST) -> LocalView:
+  local = value.astimezone(zone)
+  return LocalView(
+    when=f"{local.strftime('%Y-%m-%d %H:%M')} ({local.strftime('%a')})",
+    clock=local.strftime("%H:%M"),
+  )
+
+
+def local_time(value: Optional[datetime], zone: tzinfo = IST) -> str:
+  return "-" if value is None else local_view(value, zone).when
+
+
+def local_clock(value: Optional[datetime], zone: tzinfo = IST) -> str:
+  return "-" if value is None else local_view(value, zone).clock
+
+
+def _cell(value: object) -> str:
+  text = " ".join(str(value).split())
+  if "," in text or '"' in text:
+    text = '"' + text.replace('"', '""') + '"'
+  return text
+
+
+def table(title: str, columns: Sequence[str], rows: Iterable[Sequence[object]]) -> str:
+  """``title`` followed by a header line and one comma-separated line per row."""
+  lines = [title, ",".join(columns)]
+  lines.extend(",".join(_cell(value) for value in row) for row in rows)
+  return "\n".join(lines)
+
+
+def resolve(value: str | UUID, candidates: Iterable[T], key: Callable[[T], UUID] = lambda c: c.id) -> Optional[T]:
+  """Candidate whose id is *value*, given in full or as the short form.
+
+  Prefixes shorter than the short form match nothing, so a stray character
+  from the model cannot select a row. Raises `ValueError` when a short id
+  matches several candidates.
+  """
+  text = str(value).strip().lower().replace("-", "")
+  if len(text) < ID_CHARS:
+    return None
+
+  matches = [c for c in candidates if key(c).hex.startswith(text)]
+  if len(matches) > 1:
+    raise ValueError(f"id {value!r} is ambiguous, use the full id")
+  return matches[0] if matches else None
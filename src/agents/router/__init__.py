@@ -0,0 +1,24 @@
+from src.agents.router.affinity import sticky_agent, topic_changed
+from src.agents.router.classifier import (
+  ChainClassifier,
+  Intent,
+  IntentClassifier,
+  NaiveBayesClassifier,
+  RuleClassifier,
+)
+from src.agents.router.node import build_classifier, route, router_node
+from src.agents.router.router_setting import RouterSettings
+
+__all__ = [
+  "RouterSettings",
+  "Intent",
+  "IntentClassifier",
+  "RuleClassifier",
+  "NaiveBayesClassifier",
+  "ChainClassifier",
+  "build_classifier",
+  "route",
+  "router_node",
+  "sticky_agent",
+  "topic_changed",
+]
@@ -0,0 +1,41 @@
+"""Sticky agent affinity.
+
+Once the supervisor handed a conversation to a sub-agent, follow-up turns
+("yes", "tomorrow at 10 works") almost always belong to the same sub-agent.
+`sticky_agent` keeps them there and skips the supervisor's LLM round trip; it
+gives up when there is no active agent yet or the latest user message
+plausibly changed the topic.
+"""
+
+from typing import Optional
+
+from langchain_core.messages import HumanMessage
+
+from src.agents.router.classifier import TOPIC_KEYWORDS
+from src.agents.router.router_setting import RouterSettings
+from src.agents.state import MainState
+
+
+def latest_user_text(state: MainState) -> str:
+  message = next((m for m in reversed(state.messages) if isinstance(m, HumanMessage)), None)
+  return message.text() if message is not None else ""
+
+
+def topic_changed(text: str, active_agent: str) -> bool:
+  """Whether *text* mentions another sub-agent's domain."""
+  return any(
+    pattern.search(text)
+    for agent, pattern in TOPIC_KEYWORDS.items()
+    if agent != active_agent
+  )
+
+
+def sticky_agent(state: MainState, settings: RouterSettings) -> tuple[Optional[str], str]:
+  """Return the agent to bypass to (or None) and the reason."""
+  if not settings.sticky_agent:
+    return None, "disabled"
+  if state.active_agent not in TOPIC_KEYWORDS:
+    return None, "no_active_agent"
+  if topic_changed(latest_user_text(state), state.active_agent):
+    return None, "topic_change"
+  return state.active_agent, "sticky"
@@ -0,0 +1,166 @@
+"""Local intent classifiers that can route a turn without the supervisor LLM.
+
+A classifier maps the latest user message to a sub-agent together with a
+confidence. The router only acts on confident answers and leaves everything
+else (ambiguous, off-topic, chit-chat) to the supervisor.
+
+- `RuleClassifier`: weighted keyword/regex rules, no dependencies.
+- `NaiveBayesClassifier`: a small bag-of-words model trained on labelled
+  utterances (e.g. the supervisor's own past decisions) and stored as JSON.
+- `ChainClassifier`: asks several classifiers in order, first confident wins.
+"""
+
+import json
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+AGENTS = ("appointment_agent", "prescription_agent")
+
+# Words that clearly belong to one sub-agent's domain
+TOPIC_KEYWORDS: dict[str, re.Pattern[str]] = {
+  "appointment_agent": re.compile(
+    r"\b(appointments?|book(ing)?|re-?schedul\w*|cancel\w*|slots?|doctors?|dr|providers?|visits?|consult\w*|check-?ups?)\b",
+    re.IGNORECASE,
+  ),
+  "prescription_agent": re.compile(
+    r"\b(prescriptions?|refills?|medicines?|medications?|meds|pills?|tablets?|pharmacy|dosage|doses?|deliver\w*)\b",
+    re.IGNORECASE,
+  ),
+}
+
+# Negated requests ("I don't want to cancel", "no refill yet") need the supervisor
+NEGATION = re.compile(r"\b(no|not|never|nothing|without|stop|don'?t|doesn'?t|didn'?t|won'?t|can'?t|cannot)\b", re.IGNORECASE)
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+@dataclass(frozen=True)
+class Intent:
+  """Routing decision of a classifier."""
+
+  agent: Optional[str]
+  confidence: float
+  source: str
+
+
+class IntentClassifier(ABC):
+  """Maps a user message to the sub-agent that should handle it."""
+
+  name: str
+
+  @abstractmethod
+  def classify(self, text: str) -> Intent:
+    """Return the most likely agent (or None) and a confidence in [0, 1]."""
+
+
+class RuleClassifier(IntentClassifier):
+  """Keyword/regex rules; confident when one domain is mentioned repeatedly.
+
+  A single keyword stays below the default threshold, and so does any
+  message with a negation, so those turns go to the supervisor.
+  """
+
+  name = "rules"
+
+  def __init__(self, rules: Optional[dict[str, re.Pattern[str]]] = None) -> None:
+    self.rules = rules or TOPIC_KEYWORDS
+
+  def classify(self, text: str) -> Intent:
+    hits = {agent: len(pattern.findall(text)) for agent, pattern in self.rules.items()}
+    matched = {agent: n for agent, n in hits.items() if n}
+
+    if not matched:
+      return Intent(None, 0.0, self.name)
+
+    agent = max(matched, key=matched.__getitem__)
+    if len(matched) == 1:
+      # One mention is a hint, repeated mentions a strong signal
+      confidence = min(0.99, 0.65 + 0.1 * matched[agent])
+    else:
+      # Several domains mentioned: only a weak preference
+      confidence = 0.75 * matched[agent] / sum(matched.values())
+    if NEGATION.search(text):
+      confidence = min(confidence, 0.5)
+    return Intent(agent, confidence, self.name)
+
+
+class NaiveBayesClassifier(IntentClassifier):
+  """Multinomial naive Bayes over word unigrams and bigrams."""
+
+  name = "model"
+
+  def __init__(self, label_counts: dict[str, int], token_counts: dict[str, dict[str, int]]) -> None:
+    self.label_counts = label_counts
+    self.token_counts = token_counts
+    self._totals = {label: sum(counts.values()) for label, counts in token_counts.items()}
+    self._vocabulary = len({t for counts in token_counts.values() for t in counts}) or 1
+    self._documents = sum(label_counts.values()) or 1
+
+  @staticmethod
+  def features(text: str) -> list[str]:
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+  @classmethod
+  def train(cls, examples: Iterable[tuple[str, str]]) -> "NaiveBayesClassifier":
+    """Fit on ``(text, label)`` pairs; labels are agent names or ``"none"``."""
+    label_counts: Counter[str] = Counter()
+    token_counts: dict[str, Counter[str]] = {}
+    for text, label in examples:
+      label_counts[label] += 1
+      token_counts.setdefault(label, Counter()).update(cls.features(text))
+    return cls(dict(label_counts), {label: dict(c) for label, c in token_counts.items()})
+
+  @classmethod
+  def load(cls, path: str | Path) -> "NaiveBayesClassifier":
+    data = json.loads(Path(path).read_text())
+    return cls(data["label_counts"], data["token_counts"])
+
+  def save(self, path: str | Path) -> None:
+    Path(path).write_text(
+      json.dumps({"label_counts": self.label_counts, "token_counts": self.token_counts})
+    )
+
+  def classify(self, text: str) -> Intent:
+    if not self.label_counts:
+      return Intent(None, 0.0, self.name)
+
+    features = self.features(text)
+    scores: dict[str, float] = {}
+    for label, documents in self.label_counts.items():
+      counts, total = self.token_counts.get(label, {}), self._totals.get(label, 0)
+      score = math.log(documents / self._documents)
+      for feature in features:
+        score += math.log((counts.get(feature, 0) + 1) / (total + self._vocabulary))
+      scores[label] = score
+
+    best = max(scores, key=scores.__getitem__)
+    # Softmax over log scores gives the posterior of the best label
+    top = scores[best]
+    confidence = 1.0 / sum(math.exp(score - top) for score in scores.values())
+    return Intent(best if best in AGENTS else None, confidence, self.name)
+
+
+class ChainClassifier(IntentClassifier):
+  """Consults *classifiers* in order and returns the first confident intent."""
+
+  name = "chain"
+
+  def __init__(self, classifiers: Sequence[IntentClassifier], threshold: float) -> None:
+    self.classifiers = list(classifiers)
+    self.threshold = threshold
+
+  def classify(self, text: str) -> Intent:
+    best = Intent(None, 0.0, self.name)
+    for classifier in self.classifiers:
+      intent = classifier.classify(text)
+      if intent.agent is not None and intent.confidence >= self.threshold:
+        return intent
+      if intent.confidence > best.confidence:
+        best = intent
+    return best
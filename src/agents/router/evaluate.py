@@ -0,0 +1,133 @@
+"""Offline evaluation of the local intent classifier against the LLM router.
+
+Recorded conversations are read from JSONL, one object per line, either
+
+- a labelled utterance: ``{"text": "...", "label": "appointment_agent"}``
+  (``label`` is an agent name or ``"none"`` when the supervisor declined), or
+- a conversation: ``{"messages": [...]}`` as produced by
+  ``langchain_core.messages.messages_to_dict``. Every user message answered
+  by the supervisor is labelled with its decision: the handoff tool it
+  called, or ``"none"`` when it replied itself. Turns a sub-agent answered
+  directly (sticky affinity, classifier) carry no label and are skipped.
+
+Usage:
+    python -m src.agents.router.evaluate eval conversations.jsonl --classifier rules
+    python -m src.agents.router.evaluate train conversations.jsonl --out intent.json
+    python -m src.agents.router.evaluate eval conversations.jsonl \\
+        --classifier rules+model --model intent.json
+"""
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Iterator
+
+from langchain_core.messages import AIMessage, HumanMessage, messages_from_dict
+
+from src.agents.router.classifier import NaiveBayesClassifier
+from src.agents.router.node import build_classifier
+from src.agents.router.router_setting import RouterSettings
+
+_HANDOFF_PREFIX = "handoff_to_"
+_SUPERVISOR_NAME = "supervisor_agent"
+
+
+def labelled_turns(messages: list) -> Iterator[tuple[str, str]]:
+  """Yield ``(user text, supervisor decision)`` pairs from one conversation."""
+  for i, message in enumerate(messages):
+    if not isinstance(message, HumanMessage):
+      continue
+    reply = next((m for m in messages[i + 1:] if isinstance(m, (AIMessage, HumanMessage))), None)
+    if not isinstance(reply, AIMessage) or reply.name not in (None, _SUPERVISOR_NAME):
+      continue
+
+    handoffs = [c["name"] for c in reply.tool_calls if c["name"].startswith(_HANDOFF_PREFIX)]
+    if handoffs:
+      yield message.text(), handoffs[0][len(_HANDOFF_PREFIX):]
+    elif not reply.tool_calls:
+      yield message.text(), "none"
+
+
+def load_examples(path: str) -> list[tuple[str, str]]:
+  examples: list[tuple[str, str]] = []
+  for line in Path(path).read_text().splitlines():
+    if not line.strip():
+      continue
+    record = json.loads(line)
+    if "messages" in record:
+      examples.extend(labelled_turns(messages_from_dict(record["messages"])))
+    else:
+      examples.append((record["text"], record["label"]))
+  return examples
+
+
+def evaluate(examples: list[tuple[str, str]], settings: RouterSettings) -> dict:
+  classifier = build_classifier(settings)
+  if classifier is None:
+    raise SystemExit("ROUTER_CLASSIFIER is 'none', nothing to evaluate")
+
+  decided = correct = 0
+  by_source: Counter[str] = Counter()
+  confusion: Counter[tuple[str, str]] = Counter()
+  misroutes: list[dict] = []
+
+  for text, label in examples:
+    intent = classifier.classify(text)
+    if intent.agent is None or intent.confidence < settings.classifier_threshold:
+      confusion[(label, "supervisor")] += 1
+      continue
+
+    decided += 1
+    by_source[intent.source] += 1
+    confusion[(label, intent.agent)] += 1
+    if intent.agent == label:
+      correct += 1
+    elif len(misroutes) < 20:
+      misroutes.append({"text": text, "llm": label, "local": intent.agent, "confidence": round(intent.confidence, 3)})
+
+  total = len(examples)
+  return {
+    "classifier": settings.classifier,
+    "threshold": settings.classifier_threshold,
+    "examples": total,
+    "coverage": round(decided / total, 3) if total else None,
+    "accuracy_when_decided": round(correct / decided, 3) if decided else None,
+    "fallback_to_supervisor": total - decided,
+    "decided_by": dict(by_source),
+    "confusion": {f"{llm} -> {local}": n for (llm, local), n in sorted(confusion.items())},
+    "misroutes": misroutes,
+  }
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Evaluate or train the local intent classifier.")
+  commands = parser.add_subparsers(dest="command", required=True)
+
+  eval_parser = commands.add_parser("eval", help="compare the classifier with recorded LLM decisions")
+  eval_parser.add_argument("path", help="JSONL of labelled utterances or conversations")
+  eval_parser.add_argument("--classifier", default="rules", help="none | rules | model | rules+model")
+  eval_parser.add_argument("--model", help="trained model JSON (for 'model')")
+  eval_parser.add_argument("--threshold", type=float, default=None)
+
+  train_parser = commands.add_parser("train", help="fit the naive Bayes model on recorded decisions")
+  train_parser.add_argument("path", help="JSONL of labelled utterances or conversations")
+  train_parser.add_argument("--out", required=True, help="where to write the model JSON")
+
+  args = parser.parse_args()
+  examples = load_examples(args.path)
+
+  if args.command == "train":
+    NaiveBayesClassifier.train(examples).save(args.out)
+    print(json.dumps({"examples": len(examples), "labels": dict(Counter(l for _, l in examples)), "out": args.out}, indent=2))
+    return
+
+  overrides = {"ROUTER_CLASSIFIER": args.classifier, "ROUTER_CLASSIFIER_MODEL_PATH": args.model}
+  if args.threshold is not None:
+    overrides["ROUTER_CLASSIFIER_THRESHOLD"] = args.threshold
+  settings = RouterSettings(**overrides)
+  print(json.dumps(evaluate(examples, settings), indent=2))
+
+
+if __name__ == "__main__":
+  main()
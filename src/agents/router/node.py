@@ -0,0 +1,97 @@
+"""Entry node of the main graph.
+
+Decides who handles a user turn, cheapest first:
+
+1. sticky affinity – follow-ups stay with the active sub-agent;
+2. the local intent classifier, when it is confident;
+3. the LLM supervisor for everything else.
+
+With ``SPECULATIVE_PREFETCH`` on it also starts loading the data the chosen
+agent is likely to read, see `src.agents.prefetch`.
+"""
+
+from typing import Literal, Optional
+
+from langgraph.types import Command
+
+from src.agents.prefetch import prefetcher
+from src.agents.router.affinity import latest_user_text, sticky_agent
+from src.agents.router.classifier import (
+  ChainClassifier,
+  IntentClassifier,
+  NaiveBayesClassifier,
+  RuleClassifier,
+)
+from src.agents.router.router_setting import RouterSettings
+from src.agents.state import MainState
+from src.libs.logger.manager import get_logger
+from src.libs.metrics import registry
+
+logger = get_logger("router")
+
+SUPERVISOR = "supervisor"
+
+ROUTING_DECISIONS = registry.counter(
+  "router_decisions_total",
+  "Routing decisions for user turns (bypass = sent straight to the active agent)",
+  ("decision", "reason"),
+)
+
+_settings = RouterSettings()
+
+
+def build_classifier(settings: RouterSettings) -> Optional[IntentClassifier]:
+  """Build the classifier chain named by ``ROUTER_CLASSIFIER``."""
+  classifiers: list[IntentClassifier] = []
+  for name in settings.classifier.split("+"):
+    name = name.strip()
+    if name in ("", "none"):
+      continue
+    if name == "rules":
+      classifiers.append(RuleClassifier())
+    elif name == "model":
+      if not settings.classifier_model_path:
+        logger.warning("ROUTER_CLASSIFIER includes 'model' but no model path is set")
+        continue
+      classifiers.append(NaiveBayesClassifier.load(settings.classifier_model_path))
+    else:
+      raise ValueError(f"Unknown intent classifier: {name}")
+
+  if not classifiers:
+    return None
+  return ChainClassifier(classifiers, threshold=settings.classifier_threshold)
+
+
+classifier = build_classifier(_settings)
+
+
+def route(state: MainState) -> tuple[str, str, str]:
+  """Return ``(node, decision, reason)`` for the current turn."""
+  agent, reason = sticky_agent(state, _settings)
+  if agent is not None:
+    return agent, "bypass", reason
+
+  if classifier is not None:
+    intent = classifier.classify(latest_user_text(state))
+    if intent.agent is not None and intent.confidence >= _settings.classifier_threshold:
+      return intent.agent, "classifier", intent.source
+    reason = f"{reason}_ambiguous" if reason == "topic_change" else "ambiguous"
+
+  return SUPERVISOR, SUPERVISOR, reason
+
+
+async def router_node(
+  state: MainState,
+) -> Command[Literal["supervisor", "appointment_agent", "prescription_agent"]]:
+  node, decision, reason = route(state)
+  ROUTING_DECISIONS.inc(decision=decision, reason=reason)
+
+  # Overlap the data loads with the LLM calls that follow
+  if prefetcher.enabled and state.patient is not None:
+    prefetcher.start(state.patient.id, None if node == SUPERVISOR else node)
+
+  if node == SUPERVISOR:
+    return Command(goto=node)
+
+  logger.debug(f"Routing turn to {node} ({decision}: {reason})")
+  return Command(goto=node, update={"active_agent": node})
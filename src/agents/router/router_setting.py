@@ -0,0 +1,36 @@
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RouterSettings(BaseSettings):
+  """Configuration for routing user turns before the supervisor.
+
+  Values are populated from environment variables and can be overridden
+  by explicitly instantiating the class with keyword arguments.
+  """
+
+  sticky_agent: bool = Field(
+    default=True,
+    alias="ROUTER_STICKY_AGENT",
+    description="Send follow-up turns straight to the active sub-agent unless the topic changed",
+  )
+
+  classifier: str = Field(
+    default="none",
+    alias="ROUTER_CLASSIFIER",
+    description="Local intent classifier in front of the supervisor (none | rules | model | rules+model)",
+  )
+  classifier_threshold: float = Field(
+    default=0.8,
+    alias="ROUTER_CLASSIFIER_THRESHOLD",
+    description="Minimum confidence for the classifier to route without the supervisor",
+  )
+  classifier_model_path: Optional[str] = Field(
+    default=None,
+    alias="ROUTER_CLASSIFIER_MODEL_PATH",
+    description="JSON file of a trained naive Bayes intent model",
+  )
+
+  model_config = SettingsConfigDict(env_prefix="ROUTER_", extra="ignore")
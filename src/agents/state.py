@@ -1,4 +1,4 @@
-from typing import Annotated, TypedDict
+from typing import Annotated, Optional, TypedDict
 from langchain_core.messages import AnyMessage
 from langgraph.graph import add_messages
 from pydantic import BaseModel, Field
@@ -20,3 +20,5 @@ class MainState(BaseModel):
   remaining_steps: int = Field(default=10)
   messages: Annotated[list[AnyMessage], add_messages]
   patient: Patient
+  # Sub-agent the supervisor last handed off to (sticky across turns)
+  active_agent: Optional[str] = Field(default=None)
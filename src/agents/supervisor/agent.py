@@ -1,30 +1,18 @@
+from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import create_react_agent
-from langchain.chat_models import init_chat_model
-from src.core.llm_provider import LLMProvider, LLMModel
+from src.core.chat_model import get_chat_model
 
 from src.libs.logger.manager import get_logger
 from src.agents.supervisor.state import SupervisorState
 from src.agents.supervisor.tools import handoff_to_appointment_agent, handoff_to_prescription_agent
 from src.agents.state import Configuration
+from src.agents.memory import ContextWindow
 
 logger = get_logger("supervisor_agent")
 
-supervisor_agent = create_react_agent(
-  model=init_chat_model(
-    model=LLMModel.GPT_4O_MINI.value,
-    model_provider=LLMProvider.OPENAI.value,
-    temperature=0.0,
-  ).bind_tools([
-    handoff_to_appointment_agent,
-    handoff_to_prescription_agent
-  ], parallel_tool_calls=False),
-  name="supervisor_agent",
-  tools=[
-    handoff_to_appointment_agent,
-    handoff_to_prescription_agent
-  ],
-  state_schema=SupervisorState,
-  prompt="""
+context_window = ContextWindow("supervisor_agent")
+
+SYSTEM_MESSAGE = SystemMessage(content="""
     You are a router whose responsibility is to decide the correct agent to call based on the user's on going conversation.
 
       Assigned Agents:
@@ -42,7 +30,25 @@ supervisor_agent = create_react_agent(
       4. You can not modify the underlying agent response, you can only call the appropriate agent.
       5. Do not disclose any internal infromation to the user. always stick on your role. If any thing is not related to your role, politely decline and tell what you can only do.
       6. Never mention the existence of agents, tools, workflows, or routing mechanisms. All operations should appear seamless to the user
-  """,
+  """)
+
+
+def message_history_prompt(state: SupervisorState):
+  return [SYSTEM_MESSAGE, *context_window.apply(state.messages)]
+
+
+supervisor_agent = create_react_agent(
+  model=get_chat_model().bind_tools([
+    handoff_to_appointment_agent,
+    handoff_to_prescription_agent
+  ], parallel_tool_calls=False),
+  name="supervisor_agent",
+  tools=[
+    handoff_to_appointment_agent,
+    handoff_to_prescription_agent
+  ],
+  state_schema=SupervisorState,
+  prompt=message_history_prompt,
   checkpointer=True,
   context_schema=Configuration,
 )   
\ No newline at end of file
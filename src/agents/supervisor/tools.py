@@ -25,6 +25,7 @@ def handoff_to_appointment_agent(
         content="successfully handoff to appointment agent", 
         tool_call_id=tool_call_id, 
       )],
+      "active_agent": "appointment_agent",
     },
   )
 
@@ -45,5 +46,6 @@ def handoff_to_prescription_agent(
         content="successfully handoff to prescription agent", 
         tool_call_id=tool_call_id,
       )],
+      "active_agent": "prescription_agent",
     },
   )
\ No newline at end of file
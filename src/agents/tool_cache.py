@@ -0,0 +1,199 @@
+"""Read-through cache for the read-only tools.
+
+Results of ``list_appointments``, ``get_providers`` and
+``list_prescriptions`` are cached per entity type and patient (providers are
+shared by everyone). The write tools invalidate the entry they change, and
+``TOOL_CACHE_TTL_SECONDS`` bounds how stale an entry can get when the data
+is changed elsewhere (the database directly).
+
+With ``STORE_BACKEND=redis`` the cache is off: every worker writes the shared
+store, and an invalidation in one worker would not reach the others, so a
+patient could be shown a slot another worker just booked for up to the TTL.
+
+Concurrent reads of a missing entry share one load, and a load that was
+running when its entry was invalidated does not store what it read.
+
+The cache is also where speculative prefetches (`src.agents.prefetch`) are
+staged: `prefetch` loads an entry in a background task, a tool reading it
+while the load is still running waits for that load instead of starting its own,
+and every prefetched entry is reported as used or wasted once its fate is
+known.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+from uuid import UUID
+
+from src.libs.cache import CacheSettings, TTLCache
+from src.libs.logger.manager import get_logger
+from src.libs.metrics import registry
+from src.repository.repository_setting import RepositorySettings
+
+logger = get_logger("tool_cache")
+
+APPOINTMENTS = "appointments"
+PROVIDERS = "providers"
+PRESCRIPTIONS = "prescriptions"
+
+PREFETCHES = registry.counter(
+  "prefetch_total",
+  "Speculative prefetches (started, skipped = already cached or in flight, "
+  "used = read by a tool, wasted = expired or invalidated unread, failed)",
+  ("entity", "outcome"),
+)
+PREFETCH_SECONDS = registry.histogram(
+  "prefetch_seconds",
+  "Time spent loading speculatively prefetched data",
+  ("entity",),
+)
+PREFETCH_WASTED_SECONDS = registry.counter(
+  "prefetch_wasted_seconds_total",
+  "Load time spent on prefetches that were never read",
+  ("entity",),
+)
+
+T = TypeVar("T")
+Key = tuple[str, Optional[UUID]]
+Loader = Callable[[], Awaitable[T]]
+
+_settings = CacheSettings()
+# Invalidations are process-local, so only the per-process memory store can be cached
+_cache: Optional[TTLCache] = (
+  TTLCache("tool_results", _settings.max_entries, _settings.ttl_seconds)
+  if _settings.enabled and RepositorySettings().backend == "memory"
+  else None
+)
+
+_MISSING = object()
+
+# Loads still running (tool reads and prefetches), and prefetched entries not
+# read yet (key -> load seconds). Only touched from the event loop, so no lock
+# is needed.
+_inflight: dict[Hashable, asyncio.Task] = {}
+_unread: dict[Hashable, float] = {}
+# Every running load, so invalidated ones are not garbage collected mid-load
+_tasks: set[asyncio.Task] = set()
+
+
+async def cached(entity: str, patient_id: Optional[UUID], loader: Loader[T]) -> T:
+  """Result of *loader* for *entity* of *patient_id*, served from cache when fresh."""
+  if _cache is None:
+    return await loader()
+
+  key: Key = (entity, patient_id)
+  task = _inflight.get(key)
+  if task is not None:
+    # Wait for the running load without cancelling it if this tool call is
+    # cancelled; when it failed or was invalidated the entry is loaded below
+    await asyncio.wait([task])
+
+  unread = _unread.pop(key, None)
+  if unread is not None:
+    fresh = key in _cache
+    PREFETCHES.inc(entity=entity, outcome="used" if fresh else "wasted")
+    if not fresh:
+      PREFETCH_WASTED_SECONDS.inc(unread, entity=entity)
+
+  value = _cache.get(key, _MISSING)
+  if value is not _MISSING:
+    return value
+
+  task = _inflight.get(key)
+  if task is None:
+    version = _cache.version(key)
+
+    async def load() -> T:
+      value = await loader()
+      _cache.set(key, value, version)
+      return value
+
+    task = _start(key, load())
+  return await asyncio.shield(task)
+
+
+def invalidate(entity: str, patient_id: Optional[UUID]) -> None:
+  """Drop the cached *entity* of *patient_id* after a write."""
+  if _cache is None:
+    return
+
+  key: Key = (entity, patient_id)
+  # A load still running may have read the old data: later reads must not
+  # join it, and the cache refuses to store its result
+  _inflight.pop(key, None)
+  unread = _unread.pop(key, None)
+  if unread is not None:
+    PREFETCHES.inc(entity=entity, outcome="wasted")
+    PREFETCH_WASTED_SECONDS.inc(unread, entity=entity)
+  _cache.invalidate(key)
+
+
+def prefetch(
+  entity: str,
+  patient_id: Optional[UUID],
+  loader: Loader[object],
+  limit: Optional[asyncio.Semaphore] = None,
+) -> bool:
+  """Load *entity* of *patient_id* into the cache in a background task.
+
+  At most as many loads as *limit* allows run at once. Returns False when
+  there is nothing to do: caching is disabled, the entry is fresh or it is
+  already being loaded.
+  """
+  if _cache is None:
+    return False
+
+  key: Key = (entity, patient_id)
+  if key in _inflight or key in _cache:
+    PREFETCHES.inc(entity=entity, outcome="skipped")
+    return False
+
+  unread = _unread.pop(key, None)
+  if unread is not None:
+    # Prefetched earlier and expired without being read
+    PREFETCHES.inc(entity=entity, outcome="wasted")
+    PREFETCH_WASTED_SECONDS.inc(unread, entity=entity)
+
+  version = _cache.version(key)
+
+  async def run() -> None:
+    if limit is not None:
+      await limit.acquire()
+    started = time.perf_counter()
+    try:
+      value = await loader()
+    except Exception as exc:
+      PREFETCHES.inc(entity=entity, outcome="failed")
+      logger.warning(f"Prefetch of {entity} failed: {exc}")
+      return
+    finally:
+      if limit is not None:
+        limit.release()
+
+    elapsed = time.perf_counter() - started
+    PREFETCH_SECONDS.observe(elapsed, entity=entity)
+    if _cache.set(key, value, version):
+      _unread[key] = elapsed
+    else:
+      # Invalidated by a write while loading
+      PREFETCHES.inc(entity=entity, outcome="wasted")
+      PREFETCH_WASTED_SECONDS.inc(elapsed, entity=entity)
+
+  _start(key, run())
+  PREFETCHES.inc(entity=entity, outcome="started")
+  return True
+
+
+def _start(key: Key, load: Awaitable[T]) -> "asyncio.Task[T]":
+  """Run *load* as the in-flight load of *key*."""
+  task = asyncio.get_running_loop().create_task(load)
+  _inflight[key] = task
+  _tasks.add(task)
+
+  def done(task: asyncio.Task) -> None:
+    _tasks.discard(task)
+    if _inflight.get(key) is task:
+      del _inflight[key]
+
+  task.add_done_callback(done)
+  return task
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
 from src.apis.voice import voice_router
 from src.apis.chat import chat_router
+from src.libs.metrics import registry
 
 
 # Aggregate all API routers here
@@ -17,5 +19,13 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@api_router.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Latency histograms and counters in the Prometheus text format."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 
 
@@ -0,0 +1,222 @@
+"""Per-connection websocket session shared by the chat and voice routers.
+
+Each connection runs two tasks:
+
+- the **reader** (the endpoint coroutine itself) which keeps consuming
+  frames, so `ping`/`heartbeat` are answered even while a reply streams;
+- a **generation** task running the graph for the current user turn.
+
+A new `user_message_event` (barge-in) or an explicit `cancel` event aborts the
+in-flight run: the task is cancelled, which closes the graph stream and the
+underlying LLM request, and the aborted reply is closed with
+`ai_message_interrupted` instead of `ai_message_end`.
+
+Frames are never written inline: they go through a bounded `OutboundQueue`
+drained by its own writer task, so a slow client cannot stall the graph run.
+
+The wire encoding is negotiated at connect time (`encoding` query param or a
+websocket subprotocol such as `msgpack.v1`), see `src.libs.streaming.codec`.
+"""
+
+import asyncio
+from typing import Any, Optional
+from uuid import uuid4
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from src.apis.streaming import generate_response, streaming_settings
+from src.libs.logger.manager import get_logger
+from src.libs.streaming import OutboundQueue, negotiate_codec
+
+
+logger = get_logger("ws_session")
+
+
+class ConversationSession:
+    """Reader loop plus at most one generation task for a websocket."""
+
+    def __init__(self, websocket: WebSocket, channel: str) -> None:
+        self.websocket = websocket
+        self.channel = channel
+
+        # Resolve or create session id before accepting
+        session_id: str | None = websocket.headers.get(
+            "x-session-id"
+        ) or websocket.query_params.get("sessionId")
+        self.is_new_session = not session_id
+        self.session_id: str = session_id or str(uuid4())
+
+        offered = websocket.headers.get("sec-websocket-protocol", "")
+        self.codec, self.subprotocol = negotiate_codec(
+            websocket.query_params.get("encoding"),
+            [p.strip() for p in offered.split(",") if p.strip()],
+        )
+
+        self.outbound = OutboundQueue(
+            self._write_frame,
+            max_frames=streaming_settings.outbound_max_frames,
+            overflow=streaming_settings.outbound_overflow,
+            on_overflow=self._disconnect_slow_client,
+        )
+        self._generation: Optional[asyncio.Task[None]] = None
+        self._generation_message_id: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def run(self) -> None:
+        await self.websocket.accept(subprotocol=self.subprotocol)
+        self.outbound.start()
+        await self.send(
+            {
+                "type": "session.init",
+                "sessionId": self.session_id,
+                "isNew": self.is_new_session,
+                "encoding": self.codec.name,
+            }
+        )
+
+        try:
+            while True:
+                incoming = await self.websocket.receive()
+                if incoming["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(incoming.get("code", 1000))
+                await self._handle(self._parse(incoming.get("text"), incoming.get("bytes")))
+
+        except WebSocketDisconnect:
+            # Session state is preserved in the checkpointer.
+            logger.info(f"WebSocket disconnected for session {self.session_id}")
+
+        except RuntimeError:
+            # Raised by `receive` once we closed a lagging client ourselves
+            if not self.outbound.closed:
+                raise
+
+        finally:
+            await self._cancel_generation(notify=False)
+            await self.outbound.close()
+            logger.info(
+                f"Outbound stats for session {self.session_id}: {self.outbound.stats.as_dict()}"
+            )
+
+    async def send(self, frame: dict[str, Any]) -> None:
+        await self.outbound.put(frame)
+
+    async def _write_frame(self, frame: dict[str, Any]) -> None:
+        data = self.codec.encode(frame)
+        if isinstance(data, bytes):
+            await self.websocket.send_bytes(data)
+        else:
+            await self.websocket.send_text(data)
+
+    async def _disconnect_slow_client(self) -> None:
+        logger.warning(f"Outbound queue overflow, disconnecting session {self.session_id}")
+        try:
+            await self.websocket.close(code=1013)
+        except RuntimeError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Inbound frames
+    # ------------------------------------------------------------------
+    def _parse(self, text: Optional[str], data: Optional[bytes]) -> dict[str, Any]:
+        raw = text if text is not None else data or b""
+        try:
+            payload = self.codec.decode(raw)
+        except ValueError:
+            payload = None
+
+        if not isinstance(payload, dict):
+            # Treat plain text as a quick user message
+            content = text if text is not None else raw.decode("utf-8", "replace")  # type: ignore[union-attr]
+            payload = {
+                "type": "user_message_event",
+                "message": {
+                    "id": str(uuid4()),
+                    "role": "user",
+                    "content": content,
+                },
+            }
+        return payload
+
+    async def _handle(self, payload: dict[str, Any]) -> None:
+        event_type = payload.get("type")
+
+        # Heartbeats
+        if event_type in ("ping", "heartbeat"):
+            await self.send({"type": "pong"})
+            return
+
+        if event_type == "cancel":
+            await self._cancel_generation()
+            return
+
+        if event_type != "user_message_event":
+            await self.send(
+                {
+                    "type": "error",
+                    "error": "Unsupported event type",
+                    "detail": event_type,
+                }
+            )
+            return
+
+        message = payload.get("message") or {}
+        role = message.get("role")
+        content = message.get("content")
+        if role != "user" or not isinstance(content, str) or not content.strip():
+            await self.send({"type": "error", "error": "Invalid message payload"})
+            return
+
+        # Barge-in: the new message supersedes whatever is still streaming
+        await self._cancel_generation()
+        self._start_generation(content)
+
+    # ------------------------------------------------------------------
+    # Generation task
+    # ------------------------------------------------------------------
+    def _start_generation(self, content: str) -> None:
+        ai_message_id = str(uuid4())
+
+        async def stream_callback(chunk: str, is_end: bool) -> None:
+            if is_end:
+                await self.send({"type": "ai_message_end", "messageId": ai_message_id})
+            else:
+                await self.send(
+                    {
+                        "type": "ai_message_chunk",
+                        "messageId": ai_message_id,
+                        "delta": chunk,
+                    }
+                )
+
+        async def generate() -> None:
+            try:
+                await generate_response(
+                    content,
+                    self.session_id,
+                    stream_callback,
+                    streaming_settings.policy_for(self.channel),
+                    channel=self.channel,
+                )
+            except Exception as e:
+                logger.error(f"Generation failed for session {self.session_id}: {e}")
+
+        self._generation_message_id = ai_message_id
+        self._generation = asyncio.create_task(generate())
+
+    async def _cancel_generation(self, notify: bool = True) -> None:
+        """Abort the in-flight run, if any, and close its stream."""
+        task, message_id = self._generation, self._generation_message_id
+        self._generation = self._generation_message_id = None
+
+        if task is None or task.done():
+            return
+
+        task.cancel()
+        await asyncio.wait({task})
+
+        logger.info(f"Cancelled generation {message_id} for session {self.session_id}")
+
+        if notify:
+            await self.send({"type": "ai_message_interrupted", "messageId": message_id})
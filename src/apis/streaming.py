@@ -0,0 +1,112 @@
+"""Streaming response engine shared by the chat and voice websockets.
+
+Runs one turn of the main agent graph and forwards the generated text to the
+caller through a coalescing policy, so each channel can pick its own
+frames-per-second vs time-to-first-byte trade-off.
+
+Every turn is broken down into timing spans (checkpoint read, first chunk,
+stream, total) and the graph nodes, tools and model calls are timed through a
+callback handler; see `src.libs.metrics` and the `/api/v1/metrics` endpoint.
+"""
+
+import asyncio
+import time
+from pprint import pformat
+from typing import Any, AsyncIterator, Callable
+
+from langchain_core.messages import AIMessageChunk
+
+from src.agents.main_agent import build_main_agent_with_checkpointer
+from src.apis.turns import prepare_turn
+from src.libs.logger.manager import get_logger
+from src.libs.metrics import (
+    TURN_PHASE_SECONDS,
+    TURNS_TOTAL,
+    GraphTimingHandler,
+    TimedCheckpointSaver,
+    span,
+)
+from src.libs.redis.redis import get_checkpoint_saver
+from src.libs.streaming import CoalescingPolicy, PerTokenPolicy, StreamingSettings, coalesce
+
+
+logger = get_logger("streaming")
+checkpointer = TimedCheckpointSaver(get_checkpoint_saver())
+main_agent = build_main_agent_with_checkpointer(checkpointer)
+streaming_settings = StreamingSettings()
+
+
+async def _text_deltas(stream: AsyncIterator[Any]) -> AsyncIterator[str]:
+    """Extract the text of every `AIMessageChunk` from a `messages` stream."""
+    async for token in stream:
+        logger.debug(f"Token:\n {pformat(token, indent=2)}")
+
+        if isinstance(token, tuple):
+            _, data = token
+            messagechunk = data[0] if isinstance(data, tuple) else data
+            if isinstance(messagechunk, AIMessageChunk) and isinstance(
+                messagechunk.content, str
+            ):
+                yield messagechunk.content
+
+
+async def generate_response(
+    text: str,
+    sessionId: str,
+    stream_callback: Callable[[str, bool], Any],
+    policy: CoalescingPolicy | None = None,
+    channel: str = "chat",
+):
+    """Stream an LLM response via the provided callback, coalesced by *policy*."""
+
+    policy = policy or PerTokenPolicy()
+    started = time.perf_counter()
+    outcome = "failed"
+
+    try:
+        with span(TURN_PHASE_SECONDS, channel=channel, phase="checkpoint_read"):
+            turn = await prepare_turn(checkpointer, sessionId, text)
+
+        response = ""
+        stream_started = time.perf_counter()
+
+        async for chunk in coalesce(
+            _text_deltas(
+                main_agent.astream(
+                    turn.input,
+                    config={**turn.config, "callbacks": [GraphTimingHandler()]},
+                    stream_mode="messages",
+                    subgraphs=True,
+                )
+            ),
+            policy,
+        ):
+            if not response:
+                TURN_PHASE_SECONDS.observe(
+                    time.perf_counter() - started, channel=channel, phase="first_chunk"
+                )
+            response += chunk
+            await stream_callback(chunk, False)
+
+        TURN_PHASE_SECONDS.observe(
+            time.perf_counter() - stream_started, channel=channel, phase="stream"
+        )
+        outcome = "completed"
+
+        logger.info(f"Full response generated {response}")
+        await stream_callback("", True)
+
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+
+    except Exception as e:
+        await stream_callback("Something went wrong, please try again later", False)
+        await stream_callback("", True)
+        logger.error(f"Error generating response: {e}")
+
+    finally:
+        TURN_PHASE_SECONDS.observe(
+            time.perf_counter() - started, channel=channel, phase="total"
+        )
+        TURNS_TOTAL.inc(channel=channel, outcome=outcome)
@@ -0,0 +1,83 @@
+"""Turn submission against the checkpointer.
+
+A turn only has to tell the graph what is *new*: the latest `HumanMessage`
+(plus the patient when the thread is created). Everything else already lives
+in the checkpoint and is merged by the graph's reducers, so the cost of a turn
+does not grow with the length of the conversation.
+
+A run cancelled while a tool was executing leaves a tool call without a
+result in the checkpoint; the next turn answers it with a "cancelled" result
+before the new message. (Sub-agent checkpoints are repaired when their prompt
+is built, see `src.agents.memory.close_tool_calls`.)
+"""
+
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph.state import RunnableConfig
+
+from src.agents.memory import cancelled_tool_result, unanswered_tool_calls
+from src.libs.logger.manager import get_logger
+from src.repository import get_repositories
+
+
+logger = get_logger("turns")
+
+DEFAULT_PATIENT_ID = UUID("4349d0aa-7d30-44fb-99f9-e7c0e5752fc0")
+
+
+@dataclass
+class Turn:
+    """Everything needed to run one turn of the main agent graph."""
+
+    config: RunnableConfig
+    input: dict[str, Any]
+    is_new_thread: bool
+
+
+def thread_config(session_id: str) -> RunnableConfig:
+    return {
+        "configurable": {
+            "thread_id": session_id,
+            "recursion_limit": 10,
+        }
+    }
+
+
+async def prepare_turn(
+    checkpointer: BaseCheckpointSaver,
+    session_id: str,
+    text: str,
+    patient_id: UUID = DEFAULT_PATIENT_ID,
+) -> Turn:
+    """Build the graph input for a user turn with a single checkpoint read.
+
+    New threads are seeded with the patient; resumed threads only receive the
+    new message and rely on `add_messages` to append it to the history.
+    """
+    config = thread_config(session_id)
+    checkpoint = await checkpointer.aget_tuple(config)
+    message = HumanMessage(content=text)
+
+    if checkpoint is None:
+        logger.info(f"No checkpoint found for thread {session_id}, creating new state")
+
+        patient = await get_repositories().patients.get(patient_id)
+        if patient is None:
+            raise ValueError("Patient not found")
+
+        return Turn(
+            config=config,
+            input={"messages": [message], "remaining_steps": 10, "patient": patient},
+            is_new_thread=True,
+        )
+
+    logger.info(f"Checkpoint found for thread {session_id}, submitting message delta")
+    history = checkpoint.checkpoint["channel_values"].get("messages", [])
+    closed = [cancelled_tool_result(call) for call in unanswered_tool_calls(history)]
+    if closed:
+        logger.info(f"Closing {len(closed)} unanswered tool call(s) of thread {session_id}")
+    return Turn(config=config, input={"messages": [*closed, message]}, is_new_thread=False)
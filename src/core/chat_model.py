@@ -0,0 +1,29 @@
+from typing import Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from src.core.llm_setting import LLMSettings
+from src.core.model_registry import model_registry
+from src.core.resilient_model import ResilientChatModel
+
+
+def get_chat_model(settings: Optional[LLMSettings] = None) -> BaseChatModel:
+    """Return the chat model configured by `LLMSettings`.
+
+    Agents asking for the same provider/model share the underlying model
+    instance and its pooled HTTP client, see `src.core.model_registry`. The
+    model is wrapped with the deadlines, hedging and ``LLM_FALLBACKS``
+    failover of `src.core.resilient_model`.
+    """
+    settings = settings or LLMSettings()
+    configured = [settings, *settings.fallback_settings()]
+    return ResilientChatModel(
+        candidates=[model_registry.get_chat_model(s) for s in configured],
+        labels=[f"{s.provider}:{s.model}" for s in configured],
+        first_token_deadline=settings.first_token_deadline,
+        deadline=settings.deadline,
+        hedge=settings.hedge,
+        hedge_percentile=settings.hedge_percentile,
+        hedge_min_delay=settings.hedge_min_delay,
+        hedge_initial_delay=settings.hedge_initial_delay,
+    )
@@ -7,6 +7,7 @@ class LLMProvider(Enum):
     MISTRAL = "mistral"
     AZURE = "azure_openai"
     OLLAMA = "ollama"
+    LOCAL = "local"  # offline scripted model, see src/core/local_llm.py
 
 class LLMModel(Enum):
     GPT_4O_MINI = "gpt-4o-mini"
@@ -0,0 +1,158 @@
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from src.core.llm_provider import LLMModel, LLMProvider
+
+
+class LLMSettings(BaseSettings):
+    """Which chat model the agents run on.
+
+    Values are populated from environment variables. Set ``LLM_PROVIDER=local``
+    to run the graph on the offline scripted model; the ``LOCAL_LLM_*`` values
+    then shape its latency.
+    """
+
+    provider: str = Field(
+        default=LLMProvider.OPENAI.value,
+        alias="LLM_PROVIDER",
+        description="Model provider (openai | anthropic | mistral | azure_openai | ollama | local)",
+    )
+    model: str = Field(
+        default=LLMModel.GPT_4O_MINI.value,
+        alias="LLM_MODEL",
+        description="Model name passed to the provider",
+    )
+    temperature: float = Field(
+        default=0.0,
+        alias="LLM_TEMPERATURE",
+        description="Sampling temperature",
+    )
+
+    http_max_connections: int = Field(
+        default=50,
+        alias="LLM_HTTP_MAX_CONNECTIONS",
+        description="Maximum open connections per model client",
+    )
+    http_max_keepalive: int = Field(
+        default=20,
+        alias="LLM_HTTP_MAX_KEEPALIVE",
+        description="Idle connections kept open per model client",
+    )
+    http_keepalive_expiry: float = Field(
+        default=120.0,
+        alias="LLM_HTTP_KEEPALIVE_EXPIRY",
+        description="Seconds an idle connection is kept before it is closed",
+    )
+    http2: bool = Field(
+        default=False,
+        alias="LLM_HTTP2",
+        description="Opt-in: use HTTP/2 when the provider supports it; needs `h2` (pip install 'httpx[http2]')",
+    )
+    http_connect_timeout: float = Field(
+        default=10.0,
+        alias="LLM_HTTP_CONNECT_TIMEOUT",
+        description="Seconds to establish a connection",
+    )
+    http_read_timeout: float = Field(
+        default=120.0,
+        alias="LLM_HTTP_READ_TIMEOUT",
+        description="Seconds to wait for response data",
+    )
+    http_pool_timeout: float = Field(
+        default=30.0,
+        alias="LLM_HTTP_POOL_TIMEOUT",
+        description="Seconds a request may wait for a free connection or concurrency slot",
+    )
+    max_concurrency: int = Field(
+        default=32,
+        alias="LLM_MAX_CONCURRENCY",
+        description="In-flight requests allowed per model",
+    )
+    model_concurrency: dict[str, int] = Field(
+        default_factory=dict,
+        alias="LLM_MODEL_CONCURRENCY",
+        description='Per-model overrides of LLM_MAX_CONCURRENCY, e.g. {"gpt-4o": 8}',
+    )
+
+    first_token_deadline: float = Field(
+        default=20.0,
+        alias="LLM_FIRST_TOKEN_DEADLINE",
+        description="Seconds an attempt may take to produce its first chunk before failing over (0 disables)",
+    )
+    deadline: float = Field(
+        default=120.0,
+        alias="LLM_DEADLINE",
+        description="Seconds a whole model call may take (0 disables)",
+    )
+    fallbacks: str = Field(
+        default="",
+        alias="LLM_FALLBACKS",
+        description="Comma-separated provider:model pairs tried in order when the primary model fails, e.g. azure_openai:gpt-4o-mini",
+    )
+    hedge: bool = Field(
+        default=False,
+        alias="LLM_HEDGE",
+        description="Send a duplicate request when the first chunk is slower than usual",
+    )
+    hedge_percentile: float = Field(
+        default=0.95,
+        alias="LLM_HEDGE_PERCENTILE",
+        description="First-token latency percentile after which the hedge request is sent",
+    )
+    hedge_min_delay: float = Field(
+        default=0.5,
+        alias="LLM_HEDGE_MIN_DELAY",
+        description="Lower bound in seconds of the hedging delay",
+    )
+    hedge_initial_delay: float = Field(
+        default=2.0,
+        alias="LLM_HEDGE_INITIAL_DELAY",
+        description="Hedging delay in seconds until enough latencies have been observed",
+    )
+
+    local_first_token_ms: float = Field(
+        default=300.0,
+        alias="LOCAL_LLM_FIRST_TOKEN_MS",
+        description="Local provider: mean time to first token",
+    )
+    local_first_token_jitter_ms: float = Field(
+        default=50.0,
+        alias="LOCAL_LLM_FIRST_TOKEN_JITTER_MS",
+        description="Local provider: standard deviation of the time to first token",
+    )
+    local_token_ms: float = Field(
+        default=15.0,
+        alias="LOCAL_LLM_TOKEN_MS",
+        description="Local provider: mean delay between tokens",
+    )
+    local_token_jitter_ms: float = Field(
+        default=5.0,
+        alias="LOCAL_LLM_TOKEN_JITTER_MS",
+        description="Local provider: standard deviation of the delay between tokens",
+    )
+    local_distribution: str = Field(
+        default="normal",
+        alias="LOCAL_LLM_DISTRIBUTION",
+        description="Local provider: latency distribution (fixed | normal | lognormal)",
+    )
+    local_seed: Optional[int] = Field(
+        default=None,
+        alias="LOCAL_LLM_SEED",
+        description="Local provider: seed for reproducible latencies",
+    )
+
+    model_config = SettingsConfigDict(env_prefix="LLM_", extra="ignore")
+
+    def fallback_settings(self) -> list["LLMSettings"]:
+        """Settings of the ``LLM_FALLBACKS`` models, in order."""
+        fallbacks = []
+        for entry in self.fallbacks.split(","):
+            if not entry.strip():
+                continue
+            provider, _, model = entry.strip().partition(":")
+            if not model:
+                raise ValueError(f"LLM_FALLBACKS entry {entry!r} must be provider:model")
+            fallbacks.append(self.model_copy(update={"provider": provider.strip(), "model": model.strip()}))
+        return fallbacks
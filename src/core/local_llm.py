@@ -0,0 +1,322 @@
+"""Deterministic, offline chat model used for benchmarking.
+
+`ScriptedChatModel` never talks to the network. It inspects the conversation
+and the tools it was bound to and replays a scripted step of the appointment /
+prescription flows:
+
+- bound to the supervisor's handoff tools → emits the matching handoff call;
+- fresh user turn (or the supervisor's handoff) → emits the tool call the
+  user's words ask for, with arguments taken from earlier tool results
+  (provider, slot, appointment and prescription ids);
+- last message is a tool result → streams a short templated reply.
+
+Token streaming is paced by a first-token latency and a per-token latency.
+Each is drawn from a ``fixed``, ``normal`` or ``lognormal`` distribution with
+the configured mean and spread, so load tests see realistic jitter; pass a
+``seed`` to make the sequence of delays reproducible.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+__all__ = ["ScriptedChatModel", "LATENCY_DISTRIBUTIONS"]
+
+LATENCY_DISTRIBUTIONS = ("fixed", "normal", "lognormal")
+
+# Leading id column of a rendered tool-result table (short or full id)
+_ROW_ID = re.compile(r"^([0-9a-f]{8}(?:-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})?),", re.M)
+_WORDS = re.compile(r"\S+\s*")
+_HANDOFF_PREFIX = "handoff_to_"
+
+# (pattern on the user's text, tool to call) – first match wins
+_USER_RULES: list[tuple[str, str]] = [
+    (r"\breschedul", "list_appointments"),
+    (r"\bcancel", "list_appointments"),
+    (r"\b(list|show|my appointments)\b", "list_appointments"),
+    (r"\bbook\b", "get_providers"),
+    (r"\b(slot|tomorrow|morning|afternoon|available)\b", "get_available_slots"),
+    (r"\b(move|first one|that one)\b", "get_slot_for_reschedule"),
+    (r"\b(refill|prescription|medicine)\b", "list_prescriptions"),
+]
+
+# Tool to call when the user confirms, keyed by the previous tool call
+_CONFIRM_RULES: dict[str, str] = {
+    "get_available_slots": "book_appointment",
+    "get_slot_for_reschedule": "reschedule_appointment",
+    "list_appointments": "cancel_appointment",
+    "list_prescriptions": "refill_prescription",
+}
+
+_CONFIRM = re.compile(r"\b(yes|yeah|yup|confirm|sure|ok|okay|please do)\b", re.I)
+
+_REPLIES: dict[str, str] = {
+    "get_providers": "Sure! We have Dr. Smith for cardiology, Dr. Johnson for dermatology and Dr. Brown for neurology. Who would you like to see, and which day works best for you?",
+    "get_available_slots": "Okay, let me see... Dr. Smith has a few openings tomorrow, the earliest one is at 9 in the morning. Shall I go ahead and book that one for you?",
+    "book_appointment": "Yup, that's done! You're all set for tomorrow at 9. Is there anything else I can help you with?",
+    "list_appointments": "Got it. I can see your upcoming appointment with Dr. Smith. Which one would you like to change?",
+    "get_slot_for_reschedule": "No worries, there is an opening right after your current slot. Would you like me to move your appointment there?",
+    "reschedule_appointment": "All done, your appointment has been moved. Anything else?",
+    "cancel_appointment": "Okay, that appointment is cancelled now. Anything else I can do for you?",
+    "confirm_appointment": "Great, your appointment is confirmed!",
+    "list_prescriptions": "Sure, I can see your Metformin prescription. Would you like me to refill it for you?",
+    "refill_prescription": "Done! Your refill is on its way, you should get it in a few days.",
+}
+_DEFAULT_REPLY = "Sure, I can help with that. Could you tell me a bit more about what you need?"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Offline chat model replaying scripted tool calls and token streams."""
+
+    first_token_ms: float = 300.0
+    first_token_jitter_ms: float = 50.0
+    token_ms: float = 15.0
+    token_jitter_ms: float = 5.0
+    distribution: str = "normal"
+    seed: Optional[int] = None
+
+    bound_tools: list[str] = []
+
+    _random: random.Random = PrivateAttr(default_factory=random.Random)
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):  # type: ignore[override]
+        names = [convert_to_openai_tool(tool)["function"]["name"] for tool in tools]
+        return self.model_copy(update={"bound_tools": names})
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        rng = self._random
+        message = self._next_message(messages)
+        time.sleep(self._first_token_delay(rng))
+        if not message.tool_calls:
+            time.sleep(sum(self._token_delay(rng) for _ in _WORDS.findall(str(message.content))))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        rng = self._random
+        message = self._next_message(messages)
+        time.sleep(self._first_token_delay(rng))
+        for i, chunk in enumerate(self._chunks(message)):
+            if i:
+                time.sleep(self._token_delay(rng))
+            if run_manager and isinstance(chunk.message.content, str):
+                run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        rng = self._random
+        message = self._next_message(messages)
+        await asyncio.sleep(self._first_token_delay(rng))
+        for i, chunk in enumerate(self._chunks(message)):
+            if i:
+                await asyncio.sleep(self._token_delay(rng))
+            if run_manager and isinstance(chunk.message.content, str):
+                await run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    # ------------------------------------------------------------------
+    # Script
+    # ------------------------------------------------------------------
+    def _next_message(self, messages: list[BaseMessage]) -> AIMessage:
+        # Ignore trailing context (e.g. current time) appended after the history
+        # (see `src.agents.context`)
+        while messages and (isinstance(messages[-1], SystemMessage) or messages[-1].name == "context"):
+            messages = messages[:-1]
+
+        human = next((m for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+        text = str(human.content) if human is not None else ""
+
+        if "handoff_to_appointment_agent" in self.bound_tools:
+            if messages and isinstance(messages[-1], HumanMessage):
+                return self._tool_call(f"handoff_to_{self._route(text)}_agent", {})
+            return AIMessage(content="")
+
+        last = messages[-1] if messages else None
+        if isinstance(last, ToolMessage):
+            name = self._tool_name(messages, last) or ""
+            if not name.startswith(_HANDOFF_PREFIX):
+                return AIMessage(content=_REPLIES.get(name, _DEFAULT_REPLY))
+
+        # Fresh user turn, possibly just handed over by the supervisor
+        tool = self._tool_for(text.lower(), messages)
+        if tool is not None:
+            return self._tool_call(tool, self._args_for(tool, messages))
+
+        return AIMessage(content=_DEFAULT_REPLY)
+
+    @staticmethod
+    def _route(text: str) -> str:
+        if re.search(r"\b(refill|prescription|medicine|medication)\b", text, re.I):
+            return "prescription"
+        return "appointment"
+
+    def _tool_for(self, text: str, messages: list[BaseMessage]) -> Optional[str]:
+        if _CONFIRM.search(text):
+            previous = self._last_tool_call(messages)
+            if previous in _CONFIRM_RULES and _CONFIRM_RULES[previous] in self.bound_tools:
+                return _CONFIRM_RULES[previous]
+        for pattern, tool in _USER_RULES:
+            if re.search(pattern, text) and tool in self.bound_tools:
+                return tool
+        return None
+
+    def _args_for(self, tool: str, messages: list[BaseMessage]) -> dict[str, Any]:
+        now_ist = datetime.now(ZoneInfo("Asia/Kolkata"))
+
+        if tool == "get_available_slots":
+            tomorrow = (now_ist + timedelta(days=1)).replace(hour=9, minute=0, second=0)
+            return {
+                "provider_id": self._first_id(messages, "get_providers"),
+                "date_time": tomorrow.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        if tool == "book_appointment":
+            return {"slot_id": self._first_id(messages, "get_available_slots")}
+        if tool in ("get_slot_for_reschedule", "cancel_appointment", "confirm_appointment"):
+            return {"appointment_id": self._first_id(messages, "list_appointments")}
+        if tool == "reschedule_appointment":
+            return {
+                "appointment_id": self._first_id(messages, "list_appointments"),
+                "new_slot_id": self._first_id(messages, "get_slot_for_reschedule"),
+            }
+        if tool == "refill_prescription":
+            return {
+                "prescription_id": self._first_id(messages, "list_prescriptions"),
+                "date_time": (now_ist + timedelta(days=5)).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        return {}
+
+    # ------------------------------------------------------------------
+    # History helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _tool_name(messages: list[BaseMessage], tool_message: ToolMessage) -> Optional[str]:
+        if tool_message.name:
+            return tool_message.name
+        for message in reversed(messages):
+            if isinstance(message, AIMessage):
+                for call in message.tool_calls:
+                    if call["id"] == tool_message.tool_call_id:
+                        return call["name"]
+        return None
+
+    @staticmethod
+    def _last_tool_call(messages: list[BaseMessage]) -> Optional[str]:
+        for message in reversed(messages):
+            if isinstance(message, AIMessage):
+                for call in reversed(message.tool_calls):
+                    if not call["name"].startswith(_HANDOFF_PREFIX):
+                        return call["name"]
+        return None
+
+    def _first_id(self, messages: list[BaseMessage], tool: str) -> str:
+        """Id of the first row in the most recent result of *tool* (empty if none)."""
+        for message in reversed(messages):
+            if isinstance(message, ToolMessage) and self._tool_name(messages, message) == tool:
+                match = _ROW_ID.search(str(message.content))
+                if match:
+                    return match.group(1)
+        return ""
+
+    # ------------------------------------------------------------------
+    # Streaming helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _tool_call(name: str, args: dict[str, Any]) -> AIMessage:
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": args, "id": f"call_{uuid4().hex[:24]}"}],
+        )
+
+    @staticmethod
+    def _chunks(message: AIMessage) -> Iterator[ChatGenerationChunk]:
+        if message.tool_calls:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": i,
+                        }
+                        for i, call in enumerate(message.tool_calls)
+                    ],
+                )
+            )
+            return
+        for word in _WORDS.findall(str(message.content)) or [""]:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+    def _first_token_delay(self, rng: random.Random) -> float:
+        return self._sample(rng, self.first_token_ms, self.first_token_jitter_ms)
+
+    def _token_delay(self, rng: random.Random) -> float:
+        return self._sample(rng, self.token_ms, self.token_jitter_ms)
+
+    def _sample(self, rng: random.Random, mean_ms: float, spread_ms: float) -> float:
+        """Draw one delay in seconds with the given mean and standard deviation."""
+        if mean_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed" or spread_ms <= 0:
+            return mean_ms / 1000
+        if self.distribution == "lognormal":
+            # Long right tail, like real time-to-first-token
+            sigma = math.sqrt(math.log1p((spread_ms / mean_ms) ** 2))
+            return rng.lognormvariate(math.log(mean_ms) - sigma**2 / 2, sigma) / 1000
+        return max(0.0, rng.gauss(mean_ms, spread_ms)) / 1000
@@ -0,0 +1,291 @@
+"""Process-wide registry of chat models and their HTTP clients.
+
+Agents ask the registry for a model instead of building one at import time,
+so every agent using the same provider/model shares one model instance and
+one long-lived, pooled HTTP client:
+
+- keep-alive and pool sizes come from `LLMSettings` (``LLM_HTTP_*``);
+- HTTP/2 is opt-in (``LLM_HTTP2=true``) for providers that speak it; it
+  needs `h2`, which is not a dependency (``pip install 'httpx[http2]'``);
+- in-flight requests per model are capped at ``LLM_MAX_CONCURRENCY``
+  (``LLM_MODEL_CONCURRENCY`` overrides it per model). The cap is enforced by
+  the client's transport, so it also holds when HTTP/2 multiplexes many
+  requests over one connection; a streamed response keeps its slot until the
+  stream is closed. Requests beyond the cap wait up to
+  ``LLM_HTTP_POOL_TIMEOUT`` and then fail with `httpx.PoolTimeout`.
+
+Providers whose LangChain integration does not accept an injected httpx
+client still share a single model instance per configuration.
+"""
+
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from src.core.llm_provider import LLMProvider
+from src.core.llm_setting import LLMSettings
+from src.libs.logger.manager import get_logger
+from src.libs.metrics import registry
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HTTP2_AVAILABLE = False
+
+__all__ = ["ModelRegistry", "model_registry"]
+
+logger = get_logger("model_registry")
+
+# Providers whose LangChain chat models accept `http_client`/`http_async_client`
+_HTTPX_PROVIDERS = {LLMProvider.OPENAI.value, LLMProvider.AZURE.value}
+
+LLM_INFLIGHT = registry.gauge(
+    "llm_http_inflight_requests",
+    "Model API requests currently holding a concurrency slot",
+    ("model",),
+)
+LLM_SLOT_WAIT_SECONDS = registry.histogram(
+    "llm_http_slot_wait_seconds",
+    "Time model API requests waited for a concurrency slot",
+    ("model",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+# ----------------------------------------------------------------------
+# Concurrency-limited transports
+# ----------------------------------------------------------------------
+class _ReleasingAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _ReleasingSyncStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, release) -> None:
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _Slots:
+    """Counts in-flight requests of one model and releases each slot once."""
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    def acquired(self, waited: float) -> None:
+        LLM_SLOT_WAIT_SECONDS.observe(waited, model=self.model)
+        LLM_INFLIGHT.inc(model=self.model)
+
+    def releaser(self, release):
+        done = False
+
+        def _release() -> None:
+            nonlocal done
+            if not done:
+                done = True
+                LLM_INFLIGHT.dec(model=self.model)
+                release()
+
+        return _release
+
+
+class _LimitedAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, limit: int, timeout: float, model: str) -> None:
+        self._inner = inner
+        self._semaphore = asyncio.Semaphore(limit)
+        self._timeout = timeout
+        self._slots = _Slots(model)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self._timeout)
+        except asyncio.TimeoutError as exc:
+            raise httpx.PoolTimeout("Timed out waiting for a model concurrency slot", request=request) from exc
+        self._slots.acquired(time.perf_counter() - started)
+        release = self._slots.releaser(self._semaphore.release)
+
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingAsyncStream(response.stream, release),  # type: ignore[arg-type]
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _LimitedSyncTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, limit: int, timeout: float, model: str) -> None:
+        self._inner = inner
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._timeout = timeout
+        self._slots = _Slots(model)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        if not self._semaphore.acquire(timeout=self._timeout):
+            raise httpx.PoolTimeout("Timed out waiting for a model concurrency slot", request=request)
+        self._slots.acquired(time.perf_counter() - started)
+        release = self._slots.releaser(self._semaphore.release)
+
+        try:
+            response = self._inner.handle_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingSyncStream(response.stream, release),  # type: ignore[arg-type]
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+# ----------------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------------
+class ModelRegistry:
+    """Hands out shared chat models backed by shared, pooled HTTP clients."""
+
+    def __init__(self) -> None:
+        self._models: dict[tuple, BaseChatModel] = {}
+        self._clients: dict[tuple[str, str], tuple[httpx.Client, httpx.AsyncClient]] = {}
+        self._lock = threading.Lock()
+
+    def get_chat_model(self, settings: Optional[LLMSettings] = None) -> BaseChatModel:
+        settings = settings or LLMSettings()
+        key = (settings.provider, settings.model, settings.temperature)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._models[key] = self._build(settings)
+            return model
+
+    def _build(self, settings: LLMSettings) -> BaseChatModel:
+        if settings.provider == LLMProvider.LOCAL.value:
+            from src.core.local_llm import ScriptedChatModel
+
+            return ScriptedChatModel(
+                first_token_ms=settings.local_first_token_ms,
+                first_token_jitter_ms=settings.local_first_token_jitter_ms,
+                token_ms=settings.local_token_ms,
+                token_jitter_ms=settings.local_token_jitter_ms,
+                distribution=settings.local_distribution,
+                seed=settings.local_seed,
+            )
+
+        kwargs = {}
+        if settings.provider in _HTTPX_PROVIDERS:
+            http_client, http_async_client = self._clients_for(settings)
+            kwargs = {"http_client": http_client, "http_async_client": http_async_client}
+
+        return init_chat_model(
+            model=settings.model,
+            model_provider=settings.provider,
+            temperature=settings.temperature,
+            **kwargs,
+        )
+
+    def _clients_for(self, settings: LLMSettings) -> tuple[httpx.Client, httpx.AsyncClient]:
+        key = (settings.provider, settings.model)
+        if key in self._clients:
+            return self._clients[key]
+
+        concurrency = settings.model_concurrency.get(settings.model, settings.max_concurrency)
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=min(settings.http_max_keepalive, settings.http_max_connections),
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(
+            connect=settings.http_connect_timeout,
+            read=settings.http_read_timeout,
+            write=settings.http_read_timeout,
+            pool=settings.http_pool_timeout,
+        )
+        http2 = settings.http2 and _HTTP2_AVAILABLE
+        if settings.http2 and not _HTTP2_AVAILABLE:
+            logger.warning("LLM_HTTP2 is set but `h2` is not installed, model clients use HTTP/1.1")
+
+        clients = (
+            httpx.Client(
+                timeout=timeout,
+                transport=_LimitedSyncTransport(
+                    httpx.HTTPTransport(limits=limits, http2=http2),
+                    concurrency,
+                    settings.http_pool_timeout,
+                    settings.model,
+                ),
+            ),
+            httpx.AsyncClient(
+                timeout=timeout,
+                transport=_LimitedAsyncTransport(
+                    httpx.AsyncHTTPTransport(limits=limits, http2=http2),
+                    concurrency,
+                    settings.http_pool_timeout,
+                    settings.model,
+                ),
+            ),
+        )
+        self._clients[key] = clients
+
+        logger.info(
+            f"Created HTTP clients for {settings.provider}/{settings.model} "
+            f"(concurrency={concurrency}, max_connections={settings.http_max_connections}, http2={http2})"
+        )
+        return clients
+
+    async def aclose(self) -> None:
+        """Close every pooled client (call on application shutdown)."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._models.clear()
+
+        for client, async_client in clients:
+            client.close()
+            await async_client.aclose()
+
+
+# Process-wide default registry
+model_registry = ModelRegistry()
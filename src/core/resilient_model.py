@@ -0,0 +1,368 @@
+"""Chat model wrapper that bounds tail latency of model calls.
+
+`ResilientChatModel` sits in front of the configured model and the
+``LLM_FALLBACKS`` models and, for every call:
+
+- gives each attempt ``LLM_FIRST_TOKEN_DEADLINE`` seconds to produce its
+  first chunk and the whole call ``LLM_DEADLINE`` seconds;
+- with ``LLM_HEDGE=true``, starts a duplicate request when the first chunk
+  is later than the recent ``LLM_HEDGE_PERCENTILE`` first-token latency of
+  the model; the first attempt to produce a chunk wins and the other is
+  cancelled. The hedge goes to the next fallback, or to the same model when
+  there is none. Attempts that lose or miss their first-token deadline
+  count with their elapsed time (a lower bound), so the percentile is not
+  skewed towards the fast calls that won;
+- fails over to the next fallback when an attempt errors or misses its
+  first-token deadline.
+
+Once the first chunk is out it is streamed to the caller, so later errors
+are raised instead of retried. Tools are bound on every candidate, so a
+fallback answers with the same tool-call semantics.
+
+Attempts call the providers' raw streaming methods without callbacks: only
+the wrapper's own run is traced and streamed to the client, never a losing
+or failed attempt. The sync path (`invoke`) fails over but does not hedge or
+enforce deadlines beyond the HTTP timeouts.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel, agenerate_from_stream
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableBinding
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field
+
+from src.libs.logger.manager import get_logger
+from src.libs.metrics import registry
+
+__all__ = ["ResilientChatModel", "LLMDeadlineExceeded", "FirstTokenTimeout"]
+
+logger = get_logger("resilient_model")
+
+LLM_ATTEMPTS = registry.counter(
+    "llm_attempts_total",
+    "Model call attempts by role (primary | hedge | failover) and outcome "
+    "(won | failed | first_token_timeout | cancelled)",
+    ("model", "role", "outcome"),
+)
+LLM_DEADLINES = registry.counter(
+    "llm_deadline_exceeded_total",
+    "Model calls aborted by the overall deadline",
+    ("model",),
+)
+
+# Recent first-token latencies per model, used for the hedging delay
+_MIN_SAMPLES = 20
+_WINDOW = 500
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The model call did not finish within ``LLM_DEADLINE``."""
+
+
+class FirstTokenTimeout(TimeoutError):
+    """An attempt produced no output within ``LLM_FIRST_TOKEN_DEADLINE``."""
+
+
+class _LatencyWindow:
+    def __init__(self) -> None:
+        self._samples: deque[float] = deque(maxlen=_WINDOW)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < _MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+_first_token_latency: dict[str, _LatencyWindow] = {}
+
+
+def _latency(label: str) -> _LatencyWindow:
+    window = _first_token_latency.get(label)
+    if window is None:
+        window = _first_token_latency.setdefault(label, _LatencyWindow())
+    return window
+
+
+class _Attempt:
+    """One streaming request pumped into a queue by its own task."""
+
+    def __init__(self, index: int, label: str, role: str, stream: AsyncIterator[ChatGenerationChunk]) -> None:
+        self.index = index
+        self.label = label
+        self.role = role
+        self.started = time.monotonic()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._pump(stream))
+        self.next_item: Optional[asyncio.Task] = None
+
+    async def _pump(self, stream: AsyncIterator[ChatGenerationChunk]) -> None:
+        try:
+            async for chunk in stream:
+                await self.queue.put(("chunk", chunk))
+            await self.queue.put(("end", None))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            await self.queue.put(("error", exc))
+
+    def get(self) -> asyncio.Task:
+        if self.next_item is None:
+            self.next_item = asyncio.create_task(self.queue.get())
+        return self.next_item
+
+    def cancel(self) -> None:
+        self.task.cancel()
+        if self.next_item is not None:
+            self.next_item.cancel()
+
+
+class ResilientChatModel(BaseChatModel):
+    """Deadlines, hedging and failover across several chat models."""
+
+    candidates: list[BaseChatModel]
+    labels: list[str]
+    # Per-candidate call kwargs added by `bind_tools` (tool schemas, tool_choice, …)
+    bound_kwargs: list[dict[str, Any]] = Field(default_factory=list)
+
+    first_token_deadline: float = 20.0
+    deadline: float = 120.0
+    hedge: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_delay: float = 0.5
+    hedge_initial_delay: float = 2.0
+
+    def model_post_init(self, __context: Any) -> None:
+        if not self.candidates:
+            raise ValueError("ResilientChatModel needs at least one model")
+        if len(self.labels) != len(self.candidates):
+            raise ValueError("labels and candidates must have the same length")
+        if not self.bound_kwargs:
+            self.bound_kwargs = [{} for _ in self.candidates]
+
+    @property
+    def _llm_type(self) -> str:
+        return "resilient"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"models": self.labels}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):  # type: ignore[override]
+        candidates: list[BaseChatModel] = []
+        bound_kwargs: list[dict[str, Any]] = []
+        for model in self.candidates:
+            bound = model.bind_tools(tools, **kwargs)
+            if isinstance(bound, RunnableBinding):
+                candidates.append(bound.bound)  # type: ignore[arg-type]
+                bound_kwargs.append(dict(bound.kwargs))
+            else:
+                candidates.append(bound)
+                bound_kwargs.append({})
+        resilient = self.model_copy(update={"candidates": candidates, "bound_kwargs": bound_kwargs})
+        # A binding with ``tools`` is what create_react_agent recognises as
+        # already bound; a bare model would be bound again without the
+        # caller's kwargs (e.g. parallel_tool_calls). The candidates keep
+        # their own provider-formatted tools, so the marker is not forwarded.
+        return RunnableBinding(bound=resilient, kwargs={"tools": [convert_to_openai_tool(tool) for tool in tools]})
+
+    def _call_kwargs(self, index: int, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Kwargs bound to candidate *index*, overridden by the call's (minus the tools marker)."""
+        return {**self.bound_kwargs[index], **{key: value for key, value in kwargs.items() if key != "tools"}}
+
+    # ------------------------------------------------------------------
+    # Async path: deadlines, hedging, failover
+    # ------------------------------------------------------------------
+    def _hedge_delay(self, label: str) -> float:
+        observed = _latency(label).quantile(self.hedge_percentile)
+        if observed is None:
+            return self.hedge_initial_delay
+        return max(self.hedge_min_delay, observed)
+
+    def _open(self, index: int, role: str, messages: list[BaseMessage], stop: Optional[list[str]], kwargs: dict) -> _Attempt:
+        model = self.candidates[index]
+        stream = model._astream(messages, stop=stop, **self._call_kwargs(index, kwargs))
+        return _Attempt(index, self.labels[index], role, stream)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        started = time.monotonic()
+        deadline_at = started + self.deadline if self.deadline > 0 else math.inf
+        fallbacks = list(range(1, len(self.candidates)))
+        attempts = [self._open(0, "primary", messages, stop, kwargs)]
+        hedged = not self.hedge
+        last_error: Optional[BaseException] = None
+        winner: Optional[_Attempt] = None
+        first: Optional[tuple[str, Any]] = None
+
+        try:
+            while winner is None:
+                if not attempts:
+                    if not fallbacks or time.monotonic() >= deadline_at:
+                        break
+                    attempts.append(self._open(fallbacks.pop(0), "failover", messages, stop, kwargs))
+
+                now = time.monotonic()
+                wake = min(deadline_at, *(a.started + self._first_token_limit() for a in attempts))
+                if not hedged:
+                    wake = min(wake, attempts[0].started + self._hedge_delay(attempts[0].label))
+                done, _ = await asyncio.wait(
+                    [a.get() for a in attempts],
+                    timeout=max(0.0, wake - now),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for attempt in list(attempts):
+                    if attempt.next_item not in done:
+                        continue
+                    kind, value = attempt.next_item.result()
+                    attempt.next_item = None
+                    if kind == "error":
+                        LLM_ATTEMPTS.inc(model=attempt.label, role=attempt.role, outcome="failed")
+                        logger.warning(f"Model call to {attempt.label} failed: {value!r}")
+                        last_error = value
+                        attempts.remove(attempt)
+                    elif winner is None:
+                        winner, first = attempt, (kind, value)
+
+                if winner is not None:
+                    break
+
+                now = time.monotonic()
+                if now >= deadline_at:
+                    break
+                for attempt in list(attempts):
+                    if now >= attempt.started + self._first_token_limit():
+                        LLM_ATTEMPTS.inc(model=attempt.label, role=attempt.role, outcome="first_token_timeout")
+                        logger.warning(f"No first token from {attempt.label} within {self.first_token_deadline}s")
+                        last_error = FirstTokenTimeout(f"no first token from {attempt.label}")
+                        # A lower bound of its first-token latency: leaving it out would
+                        # teach the hedge delay that the model is faster than it is
+                        _latency(attempt.label).add(now - attempt.started)
+                        attempt.cancel()
+                        attempts.remove(attempt)
+                if not hedged and attempts and now >= attempts[0].started + self._hedge_delay(attempts[0].label):
+                    hedged = True
+                    index = fallbacks.pop(0) if fallbacks else attempts[0].index
+                    attempts.append(self._open(index, "hedge", messages, stop, kwargs))
+        except BaseException:
+            for attempt in attempts:
+                attempt.cancel()
+            raise
+
+        now = time.monotonic()
+        for attempt in attempts:
+            if attempt is not winner:
+                LLM_ATTEMPTS.inc(model=attempt.label, role=attempt.role, outcome="cancelled")
+                # Lost the race: it would have taken at least this long
+                _latency(attempt.label).add(now - attempt.started)
+                attempt.cancel()
+
+        if winner is None:
+            if time.monotonic() >= deadline_at:
+                LLM_DEADLINES.inc(model=self.labels[0])
+                raise LLMDeadlineExceeded(f"model call exceeded {self.deadline}s") from last_error
+            raise last_error or FirstTokenTimeout("no model produced output")
+
+        LLM_ATTEMPTS.inc(model=winner.label, role=winner.role, outcome="won")
+        _latency(winner.label).add(now - winner.started)
+
+        try:
+            kind, value = first  # type: ignore[misc]
+            while kind == "chunk":
+                yield value
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    LLM_DEADLINES.inc(model=winner.label)
+                    raise LLMDeadlineExceeded(f"model call exceeded {self.deadline}s")
+                try:
+                    kind, value = await asyncio.wait_for(winner.get(), timeout=None if math.isinf(remaining) else remaining)
+                except asyncio.TimeoutError as exc:
+                    LLM_DEADLINES.inc(model=winner.label)
+                    raise LLMDeadlineExceeded(f"model call exceeded {self.deadline}s") from exc
+                winner.next_item = None
+            if kind == "error":
+                raise value
+        finally:
+            winner.cancel()
+
+    def _first_token_limit(self) -> float:
+        return self.first_token_deadline if self.first_token_deadline > 0 else math.inf
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await agenerate_from_stream(self._astream(messages, stop=stop, **kwargs))
+
+    # ------------------------------------------------------------------
+    # Sync path: failover only
+    # ------------------------------------------------------------------
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        last_error: Optional[BaseException] = None
+        for index, model in enumerate(self.candidates):
+            try:
+                result = model._generate(messages, stop=stop, **self._call_kwargs(index, kwargs))
+            except Exception as exc:
+                LLM_ATTEMPTS.inc(model=self.labels[index], role="primary" if index == 0 else "failover", outcome="failed")
+                logger.warning(f"Model call to {self.labels[index]} failed: {exc!r}")
+                last_error = exc
+                continue
+            LLM_ATTEMPTS.inc(model=self.labels[index], role="primary" if index == 0 else "failover", outcome="won")
+            return result
+        raise last_error  # type: ignore[misc]
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        last_error: Optional[BaseException] = None
+        for index, model in enumerate(self.candidates):
+            role = "primary" if index == 0 else "failover"
+            stream = model._stream(messages, stop=stop, **self._call_kwargs(index, kwargs))
+            try:
+                first = next(stream)
+            except StopIteration:
+                return
+            except Exception as exc:
+                LLM_ATTEMPTS.inc(model=self.labels[index], role=role, outcome="failed")
+                logger.warning(f"Model call to {self.labels[index]} failed: {exc!r}")
+                last_error = exc
+                continue
+            LLM_ATTEMPTS.inc(model=self.labels[index], role=role, outcome="won")
+            yield first
+            yield from stream
+            return
+        raise last_error  # type: ignore[misc]
@@ -0,0 +1,7 @@
+from .cache_setting import CacheSettings
+from .ttl import TTLCache
+
+__all__ = [
+    "CacheSettings",
+    "TTLCache",
+]
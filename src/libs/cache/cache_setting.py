@@ -0,0 +1,28 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheSettings(BaseSettings):
+    """Read-through cache in front of the agents' read-only tools.
+
+    Values are populated from environment variables and can be overridden
+    by explicitly instantiating the class with keyword arguments.
+    """
+
+    enabled: bool = Field(
+        default=True,
+        alias="TOOL_CACHE_ENABLED",
+        description="Cache results of read-only tools per patient",
+    )
+    ttl_seconds: float = Field(
+        default=60.0,
+        alias="TOOL_CACHE_TTL_SECONDS",
+        description="Seconds an entry is served before it is reloaded",
+    )
+    max_entries: int = Field(
+        default=10_000,
+        alias="TOOL_CACHE_MAX_ENTRIES",
+        description="Entries kept before the least recently used are evicted",
+    )
+
+    model_config = SettingsConfigDict(env_prefix="TOOL_CACHE_", extra="ignore")
@@ -0,0 +1,185 @@
+"""ttl.py
+
+Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+Every cache has a name that labels its metrics:
+
+- ``cache_requests_total{cache,result}`` – ``hit`` / ``miss`` (``expired``
+  entries count as misses too);
+- ``cache_evictions_total{cache,reason}`` – ``size``, ``ttl`` or
+  ``invalidated``;
+- ``cache_entries{cache}`` – current number of entries.
+
+A load that races with `invalidate` must not store what it read before the
+write: take `version(key)` before loading and pass it to `set`, which skips
+the store when the key was invalidated in between. `get_or_load` does this
+for you and runs a single load per key at a time.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+from src.libs.metrics import registry
+
+__all__ = ["TTLCache"]
+
+T = TypeVar("T")
+
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by result",
+    ("cache", "result"),
+)
+CACHE_EVICTIONS = registry.counter(
+    "cache_evictions_total",
+    "Entries removed from a cache by reason",
+    ("cache", "reason"),
+)
+CACHE_ENTRIES = registry.gauge(
+    "cache_entries",
+    "Entries currently held by a cache",
+    ("cache",),
+)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache of at most *max_entries* entries, each valid for *ttl* seconds."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Version stamp of the most recently invalidated keys; keys that fell
+        # out of it share the highest stamp dropped so far
+        self._invalidated: OrderedDict[Hashable, int] = OrderedDict()
+        self._stamp = 0
+        self._floor = 0
+        # Loads running in get_or_load, joined by concurrent misses
+        self._loads: dict[Hashable, Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether *key* holds a fresh entry (not counted as a lookup)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def version(self, key: Hashable) -> int:
+        """Changes whenever *key* is invalidated; see `set`."""
+        with self._lock:
+            return self._invalidated.get(key, self._floor)
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> bool:
+        """Store *value*, unless *key* was invalidated since *version* was taken.
+
+        Returns whether the value was stored.
+        """
+        with self._lock:
+            if version is not None and self._invalidated.get(key, self._floor) != version:
+                return False
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.inc(cache=self.name, reason="size")
+            CACHE_ENTRIES.set(len(self._entries), cache=self.name)
+        return True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        """Cached value of *key*, calling *loader* (outside the lock) on a miss.
+
+        Concurrent misses of the same key wait for one load instead of each
+        running their own.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+            load = self._loads.get(key)
+            if load is None:
+                load = self._loads[key] = Future()
+                version = self._invalidated.get(key, self._floor)
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return load.result()
+
+        try:
+            value = loader()
+            self.set(key, value, version)
+        except BaseException as exc:
+            load.set_exception(exc)
+            raise
+        else:
+            load.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._loads.get(key) is load:
+                    del self._loads[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._stamp += 1
+            self._invalidated[key] = self._stamp
+            self._invalidated.move_to_end(key)
+            if len(self._invalidated) > self.max_entries:
+                _, stamp = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, stamp)
+            # Later misses must not join a load that may have read the old value
+            self._loads.pop(key, None)
+            if self._entries.pop(key, None) is not None:
+                CACHE_EVICTIONS.inc(cache=self.name, reason="invalidated")
+            CACHE_ENTRIES.set(len(self._entries), cache=self.name)
+
+    def clear(self) -> None:
+        with self._lock:
+            # Invalidates every key
+            self._stamp += 1
+            self._floor = self._stamp
+            self._invalidated.clear()
+            self._loads.clear()
+            self._entries.clear()
+            CACHE_ENTRIES.set(0, cache=self.name)
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            CACHE_EVICTIONS.inc(cache=self.name, reason="ttl")
+            CACHE_ENTRIES.set(len(self._entries), cache=self.name)
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        CACHE_REQUESTS.inc(cache=self.name, result="hit")
+        return value
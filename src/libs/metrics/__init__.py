@@ -0,0 +1,39 @@
+from .checkpoint import TimedCheckpointSaver
+from .latency import (
+    CHECKPOINT_SECONDS,
+    GRAPH_NODE_SECONDS,
+    LLM_CALL_SECONDS,
+    LLM_FIRST_TOKEN_SECONDS,
+    TOOL_SECONDS,
+    TURN_PHASE_SECONDS,
+    TURNS_TOTAL,
+    GraphTimingHandler,
+    span,
+)
+from .registry import (
+    DEFAULT_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    registry,
+)
+
+__all__ = [
+    "TimedCheckpointSaver",
+    "GraphTimingHandler",
+    "span",
+    "TURN_PHASE_SECONDS",
+    "TURNS_TOTAL",
+    "GRAPH_NODE_SECONDS",
+    "TOOL_SECONDS",
+    "LLM_FIRST_TOKEN_SECONDS",
+    "LLM_CALL_SECONDS",
+    "CHECKPOINT_SECONDS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "DEFAULT_BUCKETS",
+    "registry",
+]
@@ -0,0 +1,134 @@
+"""checkpoint.py
+
+``TimedCheckpointSaver`` wraps any LangGraph checkpointer and records how long
+each operation takes in ``checkpoint_seconds{op=...}``:
+
+* ``read``         – ``aget_tuple`` (turn start and every subgraph resume)
+* ``write``        – ``aput`` (one per super-step)
+* ``write_pending`` – ``aput_writes`` (intermediate task writes)
+* ``list``         – ``alist``
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+from .latency import CHECKPOINT_SECONDS
+
+__all__ = ["TimedCheckpointSaver"]
+
+
+class TimedCheckpointSaver(BaseCheckpointSaver):
+    """Delegating checkpointer that times every operation."""
+
+    def __init__(self, inner: BaseCheckpointSaver) -> None:
+        super().__init__(serde=inner.serde)
+        self.inner = inner
+
+    @property
+    def config_specs(self) -> list:
+        return self.inner.config_specs
+
+    def get_next_version(self, current: Any, channel: None) -> Any:
+        return self.inner.get_next_version(current, channel)
+
+    # ------------------------------------------------------------------
+    # Async API (used by the websocket turns)
+    # ------------------------------------------------------------------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        started = time.perf_counter()
+        try:
+            return await self.inner.aget_tuple(config)
+        finally:
+            CHECKPOINT_SECONDS.observe(time.perf_counter() - started, op="read")
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        started = time.perf_counter()
+        try:
+            async for item in self.inner.alist(config, filter=filter, before=before, limit=limit):
+                yield item
+        finally:
+            CHECKPOINT_SECONDS.observe(time.perf_counter() - started, op="list")
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        started = time.perf_counter()
+        try:
+            return await self.inner.aput(config, checkpoint, metadata, new_versions)
+        finally:
+            CHECKPOINT_SECONDS.observe(time.perf_counter() - started, op="write")
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            await self.inner.aput_writes(config, writes, task_id, task_path)
+        finally:
+            CHECKPOINT_SECONDS.observe(time.perf_counter() - started, op="write_pending")
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.inner.adelete_thread(thread_id)
+
+    # ------------------------------------------------------------------
+    # Sync API (plain delegation)
+    # ------------------------------------------------------------------
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.inner.get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.inner.list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.inner.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.inner.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.inner.delete_thread(thread_id)
@@ -0,0 +1,209 @@
+"""latency.py
+
+Per-turn latency breakdown for the agent graph.
+
+* ``TURN_PHASE_SECONDS`` – phases of one websocket turn (checkpoint read,
+  first chunk, full stream, total), by channel.
+* ``GRAPH_NODE_SECONDS`` – top-level graph nodes (``supervisor``,
+  ``appointment_agent``, ``prescription_agent``).
+* ``TOOL_SECONDS`` – every tool call, by agent and tool.
+* ``LLM_FIRST_TOKEN_SECONDS`` / ``LLM_CALL_SECONDS`` – model calls, by agent.
+* ``CHECKPOINT_SECONDS`` – checkpointer operations, see ``TimedCheckpointSaver``.
+
+``GraphTimingHandler`` is a LangChain callback handler filling the graph,
+tool and model histograms; pass a fresh instance in the run config's
+``callbacks`` for each turn.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .registry import Histogram, registry
+
+__all__ = [
+    "TURN_PHASE_SECONDS",
+    "TURNS_TOTAL",
+    "GRAPH_NODE_SECONDS",
+    "TOOL_SECONDS",
+    "LLM_FIRST_TOKEN_SECONDS",
+    "LLM_CALL_SECONDS",
+    "CHECKPOINT_SECONDS",
+    "GraphTimingHandler",
+    "span",
+]
+
+TURN_PHASE_SECONDS = registry.histogram(
+    "turn_phase_seconds",
+    "Duration of each phase of a conversation turn",
+    ("channel", "phase"),
+)
+TURNS_TOTAL = registry.counter(
+    "turns_total",
+    "Conversation turns by outcome",
+    ("channel", "outcome"),
+)
+GRAPH_NODE_SECONDS = registry.histogram(
+    "graph_node_seconds",
+    "Duration of the top-level graph nodes",
+    ("node",),
+)
+TOOL_SECONDS = registry.histogram(
+    "tool_seconds",
+    "Duration of tool calls",
+    ("agent", "tool"),
+)
+LLM_FIRST_TOKEN_SECONDS = registry.histogram(
+    "llm_first_token_seconds",
+    "Time from model call start to its first streamed token",
+    ("agent",),
+)
+LLM_CALL_SECONDS = registry.histogram(
+    "llm_call_seconds",
+    "Duration of model calls",
+    ("agent",),
+)
+CHECKPOINT_SECONDS = registry.histogram(
+    "checkpoint_seconds",
+    "Duration of checkpointer operations",
+    ("op",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+DEFAULT_NODES: Tuple[str, ...] = ("supervisor", "appointment_agent", "prescription_agent")
+
+
+@contextmanager
+def span(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the wall time of the ``with`` block into *histogram*."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+class GraphTimingHandler(BaseCallbackHandler):
+    """Times graph nodes, tools and model calls of one graph run.
+
+    Agent labels are derived from the checkpoint namespace and collapsed to
+    the known top-level nodes (anything else is reported as ``other``) so
+    label cardinality stays bounded.
+    """
+
+    run_inline = True
+
+    def __init__(self, nodes: Sequence[str] = DEFAULT_NODES) -> None:
+        self.nodes = tuple(nodes)
+        self._nodes: Dict[UUID, Tuple[str, float]] = {}
+        self._tools: Dict[UUID, Tuple[str, str, float]] = {}
+        self._llms: Dict[UUID, Tuple[str, float]] = {}
+        self._first_token_seen: set[UUID] = set()
+
+    # ------------------------------------------------------------------
+    # Graph nodes
+    # ------------------------------------------------------------------
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        tags: Optional[list[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name")
+        if (
+            name in self.nodes
+            and (metadata or {}).get("langgraph_node") == name
+            and any(tag.startswith("graph:step:") for tag in tags or ())
+        ):
+            self._nodes[run_id] = (name, time.perf_counter())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        # Handoffs leave a node by raising `ParentCommand`
+        self._end_node(run_id)
+
+    def _end_node(self, run_id: UUID) -> None:
+        entry = self._nodes.pop(run_id, None)
+        if entry is not None:
+            node, started = entry
+            GRAPH_NODE_SECONDS.observe(time.perf_counter() - started, node=node)
+
+    # ------------------------------------------------------------------
+    # Tools
+    # ------------------------------------------------------------------
+    def on_tool_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        input_str: str,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        tool = kwargs.get("name") or (serialized or {}).get("name") or "unknown"
+        self._tools[run_id] = (self._agent(metadata), tool, time.perf_counter())
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id)
+
+    def _end_tool(self, run_id: UUID) -> None:
+        entry = self._tools.pop(run_id, None)
+        if entry is not None:
+            agent, tool, started = entry
+            TOOL_SECONDS.observe(time.perf_counter() - started, agent=agent, tool=tool)
+
+    # ------------------------------------------------------------------
+    # Model calls
+    # ------------------------------------------------------------------
+    def on_chat_model_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._llms[run_id] = (self._agent(metadata), time.perf_counter())
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        entry = self._llms.get(run_id)
+        if entry is not None and run_id not in self._first_token_seen:
+            self._first_token_seen.add(run_id)
+            agent, started = entry
+            LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started, agent=agent)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_llm(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_llm(run_id)
+
+    def _end_llm(self, run_id: UUID) -> None:
+        self._first_token_seen.discard(run_id)
+        entry = self._llms.pop(run_id, None)
+        if entry is not None:
+            agent, started = entry
+            LLM_CALL_SECONDS.observe(time.perf_counter() - started, agent=agent)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _agent(self, metadata: Optional[Dict[str, Any]]) -> str:
+        namespace = (metadata or {}).get("langgraph_checkpoint_ns", "")
+        agent = namespace.split("|", 1)[0].split(":", 1)[0]
+        return agent if agent in self.nodes else "other"
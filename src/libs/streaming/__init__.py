@@ -0,0 +1,33 @@
+from .codec import FrameCodec, available_codecs, negotiate_codec
+from .engine import coalesce
+from .outbound import OVERFLOW_POLICIES, OutboundQueue, OutboundStats
+from .policies import (
+    POLICIES,
+    CoalescingPolicy,
+    PerTokenPolicy,
+    SentenceBoundedPolicy,
+    SizeBoundedPolicy,
+    SpeakableUnitPolicy,
+    TimeBoundedPolicy,
+    build_policy,
+)
+from .streaming_setting import StreamingSettings
+
+__all__ = [
+    "FrameCodec",
+    "available_codecs",
+    "negotiate_codec",
+    "coalesce",
+    "OutboundQueue",
+    "OutboundStats",
+    "OVERFLOW_POLICIES",
+    "CoalescingPolicy",
+    "PerTokenPolicy",
+    "SizeBoundedPolicy",
+    "TimeBoundedPolicy",
+    "SentenceBoundedPolicy",
+    "SpeakableUnitPolicy",
+    "POLICIES",
+    "build_policy",
+    "StreamingSettings",
+]
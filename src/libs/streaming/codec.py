@@ -0,0 +1,171 @@
+"""codec.py
+
+Wire codecs for the chat and voice websockets.
+
+* ``json``    – stdlib JSON text frames with the full field names (default)
+* ``orjson``  – orjson text frames with short field keys
+* ``msgpack`` – MessagePack binary frames with short field keys
+
+Compact codecs rename the well-known keys (``type`` → ``t``, ``messageId`` →
+``m``, …) on the way out and expand them again on the way in, so the rest of
+the server only ever deals with the long names.
+
+``orjson`` and ``ormsgpack``/``msgpack`` are optional; a codec whose library is
+not importable is simply not offered during negotiation.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ormsgpack as _msgpack
+
+    def _pack(obj: Any) -> bytes:
+        return _msgpack.packb(obj)
+
+    def _unpack(data: bytes) -> Any:
+        return _msgpack.unpackb(data)
+
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import msgpack as _msgpack  # type: ignore[no-redef]
+
+        def _pack(obj: Any) -> bytes:
+            return _msgpack.packb(obj, use_bin_type=True)
+
+        def _unpack(data: bytes) -> Any:
+            return _msgpack.unpackb(data, raw=False)
+
+    except ImportError:
+        _msgpack = None  # type: ignore[assignment]
+
+__all__ = [
+    "FrameCodec",
+    "JsonCodec",
+    "OrjsonCodec",
+    "MsgpackCodec",
+    "SHORT_KEYS",
+    "available_codecs",
+    "negotiate_codec",
+]
+
+WireData = Union[str, bytes]
+
+SHORT_KEYS: Dict[str, str] = {
+    "type": "t",
+    "sessionId": "s",
+    "isNew": "n",
+    "messageId": "m",
+    "delta": "d",
+    "error": "e",
+    "detail": "x",
+    "message": "g",
+    "id": "i",
+    "role": "r",
+    "content": "c",
+}
+_LONG_KEYS: Dict[str, str] = {short: long for long, short in SHORT_KEYS.items()}
+
+
+def _rename(obj: Any, mapping: Dict[str, str]) -> Any:
+    if isinstance(obj, dict):
+        return {mapping.get(k, k): _rename(v, mapping) for k, v in obj.items()}
+    return obj
+
+
+class FrameCodec(ABC):
+    """Encodes outbound frames and decodes inbound ones."""
+
+    name: str
+    binary: bool = False
+
+    @abstractmethod
+    def encode(self, frame: Dict[str, Any]) -> WireData:
+        ...
+
+    @abstractmethod
+    def decode(self, data: WireData) -> Any:
+        """Decode *data*; raise ``ValueError`` if it is not a valid frame."""
+
+
+class JsonCodec(FrameCodec):
+    name = "json"
+
+    def encode(self, frame: Dict[str, Any]) -> WireData:
+        return json.dumps(frame)
+
+    def decode(self, data: WireData) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(FrameCodec):
+    name = "orjson"
+
+    def encode(self, frame: Dict[str, Any]) -> WireData:
+        return orjson.dumps(_rename(frame, SHORT_KEYS)).decode()
+
+    def decode(self, data: WireData) -> Any:
+        try:
+            return _rename(orjson.loads(data), _LONG_KEYS)
+        except orjson.JSONDecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+
+class MsgpackCodec(FrameCodec):
+    name = "msgpack"
+    binary = True
+
+    def encode(self, frame: Dict[str, Any]) -> WireData:
+        return _pack(_rename(frame, SHORT_KEYS))
+
+    def decode(self, data: WireData) -> Any:
+        if isinstance(data, str):
+            # Text frames on a binary socket are treated like JSON
+            return JsonCodec().decode(data)
+        try:
+            return _rename(_unpack(data), _LONG_KEYS)
+        except Exception as exc:
+            raise ValueError(str(exc)) from exc
+
+
+def available_codecs() -> Dict[str, FrameCodec]:
+    """Return the codecs usable in this environment, keyed by name."""
+    codecs: Dict[str, FrameCodec] = {"json": JsonCodec()}
+    if orjson is not None:
+        codecs["orjson"] = OrjsonCodec()
+    if _msgpack is not None:
+        codecs["msgpack"] = MsgpackCodec()
+    return codecs
+
+
+_CODECS = available_codecs()
+
+
+def negotiate_codec(
+    requested: Optional[str] = None, subprotocols: Iterable[str] = ()
+) -> tuple[FrameCodec, Optional[str]]:
+    """Pick a codec for a new connection.
+
+    An explicit ``encoding`` query value wins; otherwise the first offered
+    websocket subprotocol naming a known codec (``"msgpack"`` or
+    ``"msgpack.v1"``) is accepted and echoed back. Falls back to JSON.
+
+    Returns the codec and the subprotocol to accept (if any).
+    """
+    if requested and requested in _CODECS:
+        return _CODECS[requested], None
+
+    for subprotocol in subprotocols:
+        name = subprotocol.split(".", 1)[0]
+        if name in _CODECS:
+            return _CODECS[name], subprotocol
+
+    return _CODECS["json"], None
@@ -0,0 +1,81 @@
+"""engine.py
+
+Turns an async stream of text deltas into coalesced chunks according to a
+:class:`~src.libs.streaming.policies.CoalescingPolicy`.
+
+The source stream is drained by a dedicated pump task so that time-bounded
+policies can flush while the producer is idle (e.g. during a tool call)
+without cancelling the producer mid-step.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Union
+
+from .policies import CoalescingPolicy
+
+__all__ = ["coalesce"]
+
+
+class _Done:
+    """Sentinel marking the end of the source stream."""
+
+
+_DONE = _Done()
+
+
+async def coalesce(
+    deltas: AsyncIterable[str], policy: CoalescingPolicy
+) -> AsyncIterator[str]:
+    """Yield coalesced chunks from *deltas* as dictated by *policy*.
+
+    Whatever is still buffered when the source ends (or fails) is flushed
+    before the generator returns (or re-raises).
+    """
+    queue: asyncio.Queue[Union[str, BaseException, _Done]] = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for delta in deltas:
+                queue.put_nowait(delta)
+        except Exception as exc:  # surfaced to the consumer below
+            queue.put_nowait(exc)
+        finally:
+            queue.put_nowait(_DONE)
+
+    pump_task = asyncio.create_task(pump())
+
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=policy.timeout())
+            except asyncio.TimeoutError:
+                chunk = policy.on_timeout()
+                if chunk:
+                    yield chunk
+                continue
+
+            if isinstance(item, _Done):
+                break
+
+            if isinstance(item, BaseException):
+                tail = policy.flush()
+                if tail:
+                    yield tail
+                raise item
+
+            for chunk in policy.push(item):
+                yield chunk
+
+        tail = policy.flush()
+        if tail:
+            yield tail
+
+    finally:
+        if not pump_task.done():
+            pump_task.cancel()
+            try:
+                await pump_task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,193 @@
+"""outbound.py
+
+Bounded, per-connection outbound frame queue drained by a dedicated writer
+task.
+
+Producers (the generation task, the reader answering pings) only enqueue, so a
+slow client never stalls the graph run. While the client lags, consecutive
+delta frames of the same message are merged into the frame still waiting in
+the queue, which means a lagging client receives fewer, larger frames instead
+of an ever-growing backlog.
+
+When the queue is full and a frame cannot be merged, the configured overflow
+policy applies:
+
+* ``block``      – wait for the writer to free a slot (backpressure)
+* ``drop``       – drop the frame and count it, unless it carries message
+  content (see below)
+* ``disconnect`` – give up on the client via the ``on_overflow`` callback
+  (the default)
+
+Frames whose type is listed in ``essential_types`` (stream terminators) are
+never dropped so that a client always learns that a message has ended, and
+``drop`` never drops a content delta either: a reply with a hole in it is
+worse than a late one. Deltas only fail to merge when another frame was
+queued after the last one, so they can exceed the bound by little.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+__all__ = ["OutboundQueue", "OutboundStats", "OVERFLOW_POLICIES"]
+
+OVERFLOW_POLICIES = ("block", "drop", "disconnect")
+
+Frame = Dict[str, Any]
+
+
+@dataclass
+class OutboundStats:
+    """Counters describing how a connection's outbound queue behaved."""
+
+    enqueued: int = 0
+    sent: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    send_seconds_total: float = 0.0
+    send_seconds_max: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class OutboundQueue:
+    """Bounded frame queue with a single writer task."""
+
+    def __init__(
+        self,
+        send: Callable[[Frame], Awaitable[None]],
+        *,
+        max_frames: int = 64,
+        overflow: str = "disconnect",
+        on_overflow: Optional[Callable[[], Awaitable[None]]] = None,
+        delta_type: str = "ai_message_chunk",
+        essential_types: tuple[str, ...] = ("ai_message_end", "ai_message_interrupted"),
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self._send = send
+        self.max_frames = max_frames
+        self.overflow = overflow
+        self._on_overflow = on_overflow
+        self._delta_type = delta_type
+        self._essential_types = essential_types
+
+        self._pending: Deque[Frame] = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._writer: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+        self.stats = OutboundStats()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self) -> None:
+        """Stop the writer; frames still queued are discarded."""
+        if self._writer is None:
+            return
+
+        self._closed = True
+        self._writer.cancel()
+        await asyncio.wait({self._writer})
+        self._writable.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    async def put(self, frame: Frame) -> bool:
+        """Enqueue *frame*; return ``False`` if it was dropped."""
+        if self._closed:
+            return False
+
+        if self._merge(frame):
+            return True
+
+        while len(self._pending) >= self.max_frames and frame.get("type") not in self._essential_types:
+            if self.overflow == "drop" and frame.get("type") == self._delta_type:
+                break
+            if self.overflow == "block":
+                self._writable.clear()
+                await self._writable.wait()
+                if self._closed:
+                    return False
+                if self._merge(frame):
+                    return True
+                continue
+
+            self.stats.dropped += 1
+            if self.overflow == "disconnect":
+                self._closed = True
+                if self._on_overflow is not None:
+                    await self._on_overflow()
+            return False
+
+        self._pending.append(frame)
+        self.stats.enqueued += 1
+        self._update_depth()
+        self._readable.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _merge(self, frame: Frame) -> bool:
+        """Fold a delta into the last queued delta of the same message."""
+        if frame.get("type") != self._delta_type or not self._pending:
+            return False
+
+        last = self._pending[-1]
+        if last.get("type") != self._delta_type or last.get("messageId") != frame.get("messageId"):
+            return False
+
+        self._pending[-1] = {**last, "delta": last.get("delta", "") + frame.get("delta", "")}
+        self.stats.enqueued += 1
+        self.stats.coalesced += 1
+        return True
+
+    def _update_depth(self) -> None:
+        self.stats.depth = len(self._pending)
+        self.stats.max_depth = max(self.stats.max_depth, self.stats.depth)
+
+    async def _write_loop(self) -> None:
+        while True:
+            await self._readable.wait()
+
+            while self._pending:
+                frame = self._pending.popleft()
+                self._update_depth()
+                self._writable.set()
+
+                started = time.monotonic()
+                try:
+                    await self._send(frame)
+                except Exception:
+                    # Client is gone; stop accepting frames.
+                    self._closed = True
+                    self._writable.set()
+                    return
+
+                elapsed = time.monotonic() - started
+                self.stats.sent += 1
+                self.stats.send_seconds_total += elapsed
+                self.stats.send_seconds_max = max(self.stats.send_seconds_max, elapsed)
+
+            self._readable.clear()
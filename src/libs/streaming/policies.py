@@ -0,0 +1,322 @@
+"""policies.py
+
+Coalescing policies decide when buffered token deltas coming out of the
+LLM are turned into an outbound websocket frame.
+
+Every policy trades frames-per-second against time-to-first-byte:
+
+* ``PerTokenPolicy``        – one frame per token (lowest latency, most frames)
+* ``SizeBoundedPolicy``     – flush once N characters / tokens are buffered
+* ``TimeBoundedPolicy``     – flush every N ms *or* once N characters are buffered
+* ``SentenceBoundedPolicy`` – flush on sentence boundaries
+* ``SpeakableUnitPolicy``   – flush complete sentences/clauses for TTS, with a
+  max-latency fallback
+
+Policies are stateful and must not be shared between turns; build a fresh
+one per response via :func:`build_policy`.
+"""
+
+from __future__ import annotations
+
+import inspect
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+__all__ = [
+    "CoalescingPolicy",
+    "PerTokenPolicy",
+    "SizeBoundedPolicy",
+    "TimeBoundedPolicy",
+    "SentenceBoundedPolicy",
+    "SpeakableUnitPolicy",
+    "POLICIES",
+    "build_policy",
+]
+
+
+class CoalescingPolicy(ABC):
+    """Base class holding the buffer shared by all policies."""
+
+    def __init__(self) -> None:
+        self._buffer: List[str] = []
+        self._size = 0
+        self._opened_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @abstractmethod
+    def push(self, delta: str) -> List[str]:
+        """Buffer *delta* and return the chunks that are ready to be sent."""
+
+    def timeout(self) -> Optional[float]:
+        """Seconds until a time-based flush is due (``None`` = never)."""
+        return None
+
+    def on_timeout(self) -> str:
+        """Chunk to emit once :meth:`timeout` has elapsed without new input."""
+        return self.flush()
+
+    def flush(self) -> str:
+        """Return everything buffered so far and reset the buffer."""
+        chunk = "".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        self._opened_at = None
+        return chunk
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _append(self, delta: str) -> None:
+        if self._opened_at is None:
+            self._opened_at = time.monotonic()
+        self._buffer.append(delta)
+        self._size += len(delta)
+
+
+class PerTokenPolicy(CoalescingPolicy):
+    """Emit every non-empty delta as its own frame."""
+
+    def push(self, delta: str) -> List[str]:
+        return [delta] if delta else []
+
+
+class SizeBoundedPolicy(CoalescingPolicy):
+    """Flush once *max_chars* characters or *max_tokens* deltas are buffered."""
+
+    def __init__(self, max_chars: Optional[int] = 200, max_tokens: Optional[int] = None) -> None:
+        super().__init__()
+        if max_chars is None and max_tokens is None:
+            raise ValueError("SizeBoundedPolicy needs max_chars or max_tokens")
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+
+    def push(self, delta: str) -> List[str]:
+        if not delta:
+            return []
+        self._append(delta)
+        if (self.max_chars is not None and self._size >= self.max_chars) or (
+            self.max_tokens is not None and len(self._buffer) >= self.max_tokens
+        ):
+            return [self.flush()]
+        return []
+
+
+class TimeBoundedPolicy(CoalescingPolicy):
+    """Flush every *interval_ms* milliseconds or once *max_chars* are buffered.
+
+    The interval is measured from the first delta of the current buffer, so a
+    lone token is never held back for longer than *interval_ms*.
+    """
+
+    def __init__(self, interval_ms: float = 40, max_chars: Optional[int] = 200) -> None:
+        super().__init__()
+        self.interval = interval_ms / 1000
+        self.max_chars = max_chars
+
+    def push(self, delta: str) -> List[str]:
+        if not delta:
+            return []
+        self._append(delta)
+        if self.max_chars is not None and self._size >= self.max_chars:
+            return [self.flush()]
+        if self.timeout() == 0:
+            return [self.flush()]
+        return []
+
+    def timeout(self) -> Optional[float]:
+        if self._opened_at is None:
+            return None
+        return max(0.0, self._opened_at + self.interval - time.monotonic())
+
+
+class SentenceBoundedPolicy(CoalescingPolicy):
+    """Flush whenever the buffer contains a complete sentence.
+
+    A sentence ends with ``.``, ``!``, ``?`` or a newline followed by
+    whitespace. *max_chars* caps run-on sentences.
+    """
+
+    _BOUNDARY = re.compile(r"[.!?\n]+[\"')\]]*\s+")
+
+    def __init__(self, max_chars: Optional[int] = 400) -> None:
+        super().__init__()
+        self.max_chars = max_chars
+
+    def push(self, delta: str) -> List[str]:
+        if not delta:
+            return []
+        self._append(delta)
+        text = "".join(self._buffer)
+
+        last_end = 0
+        for match in self._BOUNDARY.finditer(text):
+            last_end = match.end()
+
+        if last_end == 0:
+            if self.max_chars is not None and self._size >= self.max_chars:
+                return [self.flush()]
+            return []
+
+        ready, rest = text[:last_end], text[last_end:]
+        self.flush()
+        if rest:
+            self._append(rest)
+        return [ready]
+
+
+class SpeakableUnitPolicy(CoalescingPolicy):
+    """Emit text as soon as a speakable unit is complete, for voice/TTS.
+
+    A unit ends at a sentence terminator (``.``, ``!``, ``?``, ``…``) followed
+    by whitespace, or at a clause break (``,``, ``;``, ``:``, ``—``, ``...``)
+    once at least *min_clause_chars* are buffered. The first unit of a reply
+    uses the lower *first_clause_chars* threshold so synthesis can start early.
+
+    Periods that do not end a sentence are ignored: common abbreviations
+    (``Dr.``, ``a.m.``, ``e.g.``), ``No.`` before a number, single initials
+    (``J.``) and numbers (``10.30``, ``2.5``; a trailing ``10.`` waits for the
+    next token).
+
+    If nothing speakable completes within *max_latency_ms* the buffer is
+    flushed up to its last word boundary, so words are never split.
+    """
+
+    ABBREVIATIONS = frozenset(
+        {
+            "dr", "mr", "mrs", "ms", "prof", "sr", "jr", "st", "mt", "vs",
+            "etc", "e.g", "i.e", "a.m", "p.m", "approx", "dept", "appt",
+            "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+            "oct", "nov", "dec", "mon", "tue", "wed", "thu", "fri", "sat", "sun",
+        }
+    )
+    # Abbreviations only when a number follows ("No. 5"); "No." is a sentence too
+    NUMBER_ABBREVIATIONS = frozenset({"no", "nos"})
+
+    _SENTENCE_END = re.compile(r"(?:[.!?]+|\u2026)[\"')\]]*(?=\s)")
+    _CLAUSE_END = re.compile(r"(?:\.\.\.|[,;:\u2014])(?=\s)")
+    _WORD_BEFORE = re.compile(r"([\w.]+)$")
+
+    def __init__(
+        self,
+        max_latency_ms: float = 600,
+        min_clause_chars: int = 40,
+        first_clause_chars: int = 12,
+        max_chars: Optional[int] = 300,
+    ) -> None:
+        super().__init__()
+        self.max_latency = max_latency_ms / 1000
+        self.min_clause_chars = min_clause_chars
+        self.first_clause_chars = first_clause_chars
+        self.max_chars = max_chars
+        self._emitted = False
+
+    def push(self, delta: str) -> List[str]:
+        if not delta:
+            return []
+        self._append(delta)
+        text = "".join(self._buffer)
+
+        cut = self._last_boundary(text)
+        if cut == 0:
+            if self.max_chars is not None and self._size >= self.max_chars:
+                chunk = self._cut(self._last_space(text))
+                return [chunk] if chunk else []
+            return []
+        return [self._cut(cut)]
+
+    def timeout(self) -> Optional[float]:
+        if self._opened_at is None:
+            return None
+        return max(0.0, self._opened_at + self.max_latency - time.monotonic())
+
+    def on_timeout(self) -> str:
+        chunk = self._cut(self._last_space("".join(self._buffer)))
+        if not chunk:
+            # A single unfinished word: give it another latency window
+            self._opened_at = time.monotonic()
+        return chunk
+
+    def flush(self) -> str:
+        chunk = super().flush()
+        if chunk:
+            self._emitted = True
+        return chunk
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _cut(self, end: int) -> str:
+        """Emit ``buffer[:end]`` and keep the remainder buffered."""
+        if end <= 0:
+            return ""
+        text = "".join(self._buffer)
+        ready, rest = text[:end], text[end:]
+        self.flush()
+        if rest:
+            self._append(rest)
+        return ready
+
+    def _last_boundary(self, text: str) -> int:
+        last = 0
+        for match in self._SENTENCE_END.finditer(text):
+            if not self._is_false_stop(text, match.start(), match.end(), match.group()):
+                last = match.end()
+
+        clause_threshold = self.min_clause_chars if self._emitted else self.first_clause_chars
+        for match in self._CLAUSE_END.finditer(text, last):
+            if match.end() >= clause_threshold:
+                last = max(last, match.end())
+        return last
+
+    def _is_false_stop(self, text: str, start: int, end: int, terminator: str) -> bool:
+        if not terminator.startswith(".") or terminator.startswith(".."):
+            return False
+        word = self._WORD_BEFORE.search(text[:start])
+        if word is None:
+            return False
+        token = word.group(1).lower().strip(".")
+        if token in self.ABBREVIATIONS:
+            return True
+        if token in self.NUMBER_ABBREVIATIONS:
+            following = text[end:].lstrip()
+            # Nothing after it yet: wait for the next token to tell
+            return not following or following[0].isdigit()
+        if len(token) == 1 and token.isalpha():
+            return True  # initials such as "J. Smith"
+        return False
+
+    @staticmethod
+    def _last_space(text: str) -> int:
+        index = max(text.rfind(" "), text.rfind("\n"))
+        return index + 1 if index >= 0 else 0
+
+
+# ----------------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------------
+POLICIES: Dict[str, Callable[..., CoalescingPolicy]] = {
+    "token": PerTokenPolicy,
+    "size": SizeBoundedPolicy,
+    "time": TimeBoundedPolicy,
+    "sentence": SentenceBoundedPolicy,
+    "speakable": SpeakableUnitPolicy,
+}
+
+
+def build_policy(name: str, **options: Any) -> CoalescingPolicy:
+    """Instantiate the policy registered under *name*.
+
+    Options that the policy's constructor does not accept are ignored so a
+    single settings object can feed every policy.
+    """
+    try:
+        factory = POLICIES[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown coalescing policy: {name}") from exc
+
+    accepted = inspect.signature(factory).parameters
+    return factory(**{k: v for k, v in options.items() if k in accepted})
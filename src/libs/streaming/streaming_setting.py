@@ -0,0 +1,76 @@
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from .policies import CoalescingPolicy, build_policy
+
+
+class StreamingSettings(BaseSettings):
+    """Per-channel coalescing configuration for streamed responses.
+
+    Values are populated from environment variables so frames-per-second vs
+    time-to-first-byte can be tuned per deployment without code changes.
+    """
+
+    chat_policy: str = Field(
+        default="token",
+        alias="CHAT_STREAM_POLICY",
+        description="Coalescing policy for the chat socket (token | size | time | sentence | speakable)",
+    )
+    voice_policy: str = Field(
+        default="speakable",
+        alias="VOICE_STREAM_POLICY",
+        description="Coalescing policy for the voice socket (token | size | time | sentence | speakable)",
+    )
+    flush_interval_ms: float = Field(
+        default=40,
+        alias="STREAM_FLUSH_INTERVAL_MS",
+        description="Flush interval used by the time-bounded policy",
+    )
+    max_chars: Optional[int] = Field(
+        default=200,
+        alias="STREAM_MAX_CHARS",
+        description="Maximum buffered characters before a forced flush",
+    )
+    max_tokens: Optional[int] = Field(
+        default=None,
+        alias="STREAM_MAX_TOKENS",
+        description="Maximum buffered tokens before a forced flush (size policy)",
+    )
+
+    max_latency_ms: float = Field(
+        default=600,
+        alias="STREAM_MAX_LATENCY_MS",
+        description="Speakable policy: flush at a word boundary if no unit completes in time",
+    )
+    min_clause_chars: int = Field(
+        default=40,
+        alias="STREAM_MIN_CLAUSE_CHARS",
+        description="Speakable policy: minimum buffered chars before breaking on a clause",
+    )
+
+    outbound_max_frames: int = Field(
+        default=64,
+        alias="STREAM_OUTBOUND_MAX_FRAMES",
+        description="Frames a connection may have queued before the overflow policy applies",
+    )
+    outbound_overflow: str = Field(
+        default="disconnect",
+        alias="STREAM_OUTBOUND_OVERFLOW",
+        description="What to do when the outbound queue is full (block | drop | disconnect); drop keeps content deltas",
+    )
+
+    model_config = SettingsConfigDict(env_prefix="STREAM_", extra="ignore")
+
+    def policy_for(self, channel: str) -> CoalescingPolicy:
+        """Build a fresh policy for *channel* (``"chat"`` or ``"voice"``)."""
+        name = self.voice_policy if channel == "voice" else self.chat_policy
+        return build_policy(
+            name,
+            interval_ms=self.flush_interval_ms,
+            max_chars=self.max_chars,
+            max_tokens=self.max_tokens,
+            max_latency_ms=self.max_latency_ms,
+            min_clause_chars=self.min_clause_chars,
+        )
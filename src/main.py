@@ -10,6 +10,9 @@ from contextlib import asynccontextmanager
 # Import the Loguru setup helper from our library
 from src.libs.logger.manager import get_logger
 from src.libs.redis import get_redis_client, init_checkpoint_saver
+from src.core.model_registry import model_registry
+from src.agents.memory import default_summarizer
+from src.repository import init_repositories
 
 
 # Initialise logging system``
@@ -23,6 +26,7 @@ async def lifespan(app: FastAPI):
         redis_client = get_redis_client()
         await redis_client.ping()
         await init_checkpoint_saver()  # ensure checkpoint saver is initialized
+        await init_repositories()
         logger.info("Connected to Redis successfully and initialized checkpoint saver")
 
         # Register routes only AFTER Redis is initialized
@@ -39,6 +43,8 @@ async def lifespan(app: FastAPI):
     logger.info("FastAPI application is shutting down …")
 
     await redis_client.close()  
+    default_summarizer().shutdown()
+    await model_registry.aclose()
 
 
 # Create the FastAPI instance with lifespan handler
@@ -1,17 +1,24 @@
 """Mock in-memory database layer.
 
-Importing this package will automatically populate mock data so that
-all `*_store` singletons come pre-filled with patients, providers and
-slots relative to the current date.
+The `*_store` singletons start empty. `seed()` fills them with the demo
+patients, providers and schedules, plus as large a generated dataset as a
+`SeedConfig` asks for; slots are generated from the schedules relative to
+the current date.
 
 Example
 -------
->>> from src.mock import patient_store, provider_store, slot_store
->>> len(patient_store.all())
+>>> from src.mock import SeedConfig, patient_store, seed
+>>> seed()["patients"]
 10
+>>> seed(SeedConfig(patients=100_000, providers=2_000))["patients"]
+100010
+
+Rows are frozen pydantic models, shared by every reader without copying: to
+change one, store a ``row.model_copy(update={...})`` with the store's
+``update`` (or ``add``).
 
 If you want to start with a clean slate in tests, call `clear()` on the
-individual stores or simply `importlib.reload(src.mock.mock_data)`.
+individual stores or `Stores().clear()`.
 """
 from __future__ import annotations
 
@@ -19,8 +26,7 @@ from __future__ import annotations
 from .patient import Patient, patient_store
 from .provider import Provider, provider_store
 from .slot import Slot, slot_store
+from .schedule import Schedule, schedule_store
 from .appointment import Appointment, appointment_store
 from .prescription import Prescription, prescription_store
-
-# Populate with deterministic mock data relative to *today*
-from . import mock_data  # noqa: F401 – triggers side-effects
+from .seed import SeedConfig, Stores, seed
@@ -6,12 +6,14 @@ An **appointment** is created when a patient books a slot.
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
+from .index import SecondaryIndex
+
 
 class AppointmentStatus(str, Enum):
     CONFIRMED = "confirmed"
@@ -22,16 +24,22 @@ class AppointmentStatus(str, Enum):
 class Appointment(BaseModel):
     """Represents a booked appointment."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID = Field(default_factory=uuid4, description="Primary key")
     patient_id: UUID
     slot_id: UUID
+    # Copied from the slot: a released slot may have no row left to look up
+    provider_id: UUID
+    start: datetime
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: AppointmentStatus = Field(default=AppointmentStatus.CONFIRMED)
 
 
 class AppointmentStore:
     _appointments: Dict[UUID, Appointment]
-    """Singleton in-memory store for Appointment rows."""
+    _by_patient: SecondaryIndex[Appointment]
+    """Singleton in-memory store for Appointment rows, indexed by patient."""
 
     _instance: Optional["AppointmentStore"] = None
 
@@ -40,6 +48,7 @@ class AppointmentStore:
             cls._instance = super().__new__(cls)
             # Initialise instance attribute
             cls._instance._appointments = {}
+            cls._instance._by_patient = SecondaryIndex(lambda a: a.patient_id)
         return cls._instance
 
     # ------------------------------------------------------------------
@@ -47,12 +56,21 @@ class AppointmentStore:
     # ------------------------------------------------------------------
     def add(self, appointment: Appointment) -> None:
         self._appointments[appointment.id] = appointment
+        self._by_patient.add(appointment.id, appointment)
+
+    def add_many(self, appointments: Iterable[Appointment]) -> None:
+        """Insert or update many rows at once (bulk load)."""
+        rows = [(appointment.id, appointment) for appointment in appointments]
+        self._appointments.update(rows)
+        self._by_patient.add_many(rows)
 
     def update(self, appointment: Appointment) -> None:
         self._appointments[appointment.id] = appointment
+        self._by_patient.add(appointment.id, appointment)
 
     def remove(self, appointment_id: UUID) -> None:
         self._appointments.pop(appointment_id, None)
+        self._by_patient.remove(appointment_id)
 
     def get(self, appointment_id: UUID) -> Optional[Appointment]:
         return self._appointments.get(appointment_id)
@@ -61,10 +79,11 @@ class AppointmentStore:
         return list(self._appointments.values())
 
     def get_by_patient_id(self, patient_id: UUID) -> List[Appointment]:
-        return [appointment for appointment in self._appointments.values() if appointment.patient_id == patient_id]
+        return [self._appointments[i] for i in self._by_patient.ids(patient_id)]
 
     def clear(self) -> None:
         self._appointments.clear()
+        self._by_patient.clear()
 
 
 appointment_store = AppointmentStore()
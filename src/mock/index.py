@@ -0,0 +1,173 @@
+"""
+Secondary indexes for the in-memory stores.
+
+A `SecondaryIndex` maps a key computed from each row (``patient_id``,
+``provider_id``, ``is_available`` …) to the ids of the rows having it, so a
+store can answer "rows where column == value" in time proportional to the
+result instead of the table size.
+
+A `SortedIndex` additionally keeps each group's rows ordered by a sort key
+(a slot's ``start``), so "rows of this provider starting between *a* and *b*"
+costs O(log n + k) with `bisect` instead of a scan of the group.
+
+Both indexes remember the key every row was indexed under. When an updated
+copy of a row (rows are frozen; see ``model_copy``) is passed to the store's
+``update``, the index moves it from its old bucket (or position) to the new
+one.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+from uuid import UUID
+
+Row = TypeVar("Row")
+
+
+class SecondaryIndex(Generic[Row]):
+    """Non-unique index on ``key(row)``; buckets keep insertion order."""
+
+    def __init__(self, key: Callable[[Row], Hashable]) -> None:
+        self._key = key
+        self._buckets: Dict[Hashable, Dict[UUID, None]] = {}
+        self._indexed_under: Dict[UUID, Hashable] = {}
+
+    def add(self, row_id: UUID, row: Row) -> None:
+        """Index *row*, moving it if its key changed since it was indexed."""
+        key = self._key(row)
+        if row_id in self._indexed_under:
+            if self._indexed_under[row_id] == key:
+                return
+            self.remove(row_id)
+
+        self._indexed_under[row_id] = key
+        self._buckets.setdefault(key, {})[row_id] = None
+
+    def add_many(self, rows: Iterable[Tuple[UUID, Row]]) -> None:
+        """Index ``(row_id, row)`` pairs in bulk; same result as `add` per row."""
+        indexed_under, buckets, key_of = self._indexed_under, self._buckets, self._key
+        for row_id, row in rows:
+            if row_id in indexed_under:
+                self.add(row_id, row)
+                continue
+            key = key_of(row)
+            indexed_under[row_id] = key
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {}
+            bucket[row_id] = None
+
+    def remove(self, row_id: UUID) -> None:
+        if row_id not in self._indexed_under:
+            return
+        key = self._indexed_under.pop(row_id)
+        bucket = self._buckets[key]
+        del bucket[row_id]
+        if not bucket:
+            del self._buckets[key]
+
+    def ids(self, key: Hashable) -> List[UUID]:
+        return list(self._buckets.get(key, ()))
+
+    def count(self, key: Hashable) -> int:
+        return len(self._buckets.get(key, ()))
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._indexed_under.clear()
+
+
+class SortedIndex(Generic[Row]):
+    """Rows grouped by ``group(row)``, each group ordered by ``order(row)``.
+
+    Only rows for which ``where(row)`` holds are indexed, so the same store can
+    keep e.g. one index of all slots and one of the available ones.
+    """
+
+    def __init__(
+        self,
+        group: Callable[[Row], Hashable],
+        order: Callable[[Row], Any],
+        where: Optional[Callable[[Row], bool]] = None,
+    ) -> None:
+        self._group = group
+        self._order = order
+        self._where = where
+        # group -> sorted [(order key, row id)]; the id breaks ties
+        self._groups: Dict[Hashable, List[Tuple[Any, UUID]]] = {}
+        self._indexed_under: Dict[UUID, Tuple[Hashable, Any]] = {}
+
+    def add(self, row_id: UUID, row: Row) -> None:
+        """Index *row*, moving or dropping it if it changed since it was indexed."""
+        wanted = self._where is None or self._where(row)
+        entry = (self._group(row), self._order(row)) if wanted else None
+        if self._indexed_under.get(row_id) == entry:
+            return
+        self.remove(row_id)
+        if entry is None:
+            return
+
+        group, key = entry
+        self._indexed_under[row_id] = entry
+        insort(self._groups.setdefault(group, []), (key, row_id))
+
+    def add_many(self, rows: Iterable[Tuple[UUID, Row]]) -> None:
+        """Index ``(row_id, row)`` pairs in bulk; same result as `add` per row.
+
+        New rows are appended to their groups, and each group that grew is
+        sorted once at the end instead of paying an insort per row.
+        """
+        grown = set()
+        for row_id, row in rows:
+            if row_id in self._indexed_under or (self._where is not None and not self._where(row)):
+                # add() bisects, so the groups have to be in order first
+                for group in grown:
+                    self._groups[group].sort()
+                grown.clear()
+                self.add(row_id, row)
+                continue
+            group, key = self._group(row), self._order(row)
+            self._indexed_under[row_id] = (group, key)
+            self._groups.setdefault(group, []).append((key, row_id))
+            grown.add(group)
+        for group in grown:
+            self._groups[group].sort()
+
+    def remove(self, row_id: UUID) -> None:
+        if row_id not in self._indexed_under:
+            return
+        group, key = self._indexed_under.pop(row_id)
+        entries = self._groups[group]
+        del entries[bisect_left(entries, (key, row_id))]
+        if not entries:
+            del self._groups[group]
+
+    def range(
+        self,
+        group: Hashable,
+        start: Any = None,
+        end: Any = None,
+        limit: Optional[int] = None,
+    ) -> List[UUID]:
+        """Ids in *group* with ``start <= order(row) < end``, in order.
+
+        Either bound may be None for an open range; at most *limit* ids are
+        returned.
+        """
+        entries = self._groups.get(group)
+        if not entries:
+            return []
+
+        # (key,) sorts before every (key, id), so these land on the first entry >= key
+        lo = 0 if start is None else bisect_left(entries, (start,))
+        hi = len(entries) if end is None else bisect_left(entries, (end,), lo)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return [row_id for _, row_id in entries[lo:hi]]
+
+    def count(self, group: Hashable) -> int:
+        return len(self._groups.get(group, ()))
+
+    def clear(self) -> None:
+        self._groups.clear()
+        self._indexed_under.clear()
@@ -1,22 +1,23 @@
 """
-Utility module that pre-populates all singleton stores with deterministic but
-*date-aware* data.
+Hand-written demo rows: the patients, providers and prescriptions the
+example conversations refer to.
 
-Running the application on any day will generate slots relative to the current
-system date so that the mock data always looks fresh.
+`load` adds them to the stores; it is called by `src.mock.seed.seed`, not on
+import. Slots are generated from the providers' schedules relative to the
+current date, so the data always looks fresh.
 """
 from __future__ import annotations
 
-from datetime import datetime, timedelta, time, timezone
+from datetime import datetime, time, timezone
 from uuid import UUID
 
 
 from src.libs.logger.manager import get_logger
 
-from .patient import Patient, patient_store
-from .provider import Provider, provider_store
-from .slot import Slot, slot_store
-from .prescription import Prescription, prescription_store, DeliveryStatus
+from .patient import Patient, PatientStore, patient_store
+from .provider import Provider, ProviderStore, provider_store
+from .schedule import Schedule, ScheduleRule, ScheduleStore, schedule_store
+from .prescription import Prescription, PrescriptionStore, prescription_store, DeliveryStatus
 
 logger = get_logger("mock_data")
 
@@ -35,11 +36,6 @@ PATIENTS_DATA = [
     {"id": "f389991b-7e81-4884-a3fc-3065d08d3c6d", "name": "Jack",   "age": 47, "phone_number": "+19876543212"},
 ]
 
-for p in PATIENTS_DATA:
-    patient = Patient(id=UUID(p["id"]), name=p["name"], age=p["age"], phone_number=p["phone_number"])
-    patient_store.add(patient)
-    # logger.success(f"Added patient: {patient.model_dump_json(indent=2)}")
-
 # ---------------------------------------------------------------------------
 # Providers – static dataset -------------------------------------------------
 PROVIDERS_DATA = [
@@ -48,42 +44,15 @@ PROVIDERS_DATA = [
     {"id": "028d486e-5ae0-4662-9091-e4973e763fe7", "name": "Dr. Brown",   "specialization": "Neurology"},
 ]
 
-for p in PROVIDERS_DATA:
-    provider = Provider(id=UUID(p["id"]), name=p["name"], specialization=p["specialization"])
-    provider_store.add(provider)
-    # logger.success(f"Added provider: {provider.model_dump()}")
-
 # ---------------------------------------------------------------------------
-# Slots – generated for *each* provider
+# Schedules – one per provider; slots are generated from them on demand
 # ---------------------------------------------------------------------------
 
-def _generate_slots_for_provider(provider: Provider, *, days_ahead: int = 15) -> None:
-    """Generate **one-hour** slots for working hours 09:00-12:00 and 14:00-17:00 in **IST**
-    (UTC+05:30) for the next *days_ahead* days. All stored times are UTC."""
-
-    IST = timezone(timedelta(hours=5, minutes=30), name="IST")
-    today_ist = datetime.now(IST).date()
-
-    for day_offset in range(days_ahead):
-        date_ist = today_ist + timedelta(days=day_offset)
-        # Working hours (IST): 09-12 and 14-17
-        for hour in list(range(9, 12)) + list(range(14, 17)):
-            # Create datetime in IST, then convert to UTC for storage
-            start_dt_ist = datetime.combine(date_ist, time(hour, 0, tzinfo=IST))
-            end_dt_ist = start_dt_ist + timedelta(hours=1)
-
-            start_dt_utc = start_dt_ist.astimezone(timezone.utc)
-            end_dt_utc = end_dt_ist.astimezone(timezone.utc)
-
-            new_slot = Slot(provider_id=provider.id, start=start_dt_utc, end=end_dt_utc)
-            slot_store.add(new_slot)
-            # logger.success(f"Added slot: {new_slot.model_dump_json(indent=2)}")
-            # logger.success(f"utc slot start: {new_slot.start.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}, utc slot end: {new_slot.end.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}")
-            # logger.success(f"slot start: {new_slot.start.astimezone(IST).strftime('%Y-%m-%d %H:%M:%S')}, slot end: {new_slot.end.astimezone(IST).strftime('%Y-%m-%d %H:%M:%S')}")
-            # logger.info("\n")
-
-for provider in provider_store.all():
-    _generate_slots_for_provider(provider)
+# Working hours (IST): 09-12 and 14-17 every day, one-hour slots, 15 days ahead
+WORKING_HOURS = (
+    ScheduleRule(start=time(9, 0), end=time(12, 0)),
+    ScheduleRule(start=time(14, 0), end=time(17, 0)),
+)
 
 # ---------------------------------------------------------------------------
 # Prescriptions – static dataset --------------------------------------------
@@ -100,15 +69,31 @@ PRESCRIPTIONS_DATA = [
     {"id": "2b3cb67d-8b38-4a02-b36b-322ce56ba37e", "patient_id": "f389991b-7e81-4884-a3fc-3065d08d3c6d", "name": "Metformin",   "description": "Diabetes medication",     "last_refill_date": datetime(2025, 5, 21, 19, 24, 13, 91786, tzinfo=timezone.utc), "delivery_status": DeliveryStatus.SHIPPED},
 ]
 
-for p in PRESCRIPTIONS_DATA:
-    prescription = Prescription(
-        id=UUID(p["id"]),
-        patient_id=UUID(p["patient_id"]),
-        name=p["name"],
-        description=p["description"],
-        last_refill_date=p["last_refill_date"],
-        delivery_status=p["delivery_status"],
-        next_refill_date=None,
-    )
-    prescription_store.add(prescription)
-    # logger.success(f"Added prescription: {prescription.model_dump()}")
+
+def load(
+    patients: PatientStore = patient_store,
+    providers: ProviderStore = provider_store,
+    schedules: ScheduleStore = schedule_store,
+    prescriptions: PrescriptionStore = prescription_store,
+) -> None:
+    """Add the demo rows (and a schedule per demo provider) to the stores."""
+    for p in PATIENTS_DATA:
+        patient = Patient(id=UUID(p["id"]), name=p["name"], age=p["age"], phone_number=p["phone_number"])
+        patients.add(patient)
+
+    for p in PROVIDERS_DATA:
+        provider = Provider(id=UUID(p["id"]), name=p["name"], specialization=p["specialization"])
+        providers.add(provider)
+        schedules.add(Schedule(provider_id=provider.id, rules=WORKING_HOURS, horizon_days=15))
+
+    for p in PRESCRIPTIONS_DATA:
+        prescription = Prescription(
+            id=UUID(p["id"]),
+            patient_id=UUID(p["patient_id"]),
+            name=p["name"],
+            description=p["description"],
+            last_refill_date=p["last_refill_date"],
+            delivery_status=p["delivery_status"],
+            next_refill_date=None,
+        )
+        prescriptions.add(prescription)
@@ -7,15 +7,17 @@ singleton-style store that behaves like an in-memory database table.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Patient(BaseModel):
     """Represents a patient record."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID = Field(default_factory=uuid4, description="Primary key")
     name: str
     age: int
@@ -42,6 +44,10 @@ class PatientStore:
         """Insert or update a patient row."""
         self._patients[patient.id] = patient
 
+    def add_many(self, patients: Iterable[Patient]) -> None:
+        """Insert or update many rows at once (bulk load)."""
+        self._patients.update((patient.id, patient) for patient in patients)
+
     def remove(self, patient_id: UUID) -> None:
         """Delete a patient row. Fails silently if the row does not exist."""
         self._patients.pop(patient_id, None)
@@ -51,7 +57,7 @@ class PatientStore:
         return self._patients.get(patient_id)
 
     def all(self) -> List[Patient]:
-        """Return **copies** of every row (to prevent accidental mutation)."""
+        """Return every row (rows are frozen, so they are shared, not copied)."""
         return list(self._patients.values())
 
     def clear(self) -> None:
@@ -7,10 +7,12 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .index import SecondaryIndex
 
 
 class DeliveryStatus(str, Enum):
@@ -22,6 +24,8 @@ class DeliveryStatus(str, Enum):
 class Prescription(BaseModel):
     """Represents a prescription row."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID = Field(default_factory=uuid4, description="Primary key")
     patient_id: UUID
     name: str
@@ -32,15 +36,17 @@ class Prescription(BaseModel):
 
 
 class PrescriptionStore:
-    """Singleton in-memory store for `Prescription` rows."""
+    """Singleton in-memory store for `Prescription` rows, indexed by patient."""
 
     _prescriptions: Dict[UUID, Prescription]
+    _by_patient: SecondaryIndex[Prescription]
     _instance: Optional["PrescriptionStore"] = None
 
     def __new__(cls) -> "PrescriptionStore":
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._prescriptions = {}
+            cls._instance._by_patient = SecondaryIndex(lambda p: p.patient_id)
         return cls._instance
 
     # ------------------------------------------------------------------
@@ -48,9 +54,17 @@ class PrescriptionStore:
     # ------------------------------------------------------------------
     def add(self, prescription: Prescription) -> None:
         self._prescriptions[prescription.id] = prescription
+        self._by_patient.add(prescription.id, prescription)
+
+    def add_many(self, prescriptions: Iterable[Prescription]) -> None:
+        """Insert or update many rows at once (bulk load)."""
+        rows = [(prescription.id, prescription) for prescription in prescriptions]
+        self._prescriptions.update(rows)
+        self._by_patient.add_many(rows)
 
     def remove(self, prescription_id: UUID) -> None:
         self._prescriptions.pop(prescription_id, None)
+        self._by_patient.remove(prescription_id)
 
     def get(self, prescription_id: UUID) -> Optional[Prescription]:
         return self._prescriptions.get(prescription_id)
@@ -60,12 +74,14 @@ class PrescriptionStore:
 
     def clear(self) -> None:
         self._prescriptions.clear()
+        self._by_patient.clear()
 
     def get_by_patient_id(self, patient_id: UUID) -> List[Prescription]:
-        return [prescription for prescription in self._prescriptions.values() if prescription.patient_id == patient_id]
+        return [self._prescriptions[i] for i in self._by_patient.ids(patient_id)]
 
     def update(self, prescription: Prescription) -> None:
         self._prescriptions[prescription.id] = prescription
+        self._by_patient.add(prescription.id, prescription)
 
 
 prescription_store = PrescriptionStore()
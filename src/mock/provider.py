@@ -6,15 +6,17 @@ The store behaves like an in-memory table.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Provider(BaseModel):
     """Represents a provider (e.g. doctor) row."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID = Field(default_factory=uuid4, description="Primary key")
     name: str
     specialization: str
@@ -38,6 +40,10 @@ class ProviderStore:
     def add(self, provider: Provider) -> None:
         self._providers[provider.id] = provider
 
+    def add_many(self, providers: Iterable[Provider]) -> None:
+        """Insert or update many rows at once (bulk load)."""
+        self._providers.update((provider.id, provider) for provider in providers)
+
     def remove(self, provider_id: UUID) -> None:
         self._providers.pop(provider_id, None)
 
@@ -0,0 +1,221 @@
+"""
+Provider schedules and ScheduleStore.
+
+A provider's availability is described by recurring **rules** ("Mon–Fri,
+09:00–12:00 IST, one-hour slots") and dated **exceptions** (a day off, a
+blocked afternoon) instead of one `Slot` row per bookable hour. Slots are
+generated on demand, only for the window a query asks for; only slots that
+were booked (or held) are stored as rows in the `SlotStore`, which overlays
+them on the generated ones.
+
+Generated slots get deterministic ids (`slot_id`: a UUIDv5 of provider and
+start time), so every worker and every query hands out the same id for the
+same slot, and a booking can be matched to the slot it was made for.
+"""
+from __future__ import annotations
+
+import heapq
+from hashlib import sha1
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .slot import Slot
+
+# Namespace of the generated slot ids
+SLOT_NAMESPACE = UUID("0f9d0a3e-5b4c-4b7e-9a51-3c2f6d1e8a47")
+
+WEEKDAYS = frozenset(range(7))
+
+
+_NAMESPACE_BYTES = SLOT_NAMESPACE.bytes
+
+
+def slot_id(provider_id: UUID, start: datetime) -> UUID:
+    """Deterministic id of the slot of *provider_id* starting at *start*.
+
+    Same as ``uuid5(SLOT_NAMESPACE, "<provider id>/<UTC start>")``, without
+    re-encoding the namespace on every call.
+    """
+    name = f"{provider_id}/{start.astimezone(timezone.utc).isoformat()}"
+    return UUID(bytes=sha1(_NAMESPACE_BYTES + name.encode()).digest()[:16], version=5)
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+class ScheduleRule(BaseModel):
+    """Recurring working hours, cut into slots of *slot_minutes*."""
+
+    model_config = ConfigDict(frozen=True)
+
+    weekdays: FrozenSet[int] = Field(default=WEEKDAYS, description="0 = Monday … 6 = Sunday")
+    start: time = Field(description="Local start of the working hours")
+    end: time = Field(description="Local end of the working hours")
+    slot_minutes: int = 60
+    timezone: str = "Asia/Kolkata"
+    valid_from: Optional[date] = None
+    valid_until: Optional[date] = None
+
+    def applies_on(self, day: date) -> bool:
+        return (
+            day.weekday() in self.weekdays
+            and (self.valid_from is None or day >= self.valid_from)
+            and (self.valid_until is None or day <= self.valid_until)
+        )
+
+    def starts_on(self, day: date) -> Iterator[tuple[datetime, datetime]]:
+        """``(start, end)`` in UTC of every slot of this rule on local *day*."""
+        zone = _zone(self.timezone)
+        step = timedelta(minutes=self.slot_minutes)
+        start = datetime.combine(day, self.start, tzinfo=zone)
+        close = datetime.combine(day, self.end, tzinfo=zone)
+        while start + step <= close:
+            yield start.astimezone(timezone.utc), (start + step).astimezone(timezone.utc)
+            start += step
+
+
+class ScheduleException(BaseModel):
+    """No slots on *day* (local), or only none overlapping ``start``–``end``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    day: date
+    start: Optional[time] = None
+    end: Optional[time] = None
+    timezone: str = "Asia/Kolkata"
+
+    def blocks(self, start: datetime, end: datetime) -> bool:
+        zone = _zone(self.timezone)
+        if start.astimezone(zone).date() != self.day:
+            return False
+        if self.start is None or self.end is None:
+            return True
+        blocked_from = datetime.combine(self.day, self.start, tzinfo=zone)
+        blocked_until = datetime.combine(self.day, self.end, tzinfo=zone)
+        return start < blocked_until and end > blocked_from
+
+
+class Schedule(BaseModel):
+    """Availability of one provider: rules minus exceptions, *horizon_days* ahead."""
+
+    model_config = ConfigDict(frozen=True)
+
+    provider_id: UUID
+    rules: Tuple[ScheduleRule, ...] = ()
+    exceptions: Tuple[ScheduleException, ...] = ()
+    horizon_days: int = 90
+
+    def window(self, start: Optional[datetime], end: Optional[datetime]) -> tuple[datetime, datetime]:
+        """Clamp ``[start, end)`` to today (UTC midnight) … the horizon."""
+        today = datetime.combine(datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc)
+        horizon = today + timedelta(days=self.horizon_days)
+        return max(start, today) if start else today, min(end, horizon) if end else horizon
+
+    def slots(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Slot]:
+        """Generated slots starting in ``[start, end)``, earliest first.
+
+        Slots are produced one local day at a time, so a caller that stops
+        after the first few pays only for the days it consumed.
+        """
+        start, end = self.window(start, end)
+        if start >= end or not self.rules:
+            return
+
+        # Local days that can hold a slot in the window, in any rule's zone
+        day = start.date() - timedelta(days=1)
+        last = end.date() + timedelta(days=1)
+        while day <= last:
+            todays = []
+            for rule in self.rules:
+                if not rule.applies_on(day):
+                    continue
+                for slot_start, slot_end in rule.starts_on(day):
+                    if start <= slot_start < end and not any(e.blocks(slot_start, slot_end) for e in self.exceptions):
+                        todays.append((slot_start, slot_end))
+            for slot_start, slot_end in sorted(set(todays)):
+                yield Slot.model_construct(
+                    id=slot_id(self.provider_id, slot_start),
+                    provider_id=self.provider_id,
+                    start=slot_start,
+                    end=slot_end,
+                    is_available=True,
+                )
+            day += timedelta(days=1)
+
+    def offers(self, slot: Slot) -> bool:
+        """Whether *slot* is one this schedule generates (same id, start and end)."""
+        for generated in self.slots(slot.start, slot.start + timedelta(microseconds=1)):
+            if generated.id == slot.id and generated.end == slot.end:
+                return True
+        return False
+
+
+def overlay(
+    generated: Iterable[Slot],
+    stored: List[Slot],
+    *,
+    only_available: bool = False,
+    limit: Optional[int] = None,
+) -> List[Slot]:
+    """Merge *generated* slots with the *stored* rows of the same window.
+
+    Both inputs are ordered by start. A stored row replaces the generated slot
+    with its id (it carries the booking); stored rows no rule generates are
+    kept as they are.
+    """
+    stored_ids = {slot.id for slot in stored}
+    merged = heapq.merge(
+        stored,
+        (slot for slot in generated if slot.id not in stored_ids),
+        key=lambda slot: (slot.start, slot.id),
+    )
+
+    slots: List[Slot] = []
+    for slot in merged:
+        if only_available and not slot.is_available:
+            continue
+        slots.append(slot)
+        if limit is not None and len(slots) >= limit:
+            break
+    return slots
+
+
+class ScheduleStore:
+    _schedules: Dict[UUID, Schedule]
+    """Singleton in-memory store of provider schedules."""
+
+    _instance: Optional["ScheduleStore"] = None
+
+    def __new__(cls) -> "ScheduleStore":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._schedules = {}
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    # CRUD helpers
+    # ------------------------------------------------------------------
+    def add(self, schedule: Schedule) -> None:
+        self._schedules[schedule.provider_id] = schedule
+
+    def remove(self, provider_id: UUID) -> None:
+        self._schedules.pop(provider_id, None)
+
+    def get(self, provider_id: UUID) -> Optional[Schedule]:
+        return self._schedules.get(provider_id)
+
+    def all(self) -> List[Schedule]:
+        return list(self._schedules.values())
+
+    def clear(self) -> None:
+        self._schedules.clear()
+
+
+schedule_store = ScheduleStore()
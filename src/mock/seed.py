@@ -0,0 +1,210 @@
+"""
+Synthetic dataset generator for the in-memory stores.
+
+Nothing is loaded when `src.mock` is imported; seeding is an explicit step.
+`seed()` fills the stores with the hand-written demo rows of `mock_data`
+(the patients and prescriptions the example conversations use) plus a
+generated dataset of any size:
+
+- *patients* patients, each with about *prescriptions_per_patient*
+  prescriptions;
+- *providers* providers, each with the working-hours schedule of
+  `mock_data.WORKING_HOURS` over the next *days* days;
+- a share *appointment_density* of every provider's slots booked, one
+  confirmed appointment per booked slot, for a random patient.
+
+Rows and ids come from a `random.Random(rng_seed)`, so the same config
+always produces the same dataset (dates stay relative to today). Random
+columns are drawn in bulk, all generated providers share one timetable and
+the garbage collector is paused during the load, so a million rows load in
+a few seconds. ``python -m bench.seed`` reports the load time.
+"""
+from __future__ import annotations
+
+import gc
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from . import mock_data
+from .appointment import Appointment, AppointmentStatus, AppointmentStore, appointment_store
+from .patient import Patient, PatientStore, patient_store
+from .prescription import DeliveryStatus, Prescription, PrescriptionStore, prescription_store
+from .provider import Provider, ProviderStore, provider_store
+from .schedule import Schedule, ScheduleStore, schedule_store, slot_id
+from .slot import Slot, SlotStore, slot_store
+
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Kavya", "Sanjay", "Nisha",
+    "Olivia", "Liam", "Emma", "Noah", "Ava", "Lucas", "Mia", "Ethan", "Sofia", "Mateo",
+]
+SURNAMES = [
+    "Sharma", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Kapoor", "Rao", "Das", "Menon",
+    "Smith", "Johnson", "Brown", "Garcia", "Miller", "Davis", "Wilson", "Moore", "Clark", "Lewis",
+]
+SPECIALIZATIONS = [
+    "Cardiology", "Dermatology", "Neurology", "Pediatrics", "Orthopedics",
+    "Endocrinology", "Gastroenterology", "Psychiatry", "Ophthalmology", "General Practice",
+]
+MEDICATIONS = [
+    ("Metformin", "Diabetes medication"),
+    ("Omeprazole", "Acid reflux relief"),
+    ("Atorvastatin", "Cholesterol medication"),
+    ("Lisinopril", "Blood pressure medication"),
+    ("Levothyroxine", "Thyroid hormone replacement"),
+    ("Amlodipine", "Blood pressure medication"),
+    ("Salbutamol", "Asthma inhaler"),
+    ("Sertraline", "Antidepressant"),
+]
+DELIVERY_STATUSES = list(DeliveryStatus)
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    """Size and shape of a seeded dataset; the defaults load only the demo rows."""
+
+    patients: int = 0
+    providers: int = 0
+    days: int = 15
+    appointment_density: float = 0.3
+    prescriptions_per_patient: float = 1.0
+    rng_seed: int = 0
+    demo: bool = True
+
+
+@dataclass(frozen=True)
+class Stores:
+    """The stores `seed` fills (the process-wide singletons by default)."""
+
+    patients: PatientStore = patient_store
+    providers: ProviderStore = provider_store
+    schedules: ScheduleStore = schedule_store
+    slots: SlotStore = slot_store
+    appointments: AppointmentStore = appointment_store
+    prescriptions: PrescriptionStore = prescription_store
+
+    def clear(self) -> None:
+        for store in (self.patients, self.providers, self.schedules, self.slots, self.appointments, self.prescriptions):
+            store.clear()
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "patients": len(self.patients._patients),
+            "providers": len(self.providers._providers),
+            "schedules": len(self.schedules._schedules),
+            "slots": len(self.slots._slots),
+            "appointments": len(self.appointments._appointments),
+            "prescriptions": len(self.prescriptions._prescriptions),
+        }
+
+
+def _ids(rng: random.Random, count: int) -> List[UUID]:
+    return [UUID(int=rng.getrandbits(128), version=4) for _ in range(count)]
+
+
+def _patients(config: SeedConfig, rng: random.Random, stores: Stores) -> List[UUID]:
+    count = config.patients
+    ids = _ids(rng, count)
+    rows = zip(ids, rng.choices(FIRST_NAMES, k=count), rng.choices(SURNAMES, k=count), rng.choices(range(18, 91), k=count))
+    stores.patients.add_many(
+        Patient(id=patient_id, name=f"{first} {last}", age=age, phone_number=f"+1555{i:07d}")
+        for i, (patient_id, first, last, age) in enumerate(rows)
+    )
+    return ids
+
+
+def _prescriptions(config: SeedConfig, rng: random.Random, stores: Stores, patient_ids: List[UUID]) -> None:
+    whole, fraction = divmod(config.prescriptions_per_patient, 1)
+    owners = [
+        patient_id
+        for patient_id in patient_ids
+        for _ in range(int(whole) + (rng.random() < fraction))
+    ]
+    count = len(owners)
+    now = datetime.now(timezone.utc)
+    rows = zip(
+        _ids(rng, count),
+        owners,
+        rng.choices(MEDICATIONS, k=count),
+        rng.choices(range(60 * 86_400), k=count),
+        rng.choices(DELIVERY_STATUSES, k=count),
+    )
+    stores.prescriptions.add_many(
+        Prescription(
+            id=prescription_id,
+            patient_id=patient_id,
+            name=name,
+            description=description,
+            last_refill_date=now - timedelta(seconds=age_seconds),
+            delivery_status=status,
+        )
+        for prescription_id, patient_id, (name, description), age_seconds, status in rows
+    )
+
+
+def _providers(config: SeedConfig, rng: random.Random, stores: Stores, patient_ids: List[UUID]) -> None:
+    """Providers with their schedules, booked slots and appointments."""
+    # Every generated provider works the same hours: build the timetable once
+    template = Schedule(provider_id=UUID(int=0), rules=mock_data.WORKING_HOURS, horizon_days=config.days)
+    timetable = [(slot.start, slot.end) for slot in template.slots()]
+    booked_per_provider = round(len(timetable) * config.appointment_density) if patient_ids else 0
+    now = datetime.now(timezone.utc)
+
+    slots: List[Slot] = []
+    appointments: List[Appointment] = []
+    for provider_id in _ids(rng, config.providers):
+        stores.providers.add(Provider(
+            id=provider_id, name=f"Dr. {rng.choice(SURNAMES)}", specialization=rng.choice(SPECIALIZATIONS)
+        ))
+        stores.schedules.add(template.model_copy(update={"provider_id": provider_id}))
+
+        rows = zip(
+            rng.sample(timetable, booked_per_provider),
+            _ids(rng, booked_per_provider),
+            rng.choices(patient_ids, k=booked_per_provider),
+            rng.choices(range(30 * 86_400), k=booked_per_provider),
+        )
+        for (start, end), appointment_id, patient_id, age_seconds in rows:
+            slot = Slot(id=slot_id(provider_id, start), provider_id=provider_id, start=start, end=end, is_available=False)
+            slots.append(slot)
+            appointments.append(Appointment(
+                id=appointment_id,
+                patient_id=patient_id,
+                slot_id=slot.id,
+                provider_id=provider_id,
+                start=start,
+                created_at=now - timedelta(seconds=age_seconds),
+                status=AppointmentStatus.CONFIRMED,
+            ))
+    stores.slots.add_many(slots)
+    stores.appointments.add_many(appointments)
+
+
+def seed(config: SeedConfig = SeedConfig(), stores: Optional[Stores] = None) -> Dict[str, int]:
+    """Load the demo rows and a generated dataset per *config*; returns the row counts.
+
+    Rows are added to what the stores already hold; call ``Stores().clear()``
+    first for a clean slate. The loaded rows are frozen out of the garbage
+    collector (`gc.freeze`), so later collections do not traverse them.
+    """
+    stores = stores or Stores()
+    rng = random.Random(config.rng_seed)
+
+    # Every row is long-lived: don't let the collector re-scan them during the
+    # load, and move them out of its generations afterwards
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        if config.demo:
+            mock_data.load(stores.patients, stores.providers, stores.schedules, stores.prescriptions)
+        patient_ids = _patients(config, rng, stores)
+        _prescriptions(config, rng, stores, patient_ids)
+        _providers(config, rng, stores, patient_ids)
+    finally:
+        if collecting:
+            gc.enable()
+    gc.freeze()
+    return stores.counts()
+
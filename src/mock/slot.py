@@ -2,37 +2,45 @@
 Slot entity and SlotStore.
 
 A **slot** represents a bookable time window for a given provider.
+
+Slots are generated on demand from the provider's schedule
+(`src.mock.schedule`); the store only holds the slots that were booked or
+held, and lays them over the generated ones when a range is queried. Memory
+therefore grows with bookings, not with the length of the calendar.
 """
 from __future__ import annotations
 
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .index import SortedIndex
 
 
 class Slot(BaseModel):
     """Represents an appointment slot for a provider."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID = Field(default_factory=uuid4, description="Primary key")
     provider_id: UUID
     start: datetime
     end: datetime
     is_available: bool = True
 
-    def book(self) -> None:
-        """Mark slot as no longer available."""
-        self.is_available = False
-
-    def cancel(self) -> None:
-        """Mark slot as available again."""
-        self.is_available = True
-
 
 class SlotStore:
     _slots: Dict[UUID, Slot]
-    """Singleton in-memory store for slots."""
+    _by_provider: SortedIndex[Slot]
+    _lock: threading.Lock
+    """Singleton in-memory store of booked or held slots, by provider in start order.
+
+    Writes hold a short store lock, so `claim` is an atomic compare-and-set
+    even when several threads book at once.
+    """
 
     _instance: Optional["SlotStore"] = None
 
@@ -40,31 +48,121 @@ class SlotStore:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._slots = {}
+            cls._instance._by_provider = SortedIndex(lambda s: s.provider_id, lambda s: s.start)
+            cls._instance._lock = threading.Lock()
         return cls._instance
 
     # ------------------------------------------------------------------
     # CRUD helpers
     # ------------------------------------------------------------------
     def add(self, slot: Slot) -> None:
-        self._slots[slot.id] = slot
+        with self._lock:
+            self._put(slot)
+
+    def add_many(self, slots: Iterable[Slot]) -> None:
+        """Insert or update many rows at once (bulk load)."""
+        rows = [(slot.id, slot) for slot in slots]
+        with self._lock:
+            self._slots.update(rows)
+            self._by_provider.add_many(rows)
+
+    def update(self, slot: Slot) -> None:
+        self.add(slot)
 
     def remove(self, slot_id: UUID) -> None:
-        self._slots.pop(slot_id, None)
+        with self._lock:
+            self._slots.pop(slot_id, None)
+            self._by_provider.remove(slot_id)
+
+    def claim(self, slot: Slot) -> bool:
+        """Book *slot* if it is still available.
+
+        A slot without a row yet is booked if the provider's schedule offers
+        it. Returns False, changing nothing, when the slot does not exist or is
+        already booked. Check and write happen under the store lock, so of
+        several concurrent claims of one slot exactly one wins.
+        """
+        with self._lock:
+            current = self._slots.get(slot.id)
+            if current is None:
+                if not _offered(slot):
+                    return False
+                current = slot
+            if not current.is_available:
+                return False
+            self._put(current.model_copy(update={"is_available": False}))
+            return True
+
+    def release(self, slot_id: UUID) -> None:
+        """Make *slot_id* available again (no-op when it has no row).
+
+        A slot the schedule generates anyway loses its row; other rows are
+        kept and marked available.
+        """
+        with self._lock:
+            slot = self._slots.get(slot_id)
+            if slot is None or slot.is_available:
+                return
+            if _offered(slot):
+                self._slots.pop(slot_id)
+                self._by_provider.remove(slot_id)
+            else:
+                self._put(slot.model_copy(update={"is_available": True}))
+
+    def _put(self, slot: Slot) -> None:
+        self._slots[slot.id] = slot
+        self._by_provider.add(slot.id, slot)
 
     def get(self, slot_id: UUID) -> Optional[Slot]:
+        """The stored row of *slot_id*; slots never booked have none."""
         return self._slots.get(slot_id)
 
     def all(self) -> List[Slot]:
+        """Every stored (booked or held) slot."""
         return list(self._slots.values())
 
-    def for_provider(self, provider_id: UUID) -> List[Slot]:
-        return [s for s in self._slots.values() if s.provider_id == provider_id]
+    def stored_for_provider(self, provider_id: UUID) -> List[Slot]:
+        """Stored slots of *provider_id*, earliest first."""
+        return [self._slots[i] for i in self._by_provider.range(provider_id)]
 
-    def available(self) -> List[Slot]:
-        return [s for s in self._slots.values() if s.is_available]
+    def for_provider(self, provider_id: UUID) -> List[Slot]:
+        """All slots of *provider_id* up to its schedule's horizon, earliest first."""
+        return self.between(provider_id)
+
+    def between(
+        self,
+        provider_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        only_available: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Slot]:
+        """Slots of *provider_id* starting in ``[start, end)``, earliest first.
+
+        Either bound may be None for an open range. Generated slots are
+        produced only for the days needed to return *limit* slots; stored rows
+        are found in O(log n + k).
+        """
+        from .schedule import overlay, schedule_store
+
+        stored = [self._slots[i] for i in self._by_provider.range(provider_id, start, end)]
+        schedule = schedule_store.get(provider_id)
+        generated = schedule.slots(start, end) if schedule is not None else ()
+        return overlay(generated, stored, only_available=only_available, limit=limit)
 
     def clear(self) -> None:
-        self._slots.clear()
+        with self._lock:
+            self._slots.clear()
+            self._by_provider.clear()
+
+
+def _offered(slot: Slot) -> bool:
+    """Whether the schedule of *slot*'s provider generates *slot*."""
+    from .schedule import schedule_store
+
+    schedule = schedule_store.get(slot.provider_id)
+    return schedule is not None and schedule.offers(slot)
 
 
 slot_store = SlotStore()
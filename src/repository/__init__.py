@@ -0,0 +1,144 @@
+"""Async data access for the agents' tools.
+
+`get_repositories()` returns the repositories of the backend selected by
+``STORE_BACKEND``:
+
+- ``memory`` – the process-local `src.mock` stores (default);
+- ``redis`` – hashes and sorted sets in the Redis of `src.libs.redis`, shared
+  by every worker, so the API can run more than one.
+
+Call `init_repositories()` once on startup: it seeds an empty store with the
+demo rows and a generated dataset sized by the ``STORE_SEED_*`` settings
+(see `src.mock.seed`).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Optional
+
+from src.libs.logger.manager import get_logger
+from src.mock import SeedConfig, Stores, seed
+
+from .base import (
+    AppointmentRepository,
+    BookingConflict,
+    BookingRepository,
+    PatientRepository,
+    PrescriptionRepository,
+    ProviderRepository,
+    Repositories,
+    ScheduleRepository,
+    SlotRepository,
+)
+from .memory import memory_repositories
+from .repository_setting import RepositorySettings
+
+if TYPE_CHECKING:
+    from redis.asyncio.lock import Lock
+
+logger = get_logger("repository")
+
+_settings = RepositorySettings()
+_repositories: Optional[Repositories] = None
+
+
+def get_repositories() -> Repositories:
+    """The repositories of the configured backend (created on first use)."""
+    global _repositories
+    if _repositories is None:
+        if _settings.backend == "memory":
+            _repositories = memory_repositories()
+        elif _settings.backend == "redis":
+            from src.libs.redis import get_redis_client
+
+            from .redis import redis_repositories
+
+            _repositories = redis_repositories(get_redis_client(), _settings.key_prefix)
+        else:
+            raise ValueError(f"Unknown STORE_BACKEND: {_settings.backend}")
+    return _repositories
+
+
+def _seed_config() -> SeedConfig:
+    return SeedConfig(
+        patients=_settings.seed_patients,
+        providers=_settings.seed_providers,
+        days=_settings.seed_days,
+        appointment_density=_settings.seed_appointment_density,
+        prescriptions_per_patient=_settings.seed_prescriptions_per_patient,
+        rng_seed=_settings.seed_rng,
+    )
+
+
+async def init_repositories() -> Repositories:
+    """Create the repositories and seed an empty store once."""
+    repositories = get_repositories()
+    if not _settings.seed:
+        return repositories
+
+    if _settings.backend == "memory":
+        if await repositories.is_empty():
+            counts = seed(_seed_config())
+            logger.info(f"Seeded the memory store: {counts}")
+        return repositories
+
+    from src.libs.redis import get_redis_client
+
+    # One worker seeds under the lock; the others wait for it, then find the
+    # marker, which is only set once every row is in redis. The lock expires,
+    # so a worker that dies mid-seed lets the next one start over; while this
+    # one is alive a background task keeps extending it, however long the
+    # seed takes.
+    client = get_redis_client()
+    marker = f"{_settings.key_prefix}:seeded"
+    if await client.exists(marker):
+        return repositories
+    lock = client.lock(f"{_settings.key_prefix}:seeding", timeout=_settings.seed_lock_seconds, sleep=0.5)
+    async with lock:
+        if await client.exists(marker):
+            return repositories
+        if not await repositories.is_empty():
+            logger.warning("The redis store has rows but no seed marker: loading the interrupted seed again")
+        holder = asyncio.create_task(_hold(lock))
+        try:
+            started = time.perf_counter()
+            # Off the event loop, so the holder can extend the lock meanwhile
+            counts = await asyncio.to_thread(seed, _seed_config())
+            seeded = time.perf_counter()
+            await repositories.copy_from(memory_repositories())
+            copied = time.perf_counter()
+        finally:
+            holder.cancel()
+        # The rows now live in redis; this worker does not need its copy
+        Stores().clear()
+        await client.set(marker, "1")
+        logger.info(
+            f"Seeded the redis store: {counts} "
+            f"(generated in {seeded - started:.1f}s, copied in {copied - seeded:.1f}s)"
+        )
+    return repositories
+
+
+async def _hold(lock: Lock) -> None:
+    """Reset the expiry of *lock* every third of it, until cancelled."""
+    while True:
+        await asyncio.sleep(_settings.seed_lock_seconds / 3)
+        await lock.reacquire()
+
+
+__all__ = [
+    "AppointmentRepository",
+    "BookingConflict",
+    "BookingRepository",
+    "PatientRepository",
+    "PrescriptionRepository",
+    "ProviderRepository",
+    "Repositories",
+    "RepositorySettings",
+    "ScheduleRepository",
+    "SlotRepository",
+    "get_repositories",
+    "init_repositories",
+    "memory_repositories",
+]
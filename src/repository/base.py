@@ -0,0 +1,277 @@
+"""
+Async repository interfaces.
+
+One repository per table, with the same CRUD surface as the `src.mock`
+stores (``add``, ``get``, ``get_by_patient_id``, ``for_provider`` …) but
+awaitable, so a backend can live out of process. Every read a tool makes is a
+single call here, and the implementations answer each call in at most one
+round trip.
+
+`BookingRepository` holds the writes that span slots and appointments. Each
+one is a compare-and-set: it applies completely or raises `BookingConflict`,
+so concurrent sessions can never book one slot twice.
+
+`Repositories` bundles one repository per table; see `src.repository` for how
+the configured backend is chosen.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Literal, Optional
+from uuid import UUID
+
+from src.mock.appointment import Appointment
+from src.mock.patient import Patient
+from src.mock.prescription import Prescription
+from src.mock.provider import Provider
+from src.mock.schedule import Schedule
+from src.mock.slot import Slot
+
+ConflictReason = Literal["slot_missing", "slot_taken", "appointment_changed"]
+
+
+class BookingConflict(Exception):
+    """A booking write lost a race or was based on stale data.
+
+    *reason* is ``slot_missing`` (no such slot), ``slot_taken`` (booked by
+    someone else) or ``appointment_changed`` (the appointment was moved or
+    cancelled since it was read).
+    """
+
+    def __init__(self, reason: ConflictReason) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class PatientRepository(ABC):
+    @abstractmethod
+    async def add(self, patient: Patient) -> None: ...
+
+    async def add_many(self, patients: Iterable[Patient]) -> None:
+        """Insert many new rows (bulk loads); backends override it to batch the writes."""
+        for patient in patients:
+            await self.add(patient)
+
+    @abstractmethod
+    async def get(self, patient_id: UUID) -> Optional[Patient]: ...
+
+    @abstractmethod
+    async def all(self) -> List[Patient]: ...
+
+    @abstractmethod
+    async def remove(self, patient_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class ProviderRepository(ABC):
+    @abstractmethod
+    async def add(self, provider: Provider) -> None: ...
+
+    async def add_many(self, providers: Iterable[Provider]) -> None:
+        """Insert many new rows (bulk loads); backends override it to batch the writes."""
+        for provider in providers:
+            await self.add(provider)
+
+    @abstractmethod
+    async def get(self, provider_id: UUID) -> Optional[Provider]: ...
+
+    @abstractmethod
+    async def get_many(self, provider_ids: Iterable[UUID]) -> List[Optional[Provider]]:
+        """Rows for *provider_ids*, in order (None where missing)."""
+
+    @abstractmethod
+    async def all(self) -> List[Provider]: ...
+
+    @abstractmethod
+    async def remove(self, provider_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class ScheduleRepository(ABC):
+    @abstractmethod
+    async def add(self, schedule: Schedule) -> None:
+        """Insert or replace the schedule of ``schedule.provider_id``."""
+
+    async def add_many(self, schedules: Iterable[Schedule]) -> None:
+        """Insert many new rows (bulk loads); backends override it to batch the writes."""
+        for schedule in schedules:
+            await self.add(schedule)
+
+    @abstractmethod
+    async def get(self, provider_id: UUID) -> Optional[Schedule]: ...
+
+    @abstractmethod
+    async def all(self) -> List[Schedule]: ...
+
+    @abstractmethod
+    async def remove(self, provider_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class SlotRepository(ABC):
+    """Slots generated from the provider schedules, overlaid with stored rows.
+
+    Only booked or held slots are stored; ``get`` and ``get_many`` find those
+    rows, while ``between`` and ``for_provider`` also return generated slots.
+    """
+
+    @abstractmethod
+    async def add(self, slot: Slot) -> None: ...
+
+    async def add_many(self, slots: Iterable[Slot]) -> None:
+        """Insert many new rows (bulk loads); backends override it to batch the writes."""
+        for slot in slots:
+            await self.add(slot)
+
+    @abstractmethod
+    async def update(self, slot: Slot) -> None: ...
+
+    @abstractmethod
+    async def get(self, slot_id: UUID) -> Optional[Slot]: ...
+
+    @abstractmethod
+    async def get_many(self, slot_ids: Iterable[UUID]) -> List[Optional[Slot]]:
+        """Rows for *slot_ids*, in order (None where missing)."""
+
+    @abstractmethod
+    async def stored_for_provider(self, provider_id: UUID) -> List[Slot]:
+        """Stored (booked or held) slots of *provider_id*, earliest first."""
+
+    @abstractmethod
+    async def for_provider(self, provider_id: UUID) -> List[Slot]:
+        """All slots of *provider_id* up to its schedule's horizon, earliest first."""
+
+    @abstractmethod
+    async def between(
+        self,
+        provider_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        only_available: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Slot]:
+        """Slots of *provider_id* starting in ``[start, end)``, earliest first."""
+
+    @abstractmethod
+    async def remove(self, slot_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class AppointmentRepository(ABC):
+    @abstractmethod
+    async def add(self, appointment: Appointment) -> None: ...
+
+    async def add_many(self, appointments: Iterable[Appointment]) -> None:
+        """Insert many new rows (bulk loads); backends override it to batch the writes."""
+        for appointment in appointments:
+            await self.add(appointment)
+
+    @abstractmethod
+    async def update(self, appointment: Appointment) -> None: ...
+
+    @abstractmethod
+    async def get(self, appointment_id: UUID) -> Optional[Appointment]: ...
+
+    @abstractmethod
+    async def get_by_patient_id(self, patient_id: UUID) -> List[Appointment]: ...
+
+    @abstractmethod
+    async def remove(self, appointment_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class PrescriptionRepository(ABC):
+    @abstractmethod
+    async def add(self, prescription: Prescription) -> None: ...
+
+    async def add_many(self, prescriptions: Iterable[Prescription]) -> None:
+        """Insert many new rows (bulk loads); backends override it to batch the writes."""
+        for prescription in prescriptions:
+            await self.add(prescription)
+
+    @abstractmethod
+    async def update(self, prescription: Prescription) -> None: ...
+
+    @abstractmethod
+    async def get(self, prescription_id: UUID) -> Optional[Prescription]: ...
+
+    @abstractmethod
+    async def get_by_patient_id(self, patient_id: UUID) -> List[Prescription]: ...
+
+    @abstractmethod
+    async def remove(self, prescription_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class BookingRepository(ABC):
+    @abstractmethod
+    async def book(self, appointment: Appointment, slot: Slot) -> None:
+        """Claim *slot* and store *appointment* (for that slot) in one step."""
+
+    @abstractmethod
+    async def move(self, appointment: Appointment, old_slot: Slot, new_slot: Slot) -> Appointment:
+        """Move *appointment* from *old_slot* to *new_slot* and confirm it.
+
+        The new slot is claimed and the old one released in the same step;
+        returns the updated appointment.
+        """
+
+    @abstractmethod
+    async def cancel(self, appointment: Appointment, slot: Slot) -> Appointment:
+        """Cancel *appointment* and release its *slot*; returns the updated appointment."""
+
+
+@dataclass(frozen=True)
+class Repositories:
+    """One repository per table of a backend."""
+
+    patients: PatientRepository
+    providers: ProviderRepository
+    schedules: ScheduleRepository
+    slots: SlotRepository
+    appointments: AppointmentRepository
+    prescriptions: PrescriptionRepository
+    bookings: BookingRepository
+
+    async def is_empty(self) -> bool:
+        return not await self.patients.all()
+
+    async def copy_from(self, source: "Repositories") -> None:
+        """Insert every row of *source* (e.g. the seeded memory stores) into this backend.
+
+        Each table is written with one `add_many` call, so a backend can batch
+        the whole load.
+        """
+        patients = await source.patients.all()
+        providers = await source.providers.all()
+        await self.patients.add_many(patients)
+        await self.providers.add_many(providers)
+        await self.schedules.add_many(await source.schedules.all())
+        await self.slots.add_many([
+            slot for provider in providers for slot in await source.slots.stored_for_provider(provider.id)
+        ])
+        await self.appointments.add_many([
+            appointment
+            for patient in patients
+            for appointment in await source.appointments.get_by_patient_id(patient.id)
+        ])
+        await self.prescriptions.add_many([
+            prescription
+            for patient in patients
+            for prescription in await source.prescriptions.get_by_patient_id(patient.id)
+        ])
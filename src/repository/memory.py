@@ -0,0 +1,262 @@
+"""
+In-process repositories over the `src.mock` store singletons.
+
+Rows live in this worker's memory only: every uvicorn worker has its own
+copy, and a restart loses every change. Use the Redis backend to share data
+between workers.
+
+Bookings claim slots with `SlotStore.claim`, a compare-and-set under the slot
+store's lock, and serialise changes to one appointment with a lock striped by
+appointment id; sessions booking different slots never wait on each other
+for longer than an in-memory write.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from src.mock.appointment import Appointment, AppointmentStatus, AppointmentStore, appointment_store
+from src.mock.patient import Patient, PatientStore, patient_store
+from src.mock.prescription import Prescription, PrescriptionStore, prescription_store
+from src.mock.provider import Provider, ProviderStore, provider_store
+from src.mock.schedule import Schedule, ScheduleStore, schedule_store
+from src.mock.slot import Slot, SlotStore, slot_store
+
+from .base import (
+    AppointmentRepository,
+    BookingConflict,
+    BookingRepository,
+    PatientRepository,
+    PrescriptionRepository,
+    ProviderRepository,
+    Repositories,
+    ScheduleRepository,
+    SlotRepository,
+)
+
+
+class InMemoryPatientRepository(PatientRepository):
+    def __init__(self, store: PatientStore = patient_store) -> None:
+        self._store = store
+
+    async def add(self, patient: Patient) -> None:
+        self._store.add(patient)
+
+    async def add_many(self, patients: Iterable[Patient]) -> None:
+        self._store.add_many(patients)
+
+    async def get(self, patient_id: UUID) -> Optional[Patient]:
+        return self._store.get(patient_id)
+
+    async def all(self) -> List[Patient]:
+        return self._store.all()
+
+    async def remove(self, patient_id: UUID) -> None:
+        self._store.remove(patient_id)
+
+    async def clear(self) -> None:
+        self._store.clear()
+
+
+class InMemoryProviderRepository(ProviderRepository):
+    def __init__(self, store: ProviderStore = provider_store) -> None:
+        self._store = store
+
+    async def add(self, provider: Provider) -> None:
+        self._store.add(provider)
+
+    async def add_many(self, providers: Iterable[Provider]) -> None:
+        self._store.add_many(providers)
+
+    async def get(self, provider_id: UUID) -> Optional[Provider]:
+        return self._store.get(provider_id)
+
+    async def get_many(self, provider_ids: Iterable[UUID]) -> List[Optional[Provider]]:
+        return [self._store.get(provider_id) for provider_id in provider_ids]
+
+    async def all(self) -> List[Provider]:
+        return self._store.all()
+
+    async def remove(self, provider_id: UUID) -> None:
+        self._store.remove(provider_id)
+
+    async def clear(self) -> None:
+        self._store.clear()
+
+
+class InMemoryScheduleRepository(ScheduleRepository):
+    def __init__(self, store: ScheduleStore = schedule_store) -> None:
+        self._store = store
+
+    async def add(self, schedule: Schedule) -> None:
+        self._store.add(schedule)
+
+    async def get(self, provider_id: UUID) -> Optional[Schedule]:
+        return self._store.get(provider_id)
+
+    async def all(self) -> List[Schedule]:
+        return self._store.all()
+
+    async def remove(self, provider_id: UUID) -> None:
+        self._store.remove(provider_id)
+
+    async def clear(self) -> None:
+        self._store.clear()
+
+
+class InMemorySlotRepository(SlotRepository):
+    def __init__(self, store: SlotStore = slot_store) -> None:
+        self._store = store
+
+    async def add(self, slot: Slot) -> None:
+        self._store.add(slot)
+
+    async def add_many(self, slots: Iterable[Slot]) -> None:
+        self._store.add_many(slots)
+
+    async def update(self, slot: Slot) -> None:
+        self._store.update(slot)
+
+    async def get(self, slot_id: UUID) -> Optional[Slot]:
+        return self._store.get(slot_id)
+
+    async def get_many(self, slot_ids: Iterable[UUID]) -> List[Optional[Slot]]:
+        return [self._store.get(slot_id) for slot_id in slot_ids]
+
+    async def stored_for_provider(self, provider_id: UUID) -> List[Slot]:
+        return self._store.stored_for_provider(provider_id)
+
+    async def for_provider(self, provider_id: UUID) -> List[Slot]:
+        return self._store.for_provider(provider_id)
+
+    async def between(
+        self,
+        provider_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        only_available: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Slot]:
+        return self._store.between(provider_id, start, end, only_available=only_available, limit=limit)
+
+    async def remove(self, slot_id: UUID) -> None:
+        self._store.remove(slot_id)
+
+    async def clear(self) -> None:
+        self._store.clear()
+
+
+class InMemoryAppointmentRepository(AppointmentRepository):
+    def __init__(self, store: AppointmentStore = appointment_store) -> None:
+        self._store = store
+
+    async def add(self, appointment: Appointment) -> None:
+        self._store.add(appointment)
+
+    async def add_many(self, appointments: Iterable[Appointment]) -> None:
+        self._store.add_many(appointments)
+
+    async def update(self, appointment: Appointment) -> None:
+        self._store.update(appointment)
+
+    async def get(self, appointment_id: UUID) -> Optional[Appointment]:
+        return self._store.get(appointment_id)
+
+    async def get_by_patient_id(self, patient_id: UUID) -> List[Appointment]:
+        return self._store.get_by_patient_id(patient_id)
+
+    async def remove(self, appointment_id: UUID) -> None:
+        self._store.remove(appointment_id)
+
+    async def clear(self) -> None:
+        self._store.clear()
+
+
+class InMemoryPrescriptionRepository(PrescriptionRepository):
+    def __init__(self, store: PrescriptionStore = prescription_store) -> None:
+        self._store = store
+
+    async def add(self, prescription: Prescription) -> None:
+        self._store.add(prescription)
+
+    async def add_many(self, prescriptions: Iterable[Prescription]) -> None:
+        self._store.add_many(prescriptions)
+
+    async def update(self, prescription: Prescription) -> None:
+        self._store.update(prescription)
+
+    async def get(self, prescription_id: UUID) -> Optional[Prescription]:
+        return self._store.get(prescription_id)
+
+    async def get_by_patient_id(self, patient_id: UUID) -> List[Prescription]:
+        return self._store.get_by_patient_id(patient_id)
+
+    async def remove(self, prescription_id: UUID) -> None:
+        self._store.remove(prescription_id)
+
+    async def clear(self) -> None:
+        self._store.clear()
+
+
+class InMemoryBookingRepository(BookingRepository):
+    STRIPES = 64
+
+    def __init__(self, slots: SlotStore = slot_store, appointments: AppointmentStore = appointment_store) -> None:
+        self._slots = slots
+        self._appointments = appointments
+        self._stripes = [threading.Lock() for _ in range(self.STRIPES)]
+
+    def _appointment_lock(self, appointment_id: UUID) -> threading.Lock:
+        return self._stripes[appointment_id.int % self.STRIPES]
+
+    def _current(self, appointment: Appointment, slot: Slot) -> None:
+        """Raise unless the stored *appointment* still holds *slot*."""
+        stored = self._appointments.get(appointment.id)
+        if stored is None or stored.slot_id != slot.id or stored.status == AppointmentStatus.CANCELLED:
+            raise BookingConflict("appointment_changed")
+
+    def _claim(self, slot: Slot) -> None:
+        if not self._slots.claim(slot):
+            raise BookingConflict("slot_missing" if self._slots.get(slot.id) is None else "slot_taken")
+
+    async def book(self, appointment: Appointment, slot: Slot) -> None:
+        self._claim(slot)
+        self._appointments.add(appointment)
+
+    async def move(self, appointment: Appointment, old_slot: Slot, new_slot: Slot) -> Appointment:
+        with self._appointment_lock(appointment.id):
+            self._current(appointment, old_slot)
+            self._claim(new_slot)
+            self._slots.release(old_slot.id)
+            moved = appointment.model_copy(update={
+                "slot_id": new_slot.id,
+                "provider_id": new_slot.provider_id,
+                "start": new_slot.start,
+                "status": AppointmentStatus.CONFIRMED,
+            })
+            self._appointments.update(moved)
+        return moved
+
+    async def cancel(self, appointment: Appointment, slot: Slot) -> Appointment:
+        with self._appointment_lock(appointment.id):
+            self._current(appointment, slot)
+            cancelled = appointment.model_copy(update={"status": AppointmentStatus.CANCELLED})
+            self._appointments.update(cancelled)
+            self._slots.release(slot.id)
+        return cancelled
+
+
+def memory_repositories() -> Repositories:
+    """Repositories over the process-wide `src.mock` stores."""
+    return Repositories(
+        patients=InMemoryPatientRepository(),
+        providers=InMemoryProviderRepository(),
+        schedules=InMemoryScheduleRepository(),
+        slots=InMemorySlotRepository(),
+        appointments=InMemoryAppointmentRepository(),
+        prescriptions=InMemoryPrescriptionRepository(),
+        bookings=InMemoryBookingRepository(),
+    )
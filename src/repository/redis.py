@@ -0,0 +1,590 @@
+"""
+Redis-backed repositories, shared by every worker.
+
+Layout, under ``STORE_KEY_PREFIX`` (``store`` below):
+
+- ``store:{table}`` – hash of row id → row JSON, one per table;
+- ``store:schedules`` – hash of provider id → schedule JSON;
+- ``store:slots:provider:{provider_id}`` – sorted set of the stored (booked
+  or held) slot ids, scored by start time (epoch seconds);
+- ``store:appointments:patient:{patient_id}`` – appointment ids by creation;
+- ``store:prescriptions:patient:{patient_id}`` – prescription ids by insertion.
+
+Index lookups run as one Lua script that ranges over the sorted set and
+``HMGET``s the rows, so every read is a single round trip. Writes update the
+row and its index entries in one ``MULTI`` pipeline. Bulk loads (``add_many``,
+used to copy a seeded dataset in) send ``BULK_BATCH`` rows per pipelined
+round trip: one multi-field ``HSET`` plus one ``ZADD`` per index key touched.
+
+Slot queries read the provider's schedule and the stored slots of the window
+in one pipelined round trip, then generate the free slots locally.
+
+Bookings are Lua scripts too: each checks the slot (and, for moves and
+cancellations, that the stored appointment still holds the old slot) and
+applies every write only when the check passes. Redis runs a script
+atomically, so bookings from any number of workers are compare-and-set
+operations, and only scripts touching the same keys queue behind each other.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Callable, Generic, Iterable, List, Optional, Type, TypeVar
+from uuid import UUID
+
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from src.mock.appointment import Appointment, AppointmentStatus
+from src.mock.patient import Patient
+from src.mock.prescription import Prescription
+from src.mock.provider import Provider
+from src.mock.schedule import Schedule, overlay
+from src.mock.slot import Slot
+
+from .base import (
+    AppointmentRepository,
+    BookingConflict,
+    BookingRepository,
+    PatientRepository,
+    PrescriptionRepository,
+    ProviderRepository,
+    Repositories,
+    ScheduleRepository,
+    SlotRepository,
+)
+
+Row = TypeVar("Row", bound=BaseModel)
+
+# Rows written per pipelined round trip by the bulk loads
+BULK_BATCH = 5_000
+
+# KEYS: index sorted set, rows hash. ARGV: min score, max score, offset, count.
+# HMGET is chunked to stay below Lua's unpack() limit on large ranges.
+_RANGE_ROWS = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], ARGV[2], 'LIMIT', ARGV[3], ARGV[4])
+local rows = {}
+for i = 1, #ids, 1000 do
+  local chunk = redis.call('HMGET', KEYS[2], unpack(ids, i, math.min(i + 999, #ids)))
+  for _, row in ipairs(chunk) do
+    rows[#rows + 1] = row
+  end
+end
+return rows
+"""
+
+# Helpers of the booking scripts. A slot without a row is claimed from its JSON
+# when the schedule offers it (checked by the caller: offered = '1'). claim()
+# returns nil on success or the conflict; release() drops the row of a slot
+# the schedule generates anyway; holds() checks the stored appointment is
+# still active on the given slot.
+_SLOT_HELPERS = """
+local function claim(slots, index, slot_id, provider_id, slot_json, offered, score)
+  local raw = redis.call('HGET', slots, slot_id)
+  local slot
+  if raw then
+    slot = cjson.decode(raw)
+    if slot.provider_id ~= provider_id then return 'slot_missing' end
+  elseif offered == '1' then
+    slot = cjson.decode(slot_json)
+  else
+    return 'slot_missing'
+  end
+  if not slot.is_available then return 'slot_taken' end
+  slot.is_available = false
+  redis.call('HSET', slots, slot_id, cjson.encode(slot))
+  redis.call('ZADD', index, score, slot_id)
+  return nil
+end
+
+local function release(slots, index, slot_id, offered)
+  local raw = redis.call('HGET', slots, slot_id)
+  if not raw then return end
+  if offered == '1' then
+    redis.call('HDEL', slots, slot_id)
+    redis.call('ZREM', index, slot_id)
+    return
+  end
+  local slot = cjson.decode(raw)
+  slot.is_available = true
+  redis.call('HSET', slots, slot_id, cjson.encode(slot))
+end
+
+local function holds(appointments, appointment_id, slot_id)
+  local raw = redis.call('HGET', appointments, appointment_id)
+  if not raw then return false end
+  local appointment = cjson.decode(raw)
+  return appointment.slot_id == slot_id and appointment.status ~= 'cancelled'
+end
+"""
+
+# KEYS: slots hash, provider index, appointments hash, patient index.
+# ARGV: slot id, provider id, slot JSON, offered, slot score,
+#       appointment id, appointment JSON, appointment score.
+_BOOK = _SLOT_HELPERS + """
+local conflict = claim(KEYS[1], KEYS[2], ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5])
+if conflict then return conflict end
+redis.call('HSET', KEYS[3], ARGV[6], ARGV[7])
+redis.call('ZADD', KEYS[4], ARGV[8], ARGV[6])
+return 'ok'
+"""
+
+# KEYS: slots hash, new slot's provider index, old slot's provider index, appointments hash.
+# ARGV: new slot id, new provider id, new slot JSON, new offered, new slot score,
+#       old slot id, old offered, appointment id, appointment JSON.
+_MOVE = _SLOT_HELPERS + """
+if not holds(KEYS[4], ARGV[8], ARGV[6]) then return 'appointment_changed' end
+local conflict = claim(KEYS[1], KEYS[2], ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5])
+if conflict then return conflict end
+release(KEYS[1], KEYS[3], ARGV[6], ARGV[7])
+redis.call('HSET', KEYS[4], ARGV[8], ARGV[9])
+return 'ok'
+"""
+
+# KEYS: slots hash, provider index, appointments hash.
+# ARGV: slot id, offered, appointment id, appointment JSON.
+_CANCEL = _SLOT_HELPERS + """
+if not holds(KEYS[3], ARGV[3], ARGV[1]) then return 'appointment_changed' end
+release(KEYS[1], KEYS[2], ARGV[1], ARGV[2])
+redis.call('HSET', KEYS[3], ARGV[3], ARGV[4])
+return 'ok'
+"""
+
+def _score(value: datetime) -> float:
+    return value.timestamp()
+
+
+class _Table(Generic[Row]):
+    """Rows of one model in a hash, plus sorted-set indexes over them."""
+
+    def __init__(self, client: redis.Redis, prefix: str, table: str, model: Type[Row]) -> None:
+        self._client = client
+        self._prefix = prefix
+        self._table = table
+        self._model = model
+        self._rows_key = f"{prefix}:{table}"
+        self._range_rows = client.register_script(_RANGE_ROWS)
+
+    @property
+    def rows_key(self) -> str:
+        return self._rows_key
+
+    def index_key(self, name: str, value: object) -> str:
+        return f"{self._prefix}:{self._table}:{name}:{value}"
+
+    def _load(self, raw: Optional[str]) -> Optional[Row]:
+        return None if raw is None else self._model.model_validate_json(raw)
+
+    async def get(self, row_id: UUID) -> Optional[Row]:
+        return self._load(await self._client.hget(self._rows_key, str(row_id)))
+
+    async def get_many(self, row_ids: Iterable[UUID]) -> List[Optional[Row]]:
+        fields = [str(row_id) for row_id in row_ids]
+        if not fields:
+            return []
+        return [self._load(raw) for raw in await self._client.hmget(self._rows_key, fields)]
+
+    async def all(self) -> List[Row]:
+        return [self._load(raw) for raw in await self._client.hvals(self._rows_key)]
+
+    async def range(
+        self,
+        index_key: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Row]:
+        """Rows indexed in *index_key* with ``start <= score < end``, by score."""
+        return self.loaded(await self.queue_range(self._client, index_key, start, end, limit))
+
+    def queue_range(
+        self,
+        client: redis.Redis,
+        index_key: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: Optional[int] = None,
+    ):
+        """Awaitable running the range script on *client*; see `loaded`.
+
+        On a pipeline, awaiting it only queues the script.
+        """
+        low = "-inf" if start is None else repr(start)
+        high = "+inf" if end is None else f"({end!r}"
+        return self._range_rows(
+            keys=[index_key, self._rows_key],
+            args=[low, high, 0, -1 if limit is None else limit],
+            client=client,
+        )
+
+    def loaded(self, raws: List[Optional[str]]) -> List[Row]:
+        return [row for row in map(self._load, raws) if row is not None]
+
+    async def save(
+        self,
+        row: Row,
+        indexes: Callable[[Row], dict[str, Optional[float]]],
+        *,
+        keep_score: bool = False,
+    ) -> None:
+        """Write *row* and move its index entries.
+
+        *indexes* maps a row to ``{index key: score}``; a None score means the
+        row must not be in that index. With *keep_score*, a row already in an
+        index keeps its score (used for insertion-ordered indexes).
+        """
+        row_id = str(row.id)
+        previous = await self.get(row.id)
+        wanted = indexes(row)
+        stale = [key for key in (indexes(previous) if previous else {}) if key not in wanted]
+
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hset(self._rows_key, row_id, row.model_dump_json())
+        for key in stale:
+            pipe.zrem(key, row_id)
+        for key, score in wanted.items():
+            if score is None:
+                pipe.zrem(key, row_id)
+            else:
+                pipe.zadd(key, {row_id: score}, nx=keep_score)
+        await pipe.execute()
+
+    async def save_many(
+        self,
+        rows: Iterable[Row],
+        indexes: Callable[[Row], dict[str, Optional[float]]],
+        *,
+        keep_score: bool = False,
+    ) -> None:
+        """Write new *rows* and their index entries, `BULK_BATCH` rows per round trip.
+
+        Unlike `save`, entries of a previous version of a row are not removed:
+        this is for loading rows that are not stored yet.
+        """
+        rows = list(rows)
+        for i in range(0, len(rows), BULK_BATCH):
+            batch = rows[i:i + BULK_BATCH]
+            scored: dict[str, dict[str, float]] = {}
+            for row in batch:
+                for key, score in indexes(row).items():
+                    if score is not None:
+                        scored.setdefault(key, {})[str(row.id)] = score
+
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hset(self._rows_key, mapping={str(row.id): row.model_dump_json() for row in batch})
+            for key, members in scored.items():
+                pipe.zadd(key, members, nx=keep_score)
+            await pipe.execute()
+
+    async def delete(self, row_id: UUID, indexes: Callable[[Row], dict[str, Optional[float]]]) -> None:
+        previous = await self.get(row_id)
+        if previous is None:
+            return
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hdel(self._rows_key, str(row_id))
+        for key in indexes(previous):
+            pipe.zrem(key, str(row_id))
+        await pipe.execute()
+
+    async def clear(self) -> None:
+        """Delete the table and all of its indexes."""
+        keys = [self._rows_key]
+        async for key in self._client.scan_iter(match=f"{self._rows_key}:*", count=1000):
+            keys.append(key)
+        for i in range(0, len(keys), 1000):
+            await self._client.delete(*keys[i:i + 1000])
+
+
+class RedisPatientRepository(PatientRepository):
+    def __init__(self, client: redis.Redis, prefix: str) -> None:
+        self._rows = _Table(client, prefix, "patients", Patient)
+
+    async def add(self, patient: Patient) -> None:
+        await self._rows.save(patient, lambda p: {})
+
+    async def add_many(self, patients: Iterable[Patient]) -> None:
+        await self._rows.save_many(patients, lambda p: {})
+
+    async def get(self, patient_id: UUID) -> Optional[Patient]:
+        return await self._rows.get(patient_id)
+
+    async def all(self) -> List[Patient]:
+        return await self._rows.all()
+
+    async def remove(self, patient_id: UUID) -> None:
+        await self._rows.delete(patient_id, lambda p: {})
+
+    async def clear(self) -> None:
+        await self._rows.clear()
+
+
+class RedisProviderRepository(ProviderRepository):
+    def __init__(self, client: redis.Redis, prefix: str) -> None:
+        self._rows = _Table(client, prefix, "providers", Provider)
+
+    async def add(self, provider: Provider) -> None:
+        await self._rows.save(provider, lambda p: {})
+
+    async def add_many(self, providers: Iterable[Provider]) -> None:
+        await self._rows.save_many(providers, lambda p: {})
+
+    async def get(self, provider_id: UUID) -> Optional[Provider]:
+        return await self._rows.get(provider_id)
+
+    async def get_many(self, provider_ids: Iterable[UUID]) -> List[Optional[Provider]]:
+        return await self._rows.get_many(provider_ids)
+
+    async def all(self) -> List[Provider]:
+        return await self._rows.all()
+
+    async def remove(self, provider_id: UUID) -> None:
+        await self._rows.delete(provider_id, lambda p: {})
+
+    async def clear(self) -> None:
+        await self._rows.clear()
+
+
+class RedisScheduleRepository(ScheduleRepository):
+    def __init__(self, client: redis.Redis, prefix: str) -> None:
+        self._client = client
+        self.key = f"{prefix}:schedules"
+
+    async def add(self, schedule: Schedule) -> None:
+        await self._client.hset(self.key, str(schedule.provider_id), schedule.model_dump_json())
+
+    async def add_many(self, schedules: Iterable[Schedule]) -> None:
+        schedules = list(schedules)
+        for i in range(0, len(schedules), BULK_BATCH):
+            batch = schedules[i:i + BULK_BATCH]
+            await self._client.hset(
+                self.key, mapping={str(schedule.provider_id): schedule.model_dump_json() for schedule in batch}
+            )
+
+    async def get(self, provider_id: UUID) -> Optional[Schedule]:
+        return self.load(await self._client.hget(self.key, str(provider_id)))
+
+    async def all(self) -> List[Schedule]:
+        return [self.load(raw) for raw in await self._client.hvals(self.key)]
+
+    async def remove(self, provider_id: UUID) -> None:
+        await self._client.hdel(self.key, str(provider_id))
+
+    async def clear(self) -> None:
+        await self._client.delete(self.key)
+
+    @staticmethod
+    def load(raw: Optional[str]) -> Optional[Schedule]:
+        return None if raw is None else Schedule.model_validate_json(raw)
+
+
+class RedisSlotRepository(SlotRepository):
+    def __init__(self, client: redis.Redis, prefix: str, schedules: RedisScheduleRepository) -> None:
+        self._client = client
+        self._rows = _Table(client, prefix, "slots", Slot)
+        self._schedules = schedules
+
+    def _indexes(self, slot: Slot) -> dict[str, Optional[float]]:
+        return {self._rows.index_key("provider", slot.provider_id): _score(slot.start)}
+
+    async def add(self, slot: Slot) -> None:
+        await self._rows.save(slot, self._indexes)
+
+    async def add_many(self, slots: Iterable[Slot]) -> None:
+        await self._rows.save_many(slots, self._indexes)
+
+    async def update(self, slot: Slot) -> None:
+        await self._rows.save(slot, self._indexes)
+
+    async def get(self, slot_id: UUID) -> Optional[Slot]:
+        return await self._rows.get(slot_id)
+
+    async def get_many(self, slot_ids: Iterable[UUID]) -> List[Optional[Slot]]:
+        return await self._rows.get_many(slot_ids)
+
+    async def stored_for_provider(self, provider_id: UUID) -> List[Slot]:
+        return await self._rows.range(self._rows.index_key("provider", provider_id))
+
+    async def for_provider(self, provider_id: UUID) -> List[Slot]:
+        return await self.between(provider_id)
+
+    async def between(
+        self,
+        provider_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        only_available: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Slot]:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hget(self._schedules.key, str(provider_id))
+        await self._rows.queue_range(
+            pipe,
+            self._rows.index_key("provider", provider_id),
+            None if start is None else _score(start),
+            None if end is None else _score(end),
+        )
+        raw_schedule, raw_slots = await pipe.execute()
+
+        schedule = self._schedules.load(raw_schedule)
+        generated = schedule.slots(start, end) if schedule is not None else ()
+        return overlay(generated, self._rows.loaded(raw_slots), only_available=only_available, limit=limit)
+
+    async def remove(self, slot_id: UUID) -> None:
+        await self._rows.delete(slot_id, self._indexes)
+
+    async def clear(self) -> None:
+        await self._rows.clear()
+
+
+class RedisAppointmentRepository(AppointmentRepository):
+    def __init__(self, client: redis.Redis, prefix: str) -> None:
+        self._rows = _Table(client, prefix, "appointments", Appointment)
+
+    def _indexes(self, appointment: Appointment) -> dict[str, Optional[float]]:
+        return {self._rows.index_key("patient", appointment.patient_id): _score(appointment.created_at)}
+
+    async def add(self, appointment: Appointment) -> None:
+        await self._rows.save(appointment, self._indexes)
+
+    async def add_many(self, appointments: Iterable[Appointment]) -> None:
+        await self._rows.save_many(appointments, self._indexes)
+
+    async def update(self, appointment: Appointment) -> None:
+        await self._rows.save(appointment, self._indexes)
+
+    async def get(self, appointment_id: UUID) -> Optional[Appointment]:
+        return await self._rows.get(appointment_id)
+
+    async def get_by_patient_id(self, patient_id: UUID) -> List[Appointment]:
+        return await self._rows.range(self._rows.index_key("patient", patient_id))
+
+    async def remove(self, appointment_id: UUID) -> None:
+        await self._rows.delete(appointment_id, self._indexes)
+
+    async def clear(self) -> None:
+        await self._rows.clear()
+
+
+class RedisPrescriptionRepository(PrescriptionRepository):
+    def __init__(self, client: redis.Redis, prefix: str) -> None:
+        self._rows = _Table(client, prefix, "prescriptions", Prescription)
+
+    def _indexes(self, prescription: Prescription) -> dict[str, Optional[float]]:
+        return {self._rows.index_key("patient", prescription.patient_id): time.time()}
+
+    async def add(self, prescription: Prescription) -> None:
+        await self._rows.save(prescription, self._indexes, keep_score=True)
+
+    async def add_many(self, prescriptions: Iterable[Prescription]) -> None:
+        # Insertion-ordered index: consecutive scores keep the given order
+        prescriptions = list(prescriptions)
+        started = time.time()
+        order = {prescription.id: i for i, prescription in enumerate(prescriptions)}
+        await self._rows.save_many(
+            prescriptions,
+            lambda p: {self._rows.index_key("patient", p.patient_id): started + order[p.id] * 1e-6},
+            keep_score=True,
+        )
+
+    async def update(self, prescription: Prescription) -> None:
+        await self._rows.save(prescription, self._indexes, keep_score=True)
+
+    async def get(self, prescription_id: UUID) -> Optional[Prescription]:
+        return await self._rows.get(prescription_id)
+
+    async def get_by_patient_id(self, patient_id: UUID) -> List[Prescription]:
+        return await self._rows.range(self._rows.index_key("patient", patient_id))
+
+    async def remove(self, prescription_id: UUID) -> None:
+        await self._rows.delete(prescription_id, self._indexes)
+
+    async def clear(self) -> None:
+        await self._rows.clear()
+
+
+class RedisBookingRepository(BookingRepository):
+    def __init__(self, client: redis.Redis, prefix: str, schedules: RedisScheduleRepository) -> None:
+        self._slots = _Table(client, prefix, "slots", Slot)
+        self._appointments = _Table(client, prefix, "appointments", Appointment)
+        self._schedules = schedules
+        self._book = client.register_script(_BOOK)
+        self._move = client.register_script(_MOVE)
+        self._cancel = client.register_script(_CANCEL)
+
+    def _index(self, slot: Slot) -> str:
+        return self._slots.index_key("provider", slot.provider_id)
+
+    async def _offered(self, slot: Slot) -> str:
+        """``'1'`` when the provider's schedule generates *slot*, for the scripts."""
+        schedule = await self._schedules.get(slot.provider_id)
+        return "1" if schedule is not None and schedule.offers(slot) else "0"
+
+    @staticmethod
+    def _check(result: str) -> None:
+        if result != "ok":
+            raise BookingConflict(result)
+
+    async def book(self, appointment: Appointment, slot: Slot) -> None:
+        self._check(await self._book(
+            keys=[
+                self._slots.rows_key,
+                self._index(slot),
+                self._appointments.rows_key,
+                self._appointments.index_key("patient", appointment.patient_id),
+            ],
+            args=[
+                str(slot.id),
+                str(slot.provider_id),
+                slot.model_dump_json(),
+                await self._offered(slot),
+                _score(slot.start),
+                str(appointment.id),
+                appointment.model_dump_json(),
+                _score(appointment.created_at),
+            ],
+        ))
+
+    async def move(self, appointment: Appointment, old_slot: Slot, new_slot: Slot) -> Appointment:
+        moved = appointment.model_copy(update={
+            "slot_id": new_slot.id,
+            "provider_id": new_slot.provider_id,
+            "start": new_slot.start,
+            "status": AppointmentStatus.CONFIRMED,
+        })
+        self._check(await self._move(
+            keys=[self._slots.rows_key, self._index(new_slot), self._index(old_slot), self._appointments.rows_key],
+            args=[
+                str(new_slot.id),
+                str(new_slot.provider_id),
+                new_slot.model_dump_json(),
+                await self._offered(new_slot),
+                _score(new_slot.start),
+                str(old_slot.id),
+                await self._offered(old_slot),
+                str(appointment.id),
+                moved.model_dump_json(),
+            ],
+        ))
+        return moved
+
+    async def cancel(self, appointment: Appointment, slot: Slot) -> Appointment:
+        cancelled = appointment.model_copy(update={"status": AppointmentStatus.CANCELLED})
+        self._check(await self._cancel(
+            keys=[self._slots.rows_key, self._index(slot), self._appointments.rows_key],
+            args=[str(slot.id), await self._offered(slot), str(appointment.id), cancelled.model_dump_json()],
+        ))
+        return cancelled
+
+def redis_repositories(client: redis.Redis, prefix: str = "store") -> Repositories:
+    """Repositories storing their rows in *client* under *prefix*."""
+    schedules = RedisScheduleRepository(client, prefix)
+    return Repositories(
+        patients=RedisPatientRepository(client, prefix),
+        providers=RedisProviderRepository(client, prefix),
+        schedules=schedules,
+        slots=RedisSlotRepository(client, prefix, schedules),
+        appointments=RedisAppointmentRepository(client, prefix),
+        prescriptions=RedisPrescriptionRepository(client, prefix),
+        bookings=RedisBookingRepository(client, prefix, schedules),
+    )
@@ -0,0 +1,66 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RepositorySettings(BaseSettings):
+    """Where the patients, providers, slots, appointments and prescriptions live.
+
+    Values are populated from environment variables and can be overridden
+    by explicitly instantiating the class with keyword arguments.
+    """
+
+    backend: str = Field(
+        default="memory",
+        alias="STORE_BACKEND",
+        description="memory (per worker process) or redis (shared by all workers)",
+    )
+    key_prefix: str = Field(
+        default="store",
+        alias="STORE_KEY_PREFIX",
+        description="Prefix of every Redis key written by the redis backend",
+    )
+    seed: bool = Field(
+        default=True,
+        alias="STORE_SEED",
+        description="Seed an empty store on startup (the demo rows plus the generated dataset below)",
+    )
+    seed_patients: int = Field(
+        default=0,
+        alias="STORE_SEED_PATIENTS",
+        description="Generated patients, on top of the demo rows",
+    )
+    seed_providers: int = Field(
+        default=0,
+        alias="STORE_SEED_PROVIDERS",
+        description="Generated providers, on top of the demo rows",
+    )
+    seed_days: int = Field(
+        default=15,
+        alias="STORE_SEED_DAYS",
+        description="Days of slots in every generated provider's schedule",
+    )
+    seed_appointment_density: float = Field(
+        default=0.3,
+        alias="STORE_SEED_APPOINTMENT_DENSITY",
+        description="Share of every generated provider's slots that is booked",
+    )
+    seed_prescriptions_per_patient: float = Field(
+        default=1.0,
+        alias="STORE_SEED_PRESCRIPTIONS_PER_PATIENT",
+        description="Average prescriptions of a generated patient",
+    )
+    seed_rng: int = Field(
+        default=0,
+        alias="STORE_SEED_RNG",
+        description="Random seed of the generated dataset",
+    )
+    seed_lock_seconds: float = Field(
+        default=600.0,
+        alias="STORE_SEED_LOCK_SECONDS",
+        description=(
+            "Expiry of the redis backend's seeding lock, so a worker that dies mid-seed does not block "
+            "the others; the seeding worker extends it every third of this while it runs"
+        ),
+    )
+
+    model_config = SettingsConfigDict(env_prefix="STORE_", extra="ignore")